@@ -15,34 +15,15 @@ down_revision = '9a1ba78ab4db'
 branch_labels = None
 depends_on = None
 
-
-def upgrade() -> None:
-    """Add SupervisorAgent to database for database-driven configuration."""
-
-    # Insert supervisor agent into agent_configs
-    op.execute("""
-        INSERT INTO agent_configs (
-            agent_id,
-            name,
-            prompt_template,
-            llm_model_id,
-            default_output_format_id,
-            description,
-            handler_class,
-            is_active,
-            created_at,
-            updated_at
-        )
-        SELECT
-            gen_random_uuid(),
-            'SupervisorAgent',
-            'You are a Supervisor Agent that routes user queries to specialized domain agents.
+# Bound as a parameter below, so no SQL quote escaping is needed here.
+# {agent_names} is rendered with a trailing ", " by SupervisorAgent.
+SUPERVISOR_PROMPT = """You are a Supervisor Agent that routes user queries to specialized domain agents.
 
 Available agents:
 {agents_list}
 
 Your task:
-1. Analyze the user''s message carefully
+1. Analyze the user's message carefully
 2. Detect if the message contains ONE or MULTIPLE distinct questions/intents
 3. Respond with ONLY the agent name or status code
 
@@ -53,34 +34,74 @@ Detection Rules:
 
 Response Format:
 Respond with ONLY ONE of these: {agent_names}"MULTI_INTENT", or "UNCLEAR"
-NO explanations, NO additional text.',
-            llm_models.llm_model_id,
-            NULL,
-            'Routes user queries to specialized agents based on intent detection',
-            'services.supervisor_agent.SupervisorAgent',
-            true,
-            CURRENT_TIMESTAMP,
-            CURRENT_TIMESTAMP
-        FROM llm_models
+NO explanations, NO additional text."""
+
+
+def upgrade() -> None:
+    """Add SupervisorAgent to database for database-driven configuration."""
+
+    bind = op.get_bind()
+
+    # Resolve the supervisor's model once instead of inside the INSERT ... SELECT
+    llm_model_id = bind.execute(sa.text("""
+        SELECT llm_model_id FROM llm_models
         WHERE model_name = 'gpt-4o-mini'
         LIMIT 1
-        ON CONFLICT DO NOTHING;
-    """)
+    """)).scalar()
 
-    # Grant supervisor permission to all existing tenants
-    op.execute("""
-        INSERT INTO tenant_agent_permissions (tenant_id, agent_id, enabled, created_at, updated_at)
-        SELECT
-            t.tenant_id,
-            ac.agent_id,
-            true,
-            CURRENT_TIMESTAMP,
-            CURRENT_TIMESTAMP
-        FROM tenants t
-        CROSS JOIN agent_configs ac
-        WHERE ac.name = 'SupervisorAgent'
-        ON CONFLICT DO NOTHING;
-    """)
+    # Insert supervisor agent into agent_configs
+    if llm_model_id is not None:
+        bind.execute(sa.text("""
+            INSERT INTO agent_configs (
+                agent_id,
+                name,
+                prompt_template,
+                llm_model_id,
+                default_output_format_id,
+                description,
+                handler_class,
+                is_active,
+                created_at,
+                updated_at
+            )
+            VALUES (
+                gen_random_uuid(),
+                'SupervisorAgent',
+                :prompt_template,
+                :llm_model_id,
+                NULL,
+                :description,
+                :handler_class,
+                true,
+                CURRENT_TIMESTAMP,
+                CURRENT_TIMESTAMP
+            )
+            ON CONFLICT (name) DO NOTHING;
+        """), {
+            "prompt_template": SUPERVISOR_PROMPT,
+            "llm_model_id": llm_model_id,
+            "description": "Routes user queries to specialized agents based on intent detection",
+            "handler_class": "services.supervisor_agent.SupervisorAgent",
+        })
+
+    # Grant supervisor permission to all existing tenants.
+    # (tenant_id, agent_id) is the primary key of tenant_agent_permissions,
+    # so the conflict target is guaranteed to be backed by a unique index.
+    supervisor_id = bind.execute(sa.text(
+        "SELECT agent_id FROM agent_configs WHERE name = 'SupervisorAgent'"
+    )).scalar()
+    if supervisor_id is not None:
+        bind.execute(sa.text("""
+            INSERT INTO tenant_agent_permissions (tenant_id, agent_id, enabled, created_at, updated_at)
+            SELECT
+                t.tenant_id,
+                :agent_id,
+                true,
+                CURRENT_TIMESTAMP,
+                CURRENT_TIMESTAMP
+            FROM tenants t
+            ON CONFLICT (tenant_id, agent_id) DO NOTHING;
+        """), {"agent_id": supervisor_id})
 
 
 def downgrade() -> None:
@@ -4,8 +4,12 @@ Revision ID: 5f2b2d7b9e3a
 Revises: 22922597bb3e
 Create Date: 2025-11-12 12:00:00.000000
 """
+import time
+
 from alembic import op
 import sqlalchemy as sa
+from psycopg2.errors import LockNotAvailable
+from sqlalchemy.exc import OperationalError
 
 # revision identifiers, used by Alembic.
 revision = "5f2b2d7b9e3a"
@@ -13,69 +17,225 @@ down_revision = "22922597bb3e"
 branch_labels = None
 depends_on = None
 
+# Fail fast instead of queueing behind long-running readers (and making every
+# later writer queue behind us); blocked DDL is retried by _execute_ddl()
+LOCK_TIMEOUT = "3s"
+STATEMENT_TIMEOUT = "30min"
+LOCK_RETRY_ATTEMPTS = 5
 
-def upgrade() -> None:
-    # 1) Add support profile fields on users
-    op.add_column(
-        "users",
-        sa.Column("supporter_status", sa.String(length=50), nullable=True, server_default="offline"),
-    )
-    op.add_column(
-        "users",
-        sa.Column("max_concurrent_sessions", sa.Integer(), nullable=True, server_default="5"),
-    )
-    op.add_column(
-        "users",
-        sa.Column("current_sessions_count", sa.Integer(), nullable=True, server_default="0"),
-    )
+# Rows touched per statement in the batched backfills
+BATCH_SIZE = 10000
 
-    # 2) Add assigned_user_id to sessions and FK to users
-    op.add_column("sessions", sa.Column("assigned_user_id", sa.UUID(), nullable=True))
-    op.create_foreign_key(
-        "fk_sessions_assigned_user_users",
-        "sessions",
-        "users",
-        ["assigned_user_id"],
-        ["user_id"],
-    )
+# Unbatched, lock-waiting passes for whatever the SKIP LOCKED batches skipped
+SESSION_SWEEP = """
+    UPDATE sessions s
+    SET assigned_user_id = sup.user_id
+    FROM supporters sup
+    WHERE s.assigned_supporter_id = sup.supporter_id
+      AND s.assigned_user_id IS NULL
+      AND sup.user_id IS NOT NULL
+"""
+MESSAGE_SWEEP = """
+    UPDATE messages m
+    SET sender_user_id = sup.user_id
+    FROM supporters sup
+    WHERE m.sender_supporter_id = sup.supporter_id
+      AND m.sender_user_id IS NULL
+      AND sup.user_id IS NOT NULL
+"""
+
+
+def _execute_ddl(statement: str) -> None:
+    """Run a DDL statement in a savepoint, retrying when lock_timeout trips."""
+    bind = op.get_bind()
+    for attempt in range(1, LOCK_RETRY_ATTEMPTS + 1):
+        try:
+            with bind.begin_nested():
+                bind.execute(sa.text(statement))
+            return
+        except OperationalError as e:
+            if not isinstance(e.orig, LockNotAvailable) or attempt == LOCK_RETRY_ATTEMPTS:
+                raise
+            print(f"Lock not available, retrying ({attempt}/{LOCK_RETRY_ATTEMPTS})")
+            time.sleep(2 ** attempt)
+
+
+def _create_index_concurrently(name: str, table: str, columns: list) -> None:
+    """Build an index CONCURRENTLY, outside the migration transaction.
+
+    A concurrent build waits for every older transaction on the table, so
+    the fail-fast timeouts are lifted for the build and put back afterwards.
+    A failed or interrupted build leaves an INVALID index that IF NOT EXISTS
+    would count as present, so such a leftover is dropped and rebuilt.
+    """
+    bind = op.get_bind()
+    with op.get_context().autocommit_block():
+        op.execute("RESET lock_timeout")
+        op.execute("RESET statement_timeout")
+        valid = bind.execute(
+            sa.text("SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"),
+            {"name": name}
+        ).scalar()
+        if valid is False:
+            print(f"Dropping invalid index {name} left by a failed build")
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+        op.create_index(
+            name, table, columns,
+            unique=False, postgresql_concurrently=True, if_not_exists=True
+        )
+        op.execute(f"SET lock_timeout = '{LOCK_TIMEOUT}'")
+        op.execute(f"SET statement_timeout = '{STATEMENT_TIMEOUT}'")
 
-    # Optional: index to help querying queue/assignment
-    op.create_index(
-        "ix_sessions_assigned_user",
-        "sessions",
-        ["tenant_id", "assigned_user_id"],
-        unique=False,
-    )
 
-    # 3) Backfill sessions.assigned_user_id from supporters
-    op.execute(
+def _backfill_from_supporters(bind) -> None:
+    """Copy supporter assignments onto users before supporters is dropped.
+
+    3) sessions.assigned_user_id and 4) messages.sender_user_id (only when
+    NULL) run in PK batches committed one at a time; SKIP LOCKED lets several
+    workers split the table and keeps each snapshot small. Candidates are
+    restricted to rows that actually join a supporter with a user so every
+    batch makes progress and the loop terminates.
+
+    SKIP LOCKED also passes over rows a live transaction holds at that
+    moment, so a final unbatched sweep waits for those locks, and the
+    migration stops if any candidate is still left rather than dropping
+    the supporter columns under it.
+    """
+    with op.get_context().autocommit_block():
+        while True:
+            result = bind.execute(sa.text(
+                """
+                UPDATE sessions s
+                SET assigned_user_id = sup.user_id
+                FROM supporters sup
+                WHERE s.assigned_supporter_id = sup.supporter_id
+                  AND s.session_id IN (
+                    SELECT s2.session_id
+                    FROM sessions s2
+                    JOIN supporters sup2 ON sup2.supporter_id = s2.assigned_supporter_id
+                    WHERE s2.assigned_user_id IS NULL
+                      AND sup2.user_id IS NOT NULL
+                    LIMIT :batch_size
+                    FOR UPDATE OF s2 SKIP LOCKED
+                  )
+                """
+            ), {"batch_size": BATCH_SIZE})
+            if result.rowcount == 0:
+                break
+
+        while True:
+            result = bind.execute(sa.text(
+                """
+                UPDATE messages m
+                SET sender_user_id = sup.user_id
+                FROM supporters sup
+                WHERE m.sender_supporter_id = sup.supporter_id
+                  AND m.message_id IN (
+                    SELECT m2.message_id
+                    FROM messages m2
+                    JOIN supporters sup2 ON sup2.supporter_id = m2.sender_supporter_id
+                    WHERE m2.sender_user_id IS NULL
+                      AND sup2.user_id IS NOT NULL
+                    LIMIT :batch_size
+                    FOR UPDATE OF m2 SKIP LOCKED
+                  )
+                """
+            ), {"batch_size": BATCH_SIZE})
+            if result.rowcount == 0:
+                break
+
+    _execute_ddl(SESSION_SWEEP)
+    _execute_ddl(MESSAGE_SWEEP)
+
+    remaining = bind.execute(sa.text(
+        """
+        SELECT
+            EXISTS (
+                SELECT 1 FROM sessions s
+                JOIN supporters sup ON sup.supporter_id = s.assigned_supporter_id
+                WHERE s.assigned_user_id IS NULL AND sup.user_id IS NOT NULL
+            ),
+            EXISTS (
+                SELECT 1 FROM messages m
+                JOIN supporters sup ON sup.supporter_id = m.sender_supporter_id
+                WHERE m.sender_user_id IS NULL AND sup.user_id IS NOT NULL
+            )
+        """
+    )).one()
+    if any(remaining):
+        raise RuntimeError(
+            "Supporter assignments are still unmigrated; not dropping supporters. "
+            "Re-run the migration."
+        )
+
+
+def upgrade() -> None:
+    # Bulk-DML tuning for the backfills below, scoped to this connection.
+    # Plain SET so it survives the autocommit block; reset at the end.
+    op.execute("SET synchronous_commit = off")
+    op.execute("SET work_mem = '256MB'")
+    op.execute("SET maintenance_work_mem = '1GB'")
+    op.execute(f"SET lock_timeout = '{LOCK_TIMEOUT}'")
+    op.execute(f"SET statement_timeout = '{STATEMENT_TIMEOUT}'")
+
+    # The autocommit blocks below commit as they go, so every step is guarded
+    # by the catalog (the index build also drops an INVALID leftover of a
+    # failed concurrent build) and a failed run can be re-run.
+
+    # 1) Add support profile fields on users in a single ALTER TABLE
+    #    (one lock acquisition; constant defaults are metadata-only on PG 11+)
+    _execute_ddl(
         """
-        UPDATE sessions s
-        SET assigned_user_id = sup.user_id
-        FROM supporters sup
-        WHERE s.assigned_supporter_id = sup.supporter_id
+        ALTER TABLE users
+            ADD COLUMN IF NOT EXISTS supporter_status VARCHAR(50) DEFAULT 'offline',
+            ADD COLUMN IF NOT EXISTS max_concurrent_sessions INTEGER DEFAULT 5,
+            ADD COLUMN IF NOT EXISTS current_sessions_count INTEGER DEFAULT 0
         """
     )
 
-    # 4) Backfill messages.sender_user_id from supporters (only when NULL)
-    op.execute(
+    # 2) Add assigned_user_id to sessions and FK to users in one statement
+    _execute_ddl(
         """
-        UPDATE messages m
-        SET sender_user_id = sup.user_id
-        FROM supporters sup
-        WHERE m.sender_supporter_id = sup.supporter_id
-          AND m.sender_user_id IS NULL
+        DO $$ BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM pg_constraint
+                WHERE conname = 'fk_sessions_assigned_user_users'
+                  AND conrelid = 'sessions'::regclass
+            ) THEN
+                ALTER TABLE sessions
+                    ADD COLUMN IF NOT EXISTS assigned_user_id UUID,
+                    ADD CONSTRAINT fk_sessions_assigned_user_users
+                        FOREIGN KEY (assigned_user_id) REFERENCES users (user_id);
+            END IF;
+        END $$;
         """
     )
 
-    # 5) Drop supporters table (and dependent FKs) then drop referencing columns
-    op.execute("DROP TABLE IF EXISTS supporters CASCADE")
+    # 3-4) Only while supporters still exists: a re-run after step 5 has
+    # nothing left to copy from.
+    bind = op.get_bind()
+    if sa.inspect(bind).has_table("supporters"):
+        _backfill_from_supporters(bind)
+
+    # 5) Drop supporters table (and dependent FKs) then drop referencing
+    # columns, in one transaction
+    _execute_ddl("DROP TABLE IF EXISTS supporters CASCADE")
+    _execute_ddl("ALTER TABLE messages DROP COLUMN IF EXISTS sender_supporter_id")
+    _execute_ddl("ALTER TABLE sessions DROP COLUMN IF EXISTS assigned_supporter_id")
 
-    with op.batch_alter_table("messages") as batch:
-        batch.drop_column("sender_supporter_id")
+    # 6) Optional: index to help querying queue/assignment.
+    # Created after the backfill so the UPDATE does not maintain it row by
+    # row, and built CONCURRENTLY outside the migration transaction so writes
+    # to sessions are not blocked while it builds.
+    _create_index_concurrently(
+        "ix_sessions_assigned_user", "sessions", ["tenant_id", "assigned_user_id"]
+    )
 
-    with op.batch_alter_table("sessions") as batch:
-        batch.drop_column("assigned_supporter_id")
+    op.execute("RESET synchronous_commit")
+    op.execute("RESET work_mem")
+    op.execute("RESET maintenance_work_mem")
+    op.execute("RESET lock_timeout")
+    op.execute("RESET statement_timeout")
 
 
 def downgrade() -> None:
@@ -12,9 +12,13 @@ Revises: 5f2b2d7b9e3a
 Create Date: 2025-11-14 00:00:00.000000
 
 """
+import time
+
 from alembic import op
 import sqlalchemy as sa
+from psycopg2.errors import LockNotAvailable
 from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import OperationalError
 import uuid
 
 # revision identifiers, used by Alembic.
@@ -23,12 +27,89 @@ down_revision = '5f2b2d7b9e3a'
 branch_labels = None
 depends_on = None
 
+# Rows touched per statement in the batched data-migration steps
+BATCH_SIZE = 5000
+
+# Fail fast instead of queueing behind long-running readers (and making every
+# later writer queue behind us); blocked DDL is retried by _execute_ddl()
+LOCK_TIMEOUT = "3s"
+STATEMENT_TIMEOUT = "30min"
+LOCK_RETRY_ATTEMPTS = 5
+
+# Step 2 predicate: sessions.user_id values that cannot be cast to uuid
+NON_UUID_USER_ID = (
+    "user_id !~ '^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'"
+)
+
+
+def _execute_ddl(statement: str) -> None:
+    """Run a DDL statement in a savepoint, retrying when lock_timeout trips."""
+    bind = op.get_bind()
+    for attempt in range(1, LOCK_RETRY_ATTEMPTS + 1):
+        try:
+            with bind.begin_nested():
+                bind.execute(sa.text(statement))
+            return
+        except OperationalError as e:
+            if not isinstance(e.orig, LockNotAvailable) or attempt == LOCK_RETRY_ATTEMPTS:
+                raise
+            print(f"Lock not available, retrying ({attempt}/{LOCK_RETRY_ATTEMPTS})")
+            time.sleep(2 ** attempt)
+
+
+def _create_index_concurrently(name: str, table: str, columns: list) -> None:
+    """Build an index CONCURRENTLY, outside the migration transaction.
+
+    A concurrent build waits for every older transaction on the table, so
+    the fail-fast timeouts are lifted for the build and put back afterwards.
+    A failed or interrupted build leaves an INVALID index that IF NOT EXISTS
+    would count as present, so such a leftover is dropped and rebuilt.
+    """
+    bind = op.get_bind()
+    with op.get_context().autocommit_block():
+        op.execute("RESET lock_timeout")
+        op.execute("RESET statement_timeout")
+        valid = bind.execute(
+            sa.text("SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"),
+            {"name": name}
+        ).scalar()
+        if valid is False:
+            print(f"Dropping invalid index {name} left by a failed build")
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+        op.create_index(
+            name, table, columns,
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.execute(f"SET lock_timeout = '{LOCK_TIMEOUT}'")
+        op.execute(f"SET statement_timeout = '{STATEMENT_TIMEOUT}'")
+
+
+def _column_type(table: str, column: str):
+    """Current type of a column, read from the live catalog."""
+    for col in sa.inspect(op.get_bind()).get_columns(table):
+        if col['name'] == column:
+            return col['type']
+    return None
+
 
 def upgrade() -> None:
-    """Upgrade: Fix user_id type and create chat_users table."""
+    """Upgrade: Fix user_id type and create chat_users table.
+
+    The autocommit blocks commit as they go, so every step checks the
+    catalog first and a failed run can simply be re-run.
+    """
+
+    # Bulk-DML tuning for this connection only. Plain SET (not SET LOCAL) so
+    # the settings survive the commits issued by the autocommit blocks below;
+    # they are reset at the end of upgrade().
+    op.execute("SET synchronous_commit = off")
+    op.execute("SET work_mem = '256MB'")
+    op.execute("SET maintenance_work_mem = '1GB'")
+    op.execute(f"SET lock_timeout = '{LOCK_TIMEOUT}'")
+    op.execute(f"SET statement_timeout = '{STATEMENT_TIMEOUT}'")
 
     # Step 1: Drop old FK constraint (if exists) using SQL
-    op.execute("""
+    _execute_ddl("""
         DO $$ BEGIN
             BEGIN
                 ALTER TABLE sessions DROP CONSTRAINT fk_sessions_user_id_users;
@@ -38,83 +119,121 @@ def upgrade() -> None:
         END $$;
     """)
 
-    # Step 2: Create temporary column for new UUID values
-    op.add_column('sessions', sa.Column('user_id_new', postgresql.UUID(as_uuid=True), nullable=True))
+    # Drop the composite index up front so the user_id rewrite below does not
+    # maintain it for every row; it is rebuilt once at the end (Step 11).
+    _execute_ddl("DROP INDEX IF EXISTS ix_sessions_tenant_user")
 
-    # Step 3: Migrate existing data - convert valid UUIDs, generate for invalid
-    op.execute("""
-        UPDATE sessions
-        SET user_id_new = CASE
-            -- Try to convert if it looks like a UUID
-            WHEN user_id ~ '^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'
-            THEN user_id::uuid
-            -- Otherwise generate a new UUID (for "default_user", emails, etc)
-            ELSE gen_random_uuid()
-        END
-        WHERE user_id IS NOT NULL
-    """)
-
-    # Step 4: Drop the old String column
-    op.drop_column('sessions', 'user_id')
+    # Steps 2-6 only apply while user_id is still a string column; a re-run
+    # after the rewrite below skips straight to Step 7.
+    bind = op.get_bind()
+    if not isinstance(_column_type('sessions', 'user_id'), postgresql.UUID):
+        # Step 2: Sanitize user_id in place - replace anything that is not a
+        # UUID (for "default_user", emails, etc) with a generated one. Done in
+        # PK batches committed one at a time so locks and WAL stay bounded.
+        with op.get_context().autocommit_block():
+            while True:
+                result = bind.execute(sa.text(f"""
+                    UPDATE sessions
+                    SET user_id = gen_random_uuid()::text
+                    WHERE session_id IN (
+                        SELECT session_id FROM sessions
+                        WHERE {NON_UUID_USER_ID}
+                        LIMIT :batch_size
+                        FOR UPDATE SKIP LOCKED
+                    )
+                """), {"batch_size": BATCH_SIZE})
+                if result.rowcount == 0:
+                    break
 
-    # Step 5: Rename new column to original name
-    op.alter_column('sessions', 'user_id_new', new_column_name='user_id')
+        # SKIP LOCKED leaves rows that a live transaction held at the time.
+        # Sweep them up waiting on the locks (lock_timeout, retried), in the
+        # same transaction as the rewrite, so no non-UUID value can reach the
+        # USING cast below.
+        _execute_ddl(f"""
+            UPDATE sessions
+            SET user_id = gen_random_uuid()::text
+            WHERE {NON_UUID_USER_ID}
+        """)
 
-    # Step 6: Make user_id NOT NULL
-    op.alter_column('sessions', 'user_id', nullable=False)
+        # Steps 3-6: Convert the column to UUID in a single rewrite. The NOT
+        # NULL check piggybacks on the same scan instead of a second full pass.
+        _execute_ddl("""
+            ALTER TABLE sessions
+                ALTER COLUMN user_id TYPE uuid USING user_id::uuid,
+                ALTER COLUMN user_id SET NOT NULL
+        """)
 
     # Step 7: Create chat_users table
-    op.create_table(
-        'chat_users',
-        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
-        sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=False),
-        sa.Column('email', sa.String(255), nullable=False),
-        sa.Column('username', sa.String(255), nullable=False),
-        sa.Column('department', sa.String(255), nullable=True),
-        sa.Column('created_at', sa.TIMESTAMP(), nullable=False, server_default=sa.func.now()),
-        sa.Column('last_active', sa.TIMESTAMP(), nullable=False, server_default=sa.func.now()),
-        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.tenant_id'], name='fk_chat_users_tenant_id'),
-        sa.PrimaryKeyConstraint('user_id', name='pk_chat_users'),
-        sa.UniqueConstraint('tenant_id', 'email', name='uq_chat_users_tenant_email'),
-    )
+    if not sa.inspect(bind).has_table('chat_users'):
+        op.create_table(
+            'chat_users',
+            sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column('email', sa.String(255), nullable=False),
+            sa.Column('username', sa.String(255), nullable=False),
+            sa.Column('department', sa.String(255), nullable=True),
+            sa.Column('created_at', sa.TIMESTAMP(), nullable=False, server_default=sa.func.now()),
+            sa.Column('last_active', sa.TIMESTAMP(), nullable=False, server_default=sa.func.now()),
+            sa.ForeignKeyConstraint(['tenant_id'], ['tenants.tenant_id'], name='fk_chat_users_tenant_id'),
+            sa.PrimaryKeyConstraint('user_id', name='pk_chat_users'),
+            sa.UniqueConstraint('tenant_id', 'email', name='uq_chat_users_tenant_email'),
+        )
 
     # Step 8: Create indexes on chat_users
-    op.create_index('ix_chat_users_tenant_email', 'chat_users', ['tenant_id', 'email'])
-    op.create_index('ix_chat_users_tenant_id', 'chat_users', ['tenant_id'])
+    # CONCURRENTLY cannot run inside a transaction, so step out of the
+    # migration transaction for the index builds.
+    _create_index_concurrently('ix_chat_users_tenant_email', 'chat_users', ['tenant_id', 'email'])
+    _create_index_concurrently('ix_chat_users_tenant_id', 'chat_users', ['tenant_id'])
 
-    # Step 9: Migrate existing sessions to create corresponding chat_users
+    # Step 9: Migrate existing sessions to create corresponding chat_users.
+    # One INSERT ... SELECT, i.e. a single pass over sessions: there is no
+    # index leading with user_id to page on, so keyset batches would each
+    # rescan the table. GROUP BY + anti-join lets the planner use a
+    # HashAggregate / hash anti-join instead of a DISTINCT sort and a
+    # correlated NOT EXISTS per row; grouping by user_id alone also keeps a
+    # user seen under several tenants from hitting the PK, and ON CONFLICT
+    # makes a re-run a no-op.
     op.execute("""
         INSERT INTO chat_users (user_id, tenant_id, email, username, created_at, last_active)
-        SELECT DISTINCT s.user_id, s.tenant_id,
+        SELECT s.user_id, MIN(s.tenant_id::text)::uuid,
                'user_' || s.user_id::text || '@unknown.local' as email,
                'User ' || s.user_id::text as username,
                NOW(),
                NOW()
         FROM sessions s
-        WHERE NOT EXISTS (
-            SELECT 1 FROM chat_users cu
-            WHERE cu.user_id = s.user_id
-        )
+        LEFT JOIN chat_users cu ON cu.user_id = s.user_id
+        WHERE cu.user_id IS NULL
+        GROUP BY s.user_id
+        ON CONFLICT (user_id) DO NOTHING
     """)
 
-    # Step 10: Create new FK constraint pointing to chat_users
-    op.create_foreign_key(
-        'fk_sessions_user_id_chat_users',
-        'sessions', 'chat_users',
-        ['user_id'], ['user_id']
-    )
-
-    # Step 11: Recreate the index for sessions
-    op.execute("""
-        DROP INDEX IF EXISTS ix_sessions_tenant_user;
+    # Step 10: Create new FK constraint pointing to chat_users (if a previous
+    # run has not already added it)
+    _execute_ddl("""
+        DO $$ BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM pg_constraint
+                WHERE conname = 'fk_sessions_user_id_chat_users'
+                  AND conrelid = 'sessions'::regclass
+            ) THEN
+                ALTER TABLE sessions ADD CONSTRAINT fk_sessions_user_id_chat_users
+                FOREIGN KEY (user_id) REFERENCES chat_users (user_id);
+            END IF;
+        END $$;
     """)
 
-    op.create_index(
-        'ix_sessions_tenant_user',
-        'sessions',
-        ['tenant_id', 'user_id', 'created_at']
+    # Step 11: Recreate the index for sessions (dropped before Step 2).
+    # Build without blocking writes on sessions
+    _create_index_concurrently(
+        'ix_sessions_tenant_user', 'sessions', ['tenant_id', 'user_id', 'created_at']
     )
 
+    op.execute("RESET synchronous_commit")
+    op.execute("RESET work_mem")
+    op.execute("RESET maintenance_work_mem")
+    op.execute("RESET lock_timeout")
+    op.execute("RESET statement_timeout")
+
     print("Successfully fixed user_id type and created chat_users table")
 
 
@@ -143,7 +262,7 @@ def downgrade() -> None:
     # Step 4: Convert user_id back to String (lossy operation, will lose UUID data)
     op.add_column('sessions', sa.Column('user_id_old', sa.String(255), nullable=True))
     op.execute("UPDATE sessions SET user_id_old = user_id::text WHERE user_id IS NOT NULL")
-    op.drop_column('sessions', 'user_id')
+    _execute_ddl("ALTER TABLE sessions DROP COLUMN user_id")
     op.alter_column('sessions', 'user_id_old', new_column_name='user_id')
 
     # Step 5: Recreate FK constraint to users table
@@ -0,0 +1,46 @@
+"""Index knowledge base chunks by tenant and ingestion time.
+
+The admin "list all documents" query filters langchain_pg_embedding on
+cmetadata->>'tenant_id' and sorts by cmetadata->>'ingested_at' DESC with a
+LIMIT. Without an expression index that is a full scan plus a sort of every
+tenant row. Containment filters (cmetadata @> ...) are already served by the
+ix_cmetadata_gin jsonb_path_ops index that langchain_postgres creates.
+
+The table is created by langchain_postgres on first ingestion, not by
+Alembic, so the index is skipped when the table does not exist yet.
+
+Revision ID: 4e7b2c9d1f3a
+Revises: 8a1c0e5f9d2b
+Create Date: 2025-11-20 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '4e7b2c9d1f3a'
+down_revision = '8a1c0e5f9d2b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade: Add (tenant_id, ingested_at DESC) expression index on embeddings."""
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table('langchain_pg_embedding'):
+        print("langchain_pg_embedding does not exist yet, skipping index")
+        return
+
+    # CONCURRENTLY cannot run inside a transaction, so step out of the
+    # migration transaction; the build does not block ingestion writes
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_embedding_tenant_ingested
+            ON langchain_pg_embedding ((cmetadata->>'tenant_id'), (cmetadata->>'ingested_at') DESC)
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade: Drop the expression index."""
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_embedding_tenant_ingested")
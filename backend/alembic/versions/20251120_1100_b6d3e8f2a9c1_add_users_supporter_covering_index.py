@@ -0,0 +1,51 @@
+"""Add a partial covering index for supporter staff listings.
+
+get_staff filters users on tenant_id + role = 'supporter' and
+get_available_staff additionally orders by current_sessions_count. The
+partial index keys on (tenant_id, current_sessions_count) for supporters only
+and INCLUDEs every column those listings return, so both become index-only
+scans.
+
+Revision ID: b6d3e8f2a9c1
+Revises: 4e7b2c9d1f3a
+Create Date: 2025-11-20 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'b6d3e8f2a9c1'
+down_revision = '4e7b2c9d1f3a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade: Add ix_users_tenant_supporter_sessions."""
+    # CONCURRENTLY cannot run inside a transaction; build without blocking
+    # logins and supporter status updates on users
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_tenant_supporter_sessions',
+            'users',
+            ['tenant_id', 'current_sessions_count'],
+            postgresql_include=[
+                'user_id', 'email', 'username', 'display_name',
+                'supporter_status', 'max_concurrent_sessions', 'created_at',
+            ],
+            postgresql_where=sa.text("role = 'supporter'"),
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade: Drop ix_users_tenant_supporter_sessions."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_users_tenant_supporter_sessions',
+            table_name='users',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
@@ -0,0 +1,57 @@
+"""Add keyset pagination indexes for the admin session and tenant listings.
+
+list_tenant_sessions pages on (last_message_at, session_id) DESC within a
+tenant and list_tenants on (created_at, tenant_id); with these indexes a
+cursor page is an index seek instead of an OFFSET scan-and-discard.
+
+Revision ID: c7e2a5f1b8d4
+Revises: b6d3e8f2a9c1
+Create Date: 2025-11-21 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'c7e2a5f1b8d4'
+down_revision = 'b6d3e8f2a9c1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade: Add ix_sessions_tenant_last_message and ix_tenants_created."""
+    # CONCURRENTLY cannot run inside a transaction; build without blocking
+    # session and tenant writes
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_sessions_tenant_last_message',
+            'sessions',
+            ['tenant_id', sa.text('last_message_at DESC'), sa.text('session_id DESC')],
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        op.create_index(
+            'ix_tenants_created',
+            'tenants',
+            ['created_at', 'tenant_id'],
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade: Drop the keyset pagination indexes."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_tenants_created',
+            table_name='tenants',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
+        op.drop_index(
+            'ix_sessions_tenant_last_message',
+            table_name='sessions',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
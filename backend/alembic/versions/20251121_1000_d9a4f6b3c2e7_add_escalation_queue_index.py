@@ -0,0 +1,64 @@
+"""Add the escalation queue index and drop the superseded last_message_at index.
+
+get_escalation_queue filters sessions on tenant_id and
+escalation_status <> 'none' and sorts by escalation_requested_at DESC. The
+partial index keys exactly that, so the queue is read in index order with
+no Sort node, and only escalated sessions are indexed.
+
+The single-column ix_sessions_last_message_at is no longer used by any
+query: the admin listing goes through ix_sessions_tenant_last_message.
+last_message_at is rewritten on every message, so dropping the extra index
+saves one index update per message.
+
+Revision ID: d9a4f6b3c2e7
+Revises: c7e2a5f1b8d4
+Create Date: 2025-11-21 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'd9a4f6b3c2e7'
+down_revision = 'c7e2a5f1b8d4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade: Add ix_sessions_escalation_queue, drop ix_sessions_last_message_at."""
+    # CONCURRENTLY cannot run inside a transaction; build without blocking
+    # message writes on sessions
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_sessions_escalation_queue',
+            'sessions',
+            ['tenant_id', sa.text('escalation_requested_at DESC')],
+            postgresql_where=sa.text("escalation_status <> 'none'"),
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        op.drop_index(
+            'ix_sessions_last_message_at',
+            table_name='sessions',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade: Restore ix_sessions_last_message_at, drop the queue index."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_sessions_last_message_at',
+            'sessions',
+            ['last_message_at'],
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        op.drop_index(
+            'ix_sessions_escalation_queue',
+            table_name='sessions',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
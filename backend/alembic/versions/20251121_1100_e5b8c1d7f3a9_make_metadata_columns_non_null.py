@@ -0,0 +1,175 @@
+"""Make sessions.metadata and messages.metadata non-null JSON objects.
+
+The models map both columns as MutableDict JSONB with a dict default, so
+every loaded value is a real dict and the serializers no longer need
+None/proxy fallbacks.
+
+Existing values are normalized first, in PK batches committed one at a
+time: NULL becomes '{}', and a non-object value (array, string, number)
+is kept by wrapping it as {"value": <old value>}; the number of wrapped
+rows is printed. NOT NULL is then added without a long exclusive lock: a
+NOT VALID CHECK constraint is added (brief lock), validated under SHARE
+UPDATE EXCLUSIVE (writes continue), and SET NOT NULL reuses it instead of
+scanning the table.
+
+Revision ID: e5b8c1d7f3a9
+Revises: d9a4f6b3c2e7
+Create Date: 2025-11-21 11:00:00.000000
+
+"""
+import time
+
+from alembic import op
+import sqlalchemy as sa
+from psycopg2.errors import LockNotAvailable
+from sqlalchemy.exc import OperationalError
+
+# revision identifiers, used by Alembic.
+revision = 'e5b8c1d7f3a9'
+down_revision = 'd9a4f6b3c2e7'
+branch_labels = None
+depends_on = None
+
+# Table -> primary key column
+TABLES = {'sessions': 'session_id', 'messages': 'message_id'}
+
+# Rows visited per batch of the backfill (a PK range, committed on its own)
+BATCH_SIZE = 10000
+
+# Fail fast instead of queueing behind long-running readers (and making every
+# later writer queue behind us); blocked statements are retried
+LOCK_TIMEOUT = "3s"
+STATEMENT_TIMEOUT = "30min"
+LOCK_RETRY_ATTEMPTS = 5
+
+
+def _retry_on_lock_timeout(run):
+    """Call run(), backing off and retrying when lock_timeout trips."""
+    for attempt in range(1, LOCK_RETRY_ATTEMPTS + 1):
+        try:
+            return run()
+        except OperationalError as e:
+            if not isinstance(e.orig, LockNotAvailable) or attempt == LOCK_RETRY_ATTEMPTS:
+                raise
+            print(f"Lock not available, retrying ({attempt}/{LOCK_RETRY_ATTEMPTS})")
+            time.sleep(2 ** attempt)
+
+
+def _execute_ddl(statement: str) -> None:
+    """Run a DDL statement in a savepoint, retrying when lock_timeout trips."""
+    bind = op.get_bind()
+
+    def run():
+        with bind.begin_nested():
+            bind.execute(sa.text(statement))
+
+    _retry_on_lock_timeout(run)
+
+
+def _execute_autocommit(statement: str, params: dict = None):
+    """Run one statement inside an autocommit block (its own transaction,
+    so no savepoint), retrying when lock_timeout trips."""
+    bind = op.get_bind()
+    return _retry_on_lock_timeout(lambda: bind.execute(sa.text(statement), params or {}))
+
+
+def _normalize_metadata(table: str, pk: str) -> None:
+    """Rewrite NULL / non-object metadata one PK range at a time.
+
+    Walks the primary key index with a keyset, so each batch reads only its
+    own range instead of rescanning rows that earlier batches already fixed.
+    """
+    bind = op.get_bind()
+    wrapped = 0
+    last_pk = None
+    with op.get_context().autocommit_block():
+        while True:
+            upper_pk = bind.execute(sa.text(f"""
+                SELECT max({pk}) FROM (
+                    SELECT {pk} FROM {table}
+                    WHERE CAST(:last_pk AS uuid) IS NULL OR {pk} > CAST(:last_pk AS uuid)
+                    ORDER BY {pk}
+                    LIMIT :batch_size
+                ) batch
+            """), {"last_pk": last_pk, "batch_size": BATCH_SIZE}).scalar()
+            if upper_pk is None:
+                break
+
+            changed = _execute_autocommit(f"""
+                UPDATE {table}
+                SET metadata = CASE
+                    WHEN metadata IS NULL THEN '{{}}'::jsonb
+                    ELSE jsonb_build_object('value', metadata)
+                END
+                WHERE (CAST(:last_pk AS uuid) IS NULL OR {pk} > CAST(:last_pk AS uuid))
+                  AND {pk} <= CAST(:upper_pk AS uuid)
+                  AND (metadata IS NULL OR jsonb_typeof(metadata) <> 'object')
+                RETURNING metadata <> '{{}}'::jsonb
+            """, {"last_pk": last_pk, "upper_pk": str(upper_pk)})
+            # NULL became '{}'; anything else was wrapped
+            wrapped += sum(1 for (was_wrapped,) in changed if was_wrapped)
+            last_pk = str(upper_pk)
+
+    if wrapped:
+        print(f"{table}.metadata: wrapped {wrapped} non-object value(s) as {{\"value\": ...}}")
+
+
+def _set_not_null(table: str) -> None:
+    """SET NOT NULL via a validated CHECK, so no exclusive full-table scan."""
+    check = f"ck_{table}_metadata_not_null"
+
+    # Brief ACCESS EXCLUSIVE: NOT VALID skips the scan
+    _execute_ddl(f"""
+        DO $$ BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM pg_constraint
+                WHERE conname = '{check}' AND conrelid = '{table}'::regclass
+            ) THEN
+                ALTER TABLE {table}
+                    ADD CONSTRAINT {check} CHECK (metadata IS NOT NULL) NOT VALID;
+            END IF;
+        END $$;
+    """)
+
+    # Entering the autocommit block commits the lock above; the scan then
+    # runs under SHARE UPDATE EXCLUSIVE, which does not block writes
+    with op.get_context().autocommit_block():
+        _execute_autocommit(f"ALTER TABLE {table} VALIDATE CONSTRAINT {check}")
+
+    # PostgreSQL 12+ proves NOT NULL from the validated CHECK without a scan
+    _execute_ddl(f"""
+        ALTER TABLE {table}
+            ALTER COLUMN metadata SET DEFAULT '{{}}'::jsonb,
+            ALTER COLUMN metadata SET NOT NULL
+    """)
+    _execute_ddl(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {check}")
+
+
+def upgrade() -> None:
+    """Upgrade: Normalize metadata and set DEFAULT '{}' NOT NULL on it."""
+    # Plain SET (not SET LOCAL) so the settings survive the commits issued by
+    # the autocommit blocks; they are reset at the end of upgrade()
+    op.execute(f"SET lock_timeout = '{LOCK_TIMEOUT}'")
+    op.execute(f"SET statement_timeout = '{STATEMENT_TIMEOUT}'")
+
+    for table, pk in TABLES.items():
+        _normalize_metadata(table, pk)
+        _set_not_null(table)
+
+    op.execute("RESET lock_timeout")
+    op.execute("RESET statement_timeout")
+
+
+def downgrade() -> None:
+    """Downgrade: Make metadata nullable again without a server default.
+
+    Wrapped non-object values are left as {"value": ...}.
+    """
+    op.execute(f"SET lock_timeout = '{LOCK_TIMEOUT}'")
+    for table in TABLES:
+        _execute_ddl(f"""
+            ALTER TABLE {table}
+                ALTER COLUMN metadata DROP DEFAULT,
+                ALTER COLUMN metadata DROP NOT NULL
+        """)
+    op.execute("RESET lock_timeout")
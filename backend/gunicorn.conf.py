@@ -1,25 +1,56 @@
 """Gunicorn configuration for production deployment.
 
 This config enables:
-- Auto-scaling workers based on CPU cores
+- Worker count bounded by the container's CPU quota
 - Graceful reload with zero downtime
 - Worker health monitoring and auto-restart
 - Production-grade logging
 """
+import math
 import multiprocessing
 import os
 
+
+def _available_cpus() -> int:
+    """CPUs this container may actually use.
+
+    multiprocessing.cpu_count() reports the host's cores and ignores
+    Docker/Kubernetes limits, so prefer the cgroup v2 quota (cpu.max),
+    then the scheduler affinity mask, then the host count.
+    """
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()[:2]
+        if quota != "max":
+            return max(1, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return multiprocessing.cpu_count()
+
+
+# Resolved once at config load
+CPU_COUNT = _available_cpus()
+
 # ============================================================================
 # Worker Configuration
 # ============================================================================
 
 # Number of worker processes
-# Formula: (2 x CPU cores) + 1
+# Each worker loads its own embedding model and opens its own SQLAlchemy pool
+# (up to DB_POOL_SIZE + DB_MAX_OVERFLOW connections), so the default stays at
+# 2 and is only lowered when the CPU quota is smaller. Raising it means
+# sizing the per-worker pool so that workers x pool fits max_connections.
 # Can be overridden with WORKERS env var
-workers = 2
+DEFAULT_WORKERS = 2
+workers = int(os.getenv("WORKERS", min(DEFAULT_WORKERS, CPU_COUNT)))
 
-# Worker class - use Uvicorn workers for ASGI support
-worker_class = "uvicorn.workers.UvicornWorker"
+# Worker class - Uvicorn worker for ASGI support, pinned to uvloop + httptools
+# (both ship with uvicorn[standard])
+worker_class = "src.workers.FastUvicornWorker"
 
 # Worker connections (for async workers)
 worker_connections = 1000
@@ -82,7 +113,7 @@ proc_name = "itl-chatbot"
 def on_starting(server):
     """Called just before the master process is initialized."""
     server.log.info("Starting Gunicorn server")
-    server.log.info(f"Workers: {workers}")
+    server.log.info(f"Workers: {workers} (available CPUs: {CPU_COUNT})")
     server.log.info(f"Worker class: {worker_class}")
     server.log.info(f"Binding: {bind}")
 
@@ -23,18 +23,20 @@ def run_migrations():
         print(f"Working directory: {os.getcwd()}")
         print("Running: alembic upgrade head")
 
-        result = subprocess.run(
+        # Stream Alembic output line by line instead of buffering it all
+        proc = subprocess.Popen(
             ["alembic", "upgrade", "head"],
-            capture_output=True,
-            text=True
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1
         )
+        for line in proc.stdout:
+            print(line, end="", flush=True)
+        returncode = proc.wait()
 
-        print(result.stdout)
-        if result.stderr:
-            print("STDERR:", result.stderr)
-
-        if result.returncode != 0:
-            print(f"❌ Alembic migration failed with code {result.returncode}")
+        if returncode != 0:
+            print(f"❌ Alembic migration failed with code {returncode}")
             return False
 
         print("✅ Step 0: Database tables created successfully")
@@ -2,71 +2,90 @@
 """Step 2: Seed LLM models into database."""
 
 import sys
-import json
-import uuid
+from datetime import datetime
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.models import LLMModel
 from src.config import SessionLocal
+from migrations.seed_helpers import batch_uuids, copy_rows, iter_seed_batches
+from sqlalchemy import text
 
 
 def seed_llm_models():
     """Load and seed LLM models from JSON file."""
-    db = SessionLocal()
     try:
-        # Check if all 3 models from our seeding exist
-        gemini25 = db.query(LLMModel).filter_by(model_name="gemini-2.5-flash").first()
-        gemini20 = db.query(LLMModel).filter_by(model_name="google/gemini-2.0-flash-exp:free").first()
-        gpt4o = db.query(LLMModel).filter_by(model_name="openai/gpt-4o-mini").first()
-
-        if gemini25 and gemini20 and gpt4o:
-            print("✓ All LLM models already seeded, skipping")
-            return True
-
-        print("Seeding LLM models...")
-
-        # Load data from JSON
-        data_file = Path(__file__).parent / "data" / "llm_models.json"
-        with open(data_file, 'r') as f:
-            llm_models_data = json.load(f)
-
-        models_count = 0
-        for model_data in llm_models_data:
-            # Check if model already exists
-            existing_model = db.query(LLMModel).filter_by(
-                provider=model_data["provider"],
-                model_name=model_data["model_name"]
-            ).first()
-
-            if not existing_model:
-                # Map input_cost/output_cost per 1M to per 1K tokens
-                input_cost_per_1k = (model_data.get("input_cost_per_1m", 0) / 1000) if model_data.get("input_cost_per_1m") else 0
-                output_cost_per_1k = (model_data.get("output_cost_per_1m", 0) / 1000) if model_data.get("output_cost_per_1m") else 0
-
-                model = LLMModel(
-                    llm_model_id=uuid.uuid4(),
-                    provider=model_data["provider"],
-                    model_name=model_data["model_name"],
-                    context_window=model_data.get("context_window", 4096),
-                    cost_per_1k_input_tokens=input_cost_per_1k,
-                    cost_per_1k_output_tokens=output_cost_per_1k,
-                    is_active=model_data.get("is_active", True)
+        with SessionLocal() as db, db.begin():
+            # Check if all 3 models from our seeding exist
+            gemini25 = db.query(LLMModel).filter_by(model_name="gemini-2.5-flash").first()
+            gemini20 = db.query(LLMModel).filter_by(model_name="google/gemini-2.0-flash-exp:free").first()
+            gpt4o = db.query(LLMModel).filter_by(model_name="openai/gpt-4o-mini").first()
+
+            if gemini25 and gemini20 and gpt4o:
+                print("✓ All LLM models already seeded, skipping")
+                return True
+
+            print("Seeding LLM models...")
+
+            # Stream the JSON file in batches and insert only the missing rows of each
+            models_count = 0
+            now = datetime.utcnow()
+            for llm_models_data in iter_seed_batches("llm_models.json"):
+                # Fetch existing (provider, model_name) pairs for this batch in one query
+                existing_models = {
+                    (row[0], row[1]) for row in db.execute(
+                        text("""
+                            SELECT provider, model_name FROM llm_models
+                            WHERE (provider, model_name) IN (
+                                SELECT * FROM unnest(CAST(:providers AS text[]), CAST(:model_names AS text[]))
+                            )
+                        """),
+                        {
+                            "providers": [m["provider"] for m in llm_models_data],
+                            "model_names": [m["model_name"] for m in llm_models_data]
+                        }
+                    )
+                }
+
+                ids = iter(batch_uuids(len(llm_models_data)))
+                rows = []
+                for model_data in llm_models_data:
+                    if (model_data["provider"], model_data["model_name"]) not in existing_models:
+                        # Map input_cost/output_cost per 1M to per 1K tokens
+                        input_cost_per_1k = (model_data.get("input_cost_per_1m", 0) / 1000) if model_data.get("input_cost_per_1m") else 0
+                        output_cost_per_1k = (model_data.get("output_cost_per_1m", 0) / 1000) if model_data.get("output_cost_per_1m") else 0
+
+                        rows.append((
+                            next(ids),
+                            model_data["provider"],
+                            model_data["model_name"],
+                            model_data.get("context_window", 4096),
+                            input_cost_per_1k,
+                            output_cost_per_1k,
+                            model_data.get("is_active", True),
+                            now
+                        ))
+
+                models_count += copy_rows(
+                    db,
+                    "llm_models",
+                    ("llm_model_id", "provider", "model_name", "context_window",
+                     "cost_per_1k_input_tokens", "cost_per_1k_output_tokens", "is_active", "created_at"),
+                    rows
                 )
-                db.add(model)
-                models_count += 1
 
-        db.commit()
         print(f"✅ {models_count} LLM models seeded")
         return True
 
     except Exception as e:
         print(f"❌ Error seeding LLM models: {e}")
-        db.rollback()
         return False
-    finally:
-        db.close()
+
+
+def run() -> bool:
+    """Run this step in-process (used by the orchestrators)."""
+    return seed_llm_models()
 
 
 if __name__ == "__main__":
@@ -74,7 +93,7 @@ if __name__ == "__main__":
     print("Step 2: Seed LLM Models")
     print("="*60)
 
-    success = seed_llm_models()
+    success = run()
 
     if success:
         print("✅ Step 2: LLM models seeded successfully")
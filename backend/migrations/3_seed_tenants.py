@@ -2,63 +2,76 @@
 """Step 3: Seed tenants into database."""
 
 import sys
-import json
-import uuid
+from datetime import datetime
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.models import Tenant
 from src.config import SessionLocal
+from migrations.seed_helpers import batch_uuids, copy_rows, iter_seed_batches
+from sqlalchemy import text
 
 
 def seed_tenants():
     """Load and seed tenants from JSON file."""
-    db = SessionLocal()
     try:
-        # Check if all 3 tenants already exist
-        etms = db.query(Tenant).filter_by(name="eTMS").first()
-        efms = db.query(Tenant).filter_by(name="eFMS").first()
-        vela = db.query(Tenant).filter_by(name="Vela").first()
-
-        if etms and efms and vela:
-            print("✓ All tenants already seeded, skipping")
-            return True
-
-        print("Seeding tenants...")
-
-        # Load data from JSON
-        data_file = Path(__file__).parent / "data" / "tenants.json"
-        with open(data_file, 'r') as f:
-            tenants_data = json.load(f)
-
-        tenants_count = 0
-        for tenant_data in tenants_data:
-            # Check if tenant already exists
-            existing_tenant = db.query(Tenant).filter_by(
-                domain=tenant_data["domain"]
-            ).first()
-
-            if not existing_tenant:
-                tenant = Tenant(
-                    tenant_id=uuid.uuid4(),
-                    name=tenant_data["name"],
-                    domain=tenant_data["domain"],
-                    status="active"
+        with SessionLocal() as db, db.begin():
+            # Check if all 3 tenants already exist
+            etms = db.query(Tenant).filter_by(name="eTMS").first()
+            efms = db.query(Tenant).filter_by(name="eFMS").first()
+            vela = db.query(Tenant).filter_by(name="Vela").first()
+
+            if etms and efms and vela:
+                print("✓ All tenants already seeded, skipping")
+                return True
+
+            print("Seeding tenants...")
+
+            # Stream the JSON file in batches and insert only the missing rows of each
+            tenants_count = 0
+            now = datetime.utcnow()
+            for tenants_data in iter_seed_batches("tenants.json"):
+                # Fetch existing domains for this batch in one query
+                domains = [tenant_data["domain"] for tenant_data in tenants_data]
+                existing_domains = {
+                    row[0] for row in db.execute(
+                        text("SELECT domain FROM tenants WHERE domain = ANY(:domains)"),
+                        {"domains": domains}
+                    )
+                }
+
+                ids = iter(batch_uuids(len(tenants_data)))
+                rows = []
+                for tenant_data in tenants_data:
+                    if tenant_data["domain"] not in existing_domains:
+                        rows.append((
+                            next(ids),
+                            tenant_data["name"],
+                            tenant_data["domain"],
+                            "active",
+                            now,
+                            now
+                        ))
+
+                tenants_count += copy_rows(
+                    db,
+                    "tenants",
+                    ("tenant_id", "name", "domain", "status", "created_at", "updated_at"),
+                    rows
                 )
-                db.add(tenant)
-                tenants_count += 1
 
-        db.commit()
         print(f"✅ {tenants_count} tenants seeded")
         return True
 
     except Exception as e:
         print(f"❌ Error seeding tenants: {e}")
-        db.rollback()
         return False
-    finally:
-        db.close()
+
+
+def run() -> bool:
+    """Run this step in-process (used by the orchestrators)."""
+    return seed_tenants()
 
 
 if __name__ == "__main__":
@@ -66,7 +79,7 @@ if __name__ == "__main__":
     print("Step 3: Seed Tenants")
     print("="*60)
 
-    success = seed_tenants()
+    success = run()
 
     if success:
         print("✅ Step 3: Tenants seeded successfully")
@@ -2,72 +2,86 @@
 """Step 4: Seed agents into database."""
 
 import sys
-import json
-import uuid
+from datetime import datetime
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.models import AgentConfig, LLMModel
 from src.config import SessionLocal
+from migrations.seed_helpers import batch_uuids, copy_rows, iter_seed_batches
+from sqlalchemy import text
 
 
 def seed_agents():
     """Load and seed agents from JSON file."""
-    db = SessionLocal()
     try:
-        # Check if SupervisorAgent exists (critical agent that defines complete seeding)
-        supervisor = db.query(AgentConfig).filter_by(name="SupervisorAgent").first()
-        if supervisor:
-            print("✓ Agents already seeded (SupervisorAgent found), skipping")
-            return True
-
-        print("Seeding agents...")
-
-        # Load data from JSON
-        data_file = Path(__file__).parent / "data" / "agents.json"
-        with open(data_file, 'r') as f:
-            agents_data = json.load(f)
-
-        # Get default LLM model (use first available)
-        default_llm = db.query(LLMModel).first()
-        if not default_llm:
-            print("❌ No LLM models found. Run seed_llm_models.py first.")
-            return False
-
-        agents_count = 0
-        for agent_data in agents_data:
-            # Check if agent already exists
-            existing_agent = db.query(AgentConfig).filter_by(
-                name=agent_data["name"]
-            ).first()
-
-            if not existing_agent:
-                # Use system_prompt from JSON as prompt_template
-                prompt_template = agent_data.get("system_prompt", f"You are {agent_data['name']}")
-
-                agent = AgentConfig(
-                    agent_id=uuid.uuid4(),
-                    name=agent_data["name"],
-                    prompt_template=prompt_template,
-                    llm_model_id=default_llm.llm_model_id,
-                    description=agent_data.get("description", ""),
-                    handler_class="services.domain_agents.DomainAgent",
-                    is_active=agent_data.get("is_active", True)
+        with SessionLocal() as db, db.begin():
+            # Check if SupervisorAgent exists (critical agent that defines complete seeding)
+            supervisor = db.query(AgentConfig).filter_by(name="SupervisorAgent").first()
+            if supervisor:
+                print("✓ Agents already seeded (SupervisorAgent found), skipping")
+                return True
+
+            print("Seeding agents...")
+
+            # Get default LLM model (use first available)
+            default_llm = db.query(LLMModel).first()
+            if not default_llm:
+                print("❌ No LLM models found. Run seed_llm_models.py first.")
+                return False
+
+            # Stream the JSON file in batches and insert only the missing rows of each
+            agents_count = 0
+            now = datetime.utcnow()
+            for agents_data in iter_seed_batches("agents.json"):
+                # Fetch existing agent names for this batch in one query
+                names = [agent_data["name"] for agent_data in agents_data]
+                existing_names = {
+                    row[0] for row in db.execute(
+                        text("SELECT name FROM agent_configs WHERE name = ANY(:names)"),
+                        {"names": names}
+                    )
+                }
+
+                ids = iter(batch_uuids(len(agents_data)))
+                rows = []
+                for agent_data in agents_data:
+                    if agent_data["name"] not in existing_names:
+                        # Use system_prompt from JSON as prompt_template
+                        prompt_template = agent_data.get("system_prompt", f"You are {agent_data['name']}")
+
+                        rows.append((
+                            next(ids),
+                            agent_data["name"],
+                            prompt_template,
+                            default_llm.llm_model_id,
+                            agent_data.get("description", ""),
+                            "services.domain_agents.DomainAgent",
+                            agent_data.get("is_active", True),
+                            now,
+                            now
+                        ))
+
+                agents_count += copy_rows(
+                    db,
+                    "agent_configs",
+                    ("agent_id", "name", "prompt_template", "llm_model_id", "description",
+                     "handler_class", "is_active", "created_at", "updated_at"),
+                    rows
                 )
-                db.add(agent)
-                agents_count += 1
 
-        db.commit()
         print(f"✅ {agents_count} agents seeded")
         return True
 
     except Exception as e:
         print(f"❌ Error seeding agents: {e}")
-        db.rollback()
         return False
-    finally:
-        db.close()
+
+
+def run() -> bool:
+    """Run this step in-process (used by the orchestrators)."""
+    return seed_agents()
 
 
 if __name__ == "__main__":
@@ -75,7 +89,7 @@ if __name__ == "__main__":
     print("Step 4: Seed Agents")
     print("="*60)
 
-    success = seed_agents()
+    success = run()
 
     if success:
         print("✅ Step 4: Agents seeded successfully")
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """Step 7: Seed tenant LLM configurations with API key encryption."""
 
+import functools
 import sys
 import os
 import uuid
@@ -16,115 +17,138 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.models import TenantLLMConfig, Tenant, LLMModel
 from src.config import SessionLocal, settings
+from sqlalchemy import insert, select
 
 
-def encrypt_api_key(api_key: str) -> str:
-    """Encrypt API key using Fernet."""
+@functools.lru_cache(maxsize=1)
+def _cipher() -> Fernet:
+    """Build the Fernet cipher once; key decoding is not repeated per API key."""
     if not settings.FERNET_KEY:
         raise ValueError("FERNET_KEY not set in environment")
 
-    cipher = Fernet(settings.FERNET_KEY.encode())
-    encrypted = cipher.encrypt(api_key.encode())
-    return encrypted.decode()
+    return Fernet(settings.FERNET_KEY.encode())
+
+
+def encrypt_api_key(api_key: str) -> str:
+    """Encrypt API key using Fernet."""
+    return _cipher().encrypt(api_key.encode()).decode()
 
 
 def seed_llm_configs():
     """Seed tenant LLM configurations with encrypted API keys."""
-    db = SessionLocal()
     try:
-        print("Seeding tenant LLM configurations...")
-
-        # Define tenant-to-LLM mappings
-        configs = [
-            {
-                "tenant_name": "Test_eTMS",
-                "provider": "google",
-                "model_name": "gemini-2.5-flash"
+        with SessionLocal() as db, db.begin():
+            print("Seeding tenant LLM configurations...")
+
+            # Define tenant-to-LLM mappings
+            configs = [
+                {
+                    "tenant_name": "Test_eTMS",
+                    "provider": "google",
+                    "model_name": "gemini-2.5-flash"
+                }
+            ]
+
+            # Check if all expected configs already exist (specific check)
+            expected_configs = len(configs)
+            existing_configs = db.query(TenantLLMConfig).count()
+
+            if existing_configs >= expected_configs:
+                print(f"✓ All {expected_configs} LLM configs already seeded, skipping")
+                return True
+
+            # Fail before any lookups if keys cannot be encrypted
+            _cipher()
+
+            # Now load API keys only from environment
+            api_keys = {
+                "google": os.getenv("GOOGLE_API_KEY"),
+                "openrouter": os.getenv("OPENROUTER_API_KEY")
             }
-        ]
-
-        # Check if all expected configs already exist (specific check)
-        expected_configs = len(configs)
-        existing_configs = db.query(TenantLLMConfig).count()
-
-        if existing_configs >= expected_configs:
-            print(f"✓ All {expected_configs} LLM configs already seeded, skipping")
-            return True
-
-        # Now load API keys only from environment
-        api_keys = {
-            "google": os.getenv("GOOGLE_API_KEY"),
-            "openrouter": os.getenv("OPENROUTER_API_KEY")
-        }
-
-        # Check if required API keys are available
-        missing_keys = [k for k, v in api_keys.items() if not v]
-        if missing_keys:
-            print(f"⚠ Warning: Missing API keys in environment: {', '.join(missing_keys)}")
-            print("  Set these environment variables:")
-            for key in missing_keys:
-                print(f"    - {key.upper()}_API_KEY")
-
-        configs_count = 0
-        for config_data in configs:
-            tenant = db.query(Tenant).filter_by(name=config_data["tenant_name"]).first()
-            llm_model = db.query(LLMModel).filter_by(
-                provider=config_data["provider"],
-                model_name=config_data["model_name"]
-            ).first()
-
-            if tenant and llm_model:
-                # Check if config already exists for this tenant
-                existing_config = db.query(TenantLLMConfig).filter_by(
-                    tenant_id=tenant.tenant_id
-                ).first()
-
-                if not existing_config:
-                    # Get API key for this provider
-                    api_key = api_keys.get(config_data["provider"], "")
-
-                    if not api_key:
-                        print(f"⚠ Warning: No API key for provider '{config_data['provider']}'")
-                        continue
-
-                    # Encrypt API key
-                    try:
-                        encrypted_api_key = encrypt_api_key(api_key)
-                    except Exception as e:
-                        print(f"⚠ Warning: Failed to encrypt API key for {config_data['tenant_name']}: {e}")
-                        raise  # Don't continue with unencrypted keys
-
-                    # Create TenantLLMConfig with CORRECT column names
-                    # config_id is auto-generated (no need to set)
-                    config = TenantLLMConfig(
-                        tenant_id=tenant.tenant_id,
-                        llm_model_id=llm_model.llm_model_id,  # FIXED: was model_id
-                        encrypted_api_key=encrypted_api_key,
-                        rate_limit_rpm=60,  # Default value
-                        rate_limit_tpm=10000  # Default value
-                        # temperature and max_tokens do NOT exist in TenantLLMConfig
-                    )
-                    db.add(config)
-                    configs_count += 1
-                    print(f"  ✓ {config_data['tenant_name']}: {config_data['model_name']}")
+
+            # Check if required API keys are available
+            missing_keys = [k for k, v in api_keys.items() if not v]
+            if missing_keys:
+                print(f"⚠ Warning: Missing API keys in environment: {', '.join(missing_keys)}")
+                print("  Set these environment variables:")
+                for key in missing_keys:
+                    print(f"    - {key.upper()}_API_KEY")
+
+            # Tenants that already have a config, in one IN query
+            existing_tenant_ids = set(db.scalars(
+                select(TenantLLMConfig.tenant_id)
+                .join(Tenant, Tenant.tenant_id == TenantLLMConfig.tenant_id)
+                .where(Tenant.name.in_([c["tenant_name"] for c in configs]))
+            ).all())
+
+            # Resolve tenant and model names with two bulk lookups
+            tenant_ids = dict(db.execute(
+                select(Tenant.name, Tenant.tenant_id)
+                .where(Tenant.name.in_([c["tenant_name"] for c in configs]))
+            ).all())
+            llm_model_ids = {
+                (provider, model_name): llm_model_id
+                for provider, model_name, llm_model_id in db.execute(
+                    select(LLMModel.provider, LLMModel.model_name, LLMModel.llm_model_id)
+                    .where(LLMModel.model_name.in_([c["model_name"] for c in configs]))
+                )
+            }
+
+            rows = []
+            for config_data in configs:
+                tenant_id = tenant_ids.get(config_data["tenant_name"])
+                llm_model_id = llm_model_ids.get((config_data["provider"], config_data["model_name"]))
+
+                if tenant_id and llm_model_id:
+                    if tenant_id not in existing_tenant_ids:
+                        # Get API key for this provider
+                        api_key = api_keys.get(config_data["provider"], "")
+
+                        if not api_key:
+                            print(f"⚠ Warning: No API key for provider '{config_data['provider']}'")
+                            continue
+
+                        # Encrypt API key
+                        try:
+                            encrypted_api_key = encrypt_api_key(api_key)
+                        except Exception as e:
+                            print(f"⚠ Warning: Failed to encrypt API key for {config_data['tenant_name']}: {e}")
+                            raise  # Don't continue with unencrypted keys
+
+                        # TenantLLMConfig row with CORRECT column names
+                        # config_id is auto-generated (no need to set)
+                        rows.append({
+                            "tenant_id": tenant_id,
+                            "llm_model_id": llm_model_id,  # FIXED: was model_id
+                            "encrypted_api_key": encrypted_api_key,
+                            "rate_limit_rpm": 60,  # Default value
+                            "rate_limit_tpm": 10000  # Default value
+                            # temperature and max_tokens do NOT exist in TenantLLMConfig
+                        })
+                        print(f"  ✓ {config_data['tenant_name']}: {config_data['model_name']}")
+                    else:
+                        print(f"  ✓ {config_data['tenant_name']}: already configured (skipped)")
                 else:
-                    print(f"  ✓ {config_data['tenant_name']}: already configured (skipped)")
-            else:
-                if not tenant:
-                    print(f"⚠ Warning: Tenant '{config_data['tenant_name']}' not found")
-                if not llm_model:
-                    print(f"⚠ Warning: LLM model '{config_data['model_name']}' not found")
-
-        db.commit()
+                    if not tenant_id:
+                        print(f"⚠ Warning: Tenant '{config_data['tenant_name']}' not found")
+                    if not llm_model_id:
+                        print(f"⚠ Warning: LLM model '{config_data['model_name']}' not found")
+
+            if rows:
+                db.execute(insert(TenantLLMConfig), rows)
+            configs_count = len(rows)
+
         print(f"✅ {configs_count} LLM configs seeded with encrypted API keys")
         return True
 
     except Exception as e:
         print(f"❌ Error seeding LLM configs: {e}")
-        db.rollback()
         return False
-    finally:
-        db.close()
+
+
+def run() -> bool:
+    """Run this step in-process (used by the orchestrators)."""
+    return seed_llm_configs()
 
 
 if __name__ == "__main__":
@@ -132,7 +156,7 @@ if __name__ == "__main__":
     print("Step 7: Seed Tenant LLM Configurations")
     print("="*60)
 
-    success = seed_llm_configs()
+    success = run()
 
     if success:
         print("✅ Step 7: LLM configs seeded successfully")
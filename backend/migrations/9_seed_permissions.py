@@ -2,7 +2,6 @@
 """Step 9: Seed tenant permissions for agents and tools."""
 
 import sys
-import json
 import uuid
 from pathlib import Path
 
@@ -13,116 +12,119 @@ from src.models import (
     Tenant, AgentConfig, ToolConfig
 )
 from src.config import SessionLocal
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from migrations.seed_helpers import INSERT_CHUNK_SIZE, chunked, load_seed_data
 
 
 def seed_agent_permissions():
     """Seed tenant-agent permissions from mapping JSON."""
-    db = SessionLocal()
     try:
-        print("Seeding tenant-agent permissions...")
-
-        # Load mapping from JSON
-        data_file = Path(__file__).parent / "data" / "tenant_agent_mapping.json"
-        with open(data_file, 'r') as f:
-            mappings_data = json.load(f)
-
-        # Count expected permissions
-        expected_permissions = len(mappings_data)
-        existing_count = db.query(TenantAgentPermission).count()
-
-        if existing_count >= expected_permissions:
-            print(f"✓ All {expected_permissions} agent permissions already seeded, skipping")
-            return True
-
-        permissions_count = 0
-        for mapping in mappings_data:
-            # Get tenant by name from mapping
-            tenant = db.query(Tenant).filter_by(name=mapping["tenant_name"]).first()
-
-            # Get agent by name
-            agent = db.query(AgentConfig).filter_by(
-                name=mapping["agent_name"]
-            ).first()
-
-            if tenant and agent:
-                # Check if permission already exists
-                existing_perm = db.query(TenantAgentPermission).filter_by(
-                    tenant_id=tenant.tenant_id,
-                    agent_id=agent.agent_id
-                ).first()
-
-                if not existing_perm:
-                    permission = TenantAgentPermission(
-                        tenant_id=tenant.tenant_id,
-                        agent_id=agent.agent_id,
-                        enabled=mapping.get("enabled", True)
-                    )
-                    db.add(permission)
-                    permissions_count += 1
-            else:
-                if not tenant:
-                    print(f"⚠ Warning: Tenant '{mapping['tenant_name']}' not found")
-                if not agent:
-                    print(f"⚠ Warning: Agent '{mapping['agent_name']}' not found")
-
-        db.commit()
+        with SessionLocal() as db, db.begin():
+            print("Seeding tenant-agent permissions...")
+
+            # Load mapping from JSON
+            mappings_data = load_seed_data("tenant_agent_mapping.json")
+
+            # Count expected permissions
+            expected_permissions = len(mappings_data)
+            existing_count = db.query(TenantAgentPermission).count()
+
+            if existing_count >= expected_permissions:
+                print(f"✓ All {expected_permissions} agent permissions already seeded, skipping")
+                return True
+
+            # Resolve tenant and agent names with two bulk lookups
+            tenant_ids = dict(db.execute(
+                select(Tenant.name, Tenant.tenant_id)
+                .where(Tenant.name.in_([m["tenant_name"] for m in mappings_data]))
+            ).all())
+            agent_ids = dict(db.execute(
+                select(AgentConfig.name, AgentConfig.agent_id)
+                .where(AgentConfig.name.in_([m["agent_name"] for m in mappings_data]))
+            ).all())
+
+            rows = []
+            for mapping in mappings_data:
+                tenant_id = tenant_ids.get(mapping["tenant_name"])
+                agent_id = agent_ids.get(mapping["agent_name"])
+
+                if tenant_id and agent_id:
+                    rows.append({
+                        "tenant_id": tenant_id,
+                        "agent_id": agent_id,
+                        "enabled": mapping.get("enabled", True)
+                    })
+                else:
+                    if not tenant_id:
+                        print(f"⚠ Warning: Tenant '{mapping['tenant_name']}' not found")
+                    if not agent_id:
+                        print(f"⚠ Warning: Agent '{mapping['agent_name']}' not found")
+
+            # Existing (tenant_id, agent_id) pairs are skipped by the primary key
+            permissions_count = 0
+            if rows:
+                stmt = (
+                    pg_insert(TenantAgentPermission)
+                    .on_conflict_do_nothing(index_elements=["tenant_id", "agent_id"])
+                    .returning(TenantAgentPermission.tenant_id)
+                )
+                permissions_count = len(db.execute(stmt, rows).all())
+
         print(f"✅ {permissions_count} agent permissions seeded")
         return True
 
     except Exception as e:
         print(f"❌ Error seeding agent permissions: {e}")
-        db.rollback()
         return False
-    finally:
-        db.close()
 
 
 def seed_tool_permissions():
     """Seed tenant-tool permissions (all tools available to all tenants)."""
-    db = SessionLocal()
     try:
-        print("Seeding tenant-tool permissions...")
-
-        tenants = db.query(Tenant).all()
-        tools = db.query(ToolConfig).all()
-
-        # Count expected permissions
-        expected_permissions = len(tenants) * len(tools)
-        existing_count = db.query(TenantToolPermission).count()
-
-        if existing_count >= expected_permissions:
-            print(f"✓ All {expected_permissions} tool permissions already seeded, skipping")
-            return True
-
-        permissions_count = 0
-        for tenant in tenants:
-            for tool in tools:
-                # Check if permission already exists
-                existing_perm = db.query(TenantToolPermission).filter_by(
-                    tenant_id=tenant.tenant_id,
-                    tool_id=tool.tool_id
-                ).first()
-
-                if not existing_perm:
-                    # All tools available to all tenants by default
-                    permission = TenantToolPermission(
-                        tenant_id=tenant.tenant_id,
-                        tool_id=tool.tool_id,
-                        enabled=True
-                    )
-                    db.add(permission)
-                    permissions_count += 1
-
-        db.commit()
+        with SessionLocal() as db, db.begin():
+            print("Seeding tenant-tool permissions...")
+
+            tenants = db.query(Tenant).all()
+            tools = db.query(ToolConfig).all()
+
+            # Count expected permissions
+            expected_permissions = len(tenants) * len(tools)
+            existing_count = db.query(TenantToolPermission).count()
+
+            if existing_count >= expected_permissions:
+                print(f"✓ All {expected_permissions} tool permissions already seeded, skipping")
+                return True
+
+            # All tools available to all tenants. The tenants x tools pairs are
+            # generated lazily and inserted INSERT_CHUNK_SIZE rows at a time, in
+            # the one transaction; existing pairs are skipped by the primary key
+            rows = (
+                {"tenant_id": tenant.tenant_id, "tool_id": tool.tool_id, "enabled": True}
+                for tenant in tenants
+                for tool in tools
+            )
+            stmt = (
+                pg_insert(TenantToolPermission)
+                .on_conflict_do_nothing(index_elements=["tenant_id", "tool_id"])
+                .returning(TenantToolPermission.tenant_id)
+            )
+
+            permissions_count = 0
+            for batch in chunked(rows, INSERT_CHUNK_SIZE):
+                permissions_count += len(db.execute(stmt, batch).all())
+
         print(f"✅ {permissions_count} tool permissions seeded")
         return True
 
     except Exception as e:
         print(f"❌ Error seeding tool permissions: {e}")
-        db.rollback()
         return False
-    finally:
-        db.close()
+
+
+def run() -> bool:
+    """Run this step in-process (used by the orchestrators)."""
+    return seed_agent_permissions() and seed_tool_permissions()
 
 
 if __name__ == "__main__":
@@ -130,7 +132,7 @@ if __name__ == "__main__":
     print("Step 9: Seed Permissions")
     print("="*60)
 
-    success = seed_agent_permissions() and seed_tool_permissions()
+    success = run()
 
     if success:
         print("✅ Step 9: Permissions seeded successfully")
@@ -1,11 +1,13 @@
 #!/usr/bin/env python3
 """Master orchestrator for running all migration and seeding scripts in sequence."""
 
+import importlib
 import sys
-import subprocess
 import time
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
 
 SCRIPTS = [
     "7_seed_llm_configs.py",
@@ -13,7 +15,11 @@ SCRIPTS = [
 
 
 def run_script(script_name: str) -> bool:
-    """Run a single migration script."""
+    """Import a migration script and run its step in this process.
+
+    Sharing the interpreter and the SQLAlchemy engine avoids a Python
+    start-up, model import and connection-pool setup per script.
+    """
     script_path = Path(__file__).parent / script_name
 
     if not script_path.exists():
@@ -22,22 +28,9 @@ def run_script(script_name: str) -> bool:
 
     print(f"\nRunning: {script_name}")
     try:
-        result = subprocess.run(
-            [sys.executable, str(script_path)],
-            capture_output=True,
-            text=True,
-            timeout=60
-        )
-
-        print(result.stdout)
-        if result.stderr:
-            print("STDERR:", result.stderr)
+        module = importlib.import_module(f"migrations.{script_path.stem}")
+        return bool(module.run())
 
-        return result.returncode == 0
-
-    except subprocess.TimeoutExpired:
-        print(f"❌ Script timeout: {script_name}")
-        return False
     except Exception as e:
         print(f"❌ Error running script: {e}")
         return False
@@ -101,5 +94,7 @@ def main():
 
 
 if __name__ == "__main__":
+    # Flush progress line by line even when stdout is a pipe (CI, docker logs)
+    sys.stdout.reconfigure(line_buffering=True)
     success = main()
     sys.exit(0 if success else 1)
@@ -1,27 +1,41 @@
 #!/usr/bin/env python3
 """Seed-only orchestrator: Populate existing database tables with data (skip alembic)."""
 
+import importlib
 import sys
-import subprocess
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
-SEED_SCRIPTS = [
-    "1_seed_base_data.py",
-    "2_seed_llm_models.py",
-    "3_seed_tenants.py",
-    "4_seed_agents.py",
-    "5_seed_tool_configs.py",
-    "6_seed_agent_tools.py",
-    "7_seed_llm_configs.py",
-    "8_seed_users.py",
-    "9_seed_permissions.py"
-]
+
+# Each script mapped to the scripts whose rows it references through FKs.
+# A script starts as soon as all of its dependencies have finished, so
+# independent branches run concurrently (each script opens its own session).
+SEED_DEPENDENCIES = {
+    "1_seed_base_data.py": [],
+    "2_seed_llm_models.py": [],
+    "3_seed_tenants.py": [],
+    "4_seed_agents.py": ["2_seed_llm_models.py"],
+    "5_seed_tool_configs.py": ["1_seed_base_data.py"],
+    "6_seed_agent_tools.py": ["4_seed_agents.py", "5_seed_tool_configs.py"],
+    "7_seed_llm_configs.py": ["2_seed_llm_models.py", "3_seed_tenants.py"],
+    "8_seed_users.py": ["3_seed_tenants.py"],
+    "9_seed_permissions.py": ["3_seed_tenants.py", "4_seed_agents.py", "5_seed_tool_configs.py"],
+}
+
+SEED_SCRIPTS = list(SEED_DEPENDENCIES)
+
+MAX_WORKERS = 4
 
 
 def run_script(script_name: str) -> bool:
-    """Run a single seeding script."""
+    """Import a seeding script and run its step in this process.
+
+    Sharing the interpreter and the SQLAlchemy engine avoids a Python
+    start-up, model import and connection-pool setup per script.
+    """
     script_path = Path(__file__).parent / script_name
 
     if not script_path.exists():
@@ -30,29 +44,41 @@ def run_script(script_name: str) -> bool:
 
     print(f"\nRunning: {script_name}")
     try:
-        result = subprocess.run(
-            [sys.executable, str(script_path)],
-            capture_output=True,
-            text=True,
-            timeout=60
-        )
+        module = importlib.import_module(f"migrations.{script_path.stem}")
+        return bool(module.run())
 
-        print(result.stdout)
-        if result.stderr:
-            print("STDERR:", result.stderr)
-
-        return result.returncode == 0
-
-    except subprocess.TimeoutExpired:
-        print(f"❌ Script timeout: {script_name}")
-        return False
     except Exception as e:
         print(f"❌ Error running script: {e}")
         return False
 
 
+def run_seed_graph() -> dict:
+    """Run SEED_DEPENDENCIES in dependency order and return {script: ok}.
+
+    A failed script still counts as finished, so its dependents run and
+    report their own missing-row warnings, matching the sequential
+    "continue with next script" behaviour.
+    """
+    results = {}
+    pending = dict(SEED_DEPENDENCIES)
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        while pending or running:
+            for script_name, deps in list(pending.items()):
+                if all(dep in results for dep in deps):
+                    running[executor.submit(run_script, script_name)] = script_name
+                    del pending[script_name]
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[running.pop(future)] = future.result()
+
+    return results
+
+
 def main():
-    """Run all seeding scripts in sequence (skip alembic)."""
+    """Run all seeding scripts in dependency order (skip alembic)."""
     print("\n" + "="*60)
     print("DATA SEEDING ORCHESTRATOR")
     print("(Existing Database Tables - Seeding Only)")
@@ -64,16 +90,14 @@ def main():
     failed_scripts = []
     successful_scripts = []
 
-    for i, script_name in enumerate(SEED_SCRIPTS, 1):
-        print(f"\n[{i}/{len(SEED_SCRIPTS)}] {script_name}")
-        print("-" * 60)
+    results = run_seed_graph()
 
-        if run_script(script_name):
+    for script_name in SEED_SCRIPTS:
+        if results[script_name]:
             successful_scripts.append(script_name)
         else:
             failed_scripts.append(script_name)
             print(f"\n⚠ Script failed: {script_name}")
-            print("Continuing with next script...")
 
     # Summary
     elapsed_time = time.time() - start_time
@@ -114,5 +138,7 @@ def main():
 
 
 if __name__ == "__main__":
+    # Flush progress line by line even when stdout is a pipe (CI, docker logs)
+    sys.stdout.reconfigure(line_buffering=True)
     success = main()
     sys.exit(0 if success else 1)
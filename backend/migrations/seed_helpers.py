@@ -0,0 +1,93 @@
+"""Shared bulk-insert helpers for the seed scripts."""
+
+import csv
+import functools
+import io
+import os
+import uuid
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, List, Sequence, TypeVar
+
+import ijson
+import orjson
+
+DATA_DIR = Path(__file__).parent / "data"
+
+# NULL marker for COPY ... CSV
+COPY_NULL = r"\N"
+
+# Rows parsed and inserted per round-trip when streaming seed files
+SEED_BATCH_SIZE = 500
+
+# Rows per INSERT for generated (cross-product) seed rows
+INSERT_CHUNK_SIZE = 10000
+
+T = TypeVar("T")
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Yield lists of up to size items without materializing the whole iterable."""
+    it = iter(items)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+
+@functools.lru_cache(maxsize=None)
+def load_seed_data(name: str):
+    """Parse data/<name> once per process and share it across retries.
+
+    Callers must treat the result as read-only. Large arrays that are only
+    walked once should use iter_seed_batches() instead. Parsed with orjson
+    straight from bytes, skipping the str decode that json.loads needs.
+    """
+    return orjson.loads((DATA_DIR / name).read_bytes())
+
+
+def iter_seed_batches(name: str, batch_size: int = SEED_BATCH_SIZE) -> Iterator[List[dict]]:
+    """Stream a top-level JSON array from data/<name> in lists of batch_size items.
+
+    Uses ijson so the file is never fully materialized; non-integer numbers
+    come back as Decimal.
+    """
+    with open(DATA_DIR / name, "rb") as f:
+        yield from chunked(ijson.items(f, "item"), batch_size)
+
+
+def batch_uuids(n: int) -> List[uuid.UUID]:
+    """Return n random (version 4) UUIDs cut from a single os.urandom() call."""
+    buf = os.urandom(16 * n)
+    return [uuid.UUID(bytes=buf[i:i + 16], version=4) for i in range(0, 16 * n, 16)]
+
+
+def copy_rows(db, table: str, columns: Sequence[str], rows: Iterable[Sequence]) -> int:
+    """COPY rows into a table through the session's raw psycopg2 connection.
+
+    Only use for plain scalar columns - tables with JSONB columns should use
+    a Core insert(Table).values([...]) instead. None is written as \\N so
+    empty strings stay empty strings rather than turning into NULL.
+    """
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    count = 0
+    for row in rows:
+        writer.writerow([COPY_NULL if value is None else value for value in row])
+        count += 1
+
+    if not count:
+        return 0
+
+    buf.seek(0)
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')",
+            buf
+        )
+    finally:
+        cursor.close()
+    return count
+
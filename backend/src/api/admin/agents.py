@@ -4,7 +4,7 @@ from typing import List
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import desc
-from src.config import get_db, get_redis
+from src.config import get_db
 from src.models.agent import AgentConfig, AgentTools
 from src.models.llm_model import LLMModel
 from src.models.tool import ToolConfig
@@ -16,6 +16,7 @@ from src.schemas.admin import (
     MessageResponse,
 )
 from src.middleware.auth import require_admin_role
+from src.utils.cache import cache_delete_pattern
 from src.utils.logging import get_logger
 from datetime import datetime
 
@@ -25,7 +26,7 @@ router = APIRouter(prefix="/api/admin", tags=["admin-agents"])
 
 
 @router.get("/agents", response_model=AgentListResponse)
-async def list_agents(
+def list_agents(
     is_active: bool = Query(None, description="Filter by active status"),
     limit: int = Query(100, ge=1, le=500),
     offset: int = Query(0, ge=0),
@@ -106,7 +107,7 @@ async def list_agents(
 
 
 @router.post("/agents", response_model=AgentResponse, status_code=201)
-async def create_agent(
+def create_agent(
     request: AgentCreateRequest,
     db: Session = Depends(get_db),
     admin_payload: dict = Depends(require_admin_role),
@@ -206,7 +207,7 @@ async def create_agent(
 
 
 @router.get("/agents/{agent_id}", response_model=AgentResponse)
-async def get_agent(
+def get_agent(
     agent_id: str,
     db: Session = Depends(get_db),
     admin_payload: dict = Depends(require_admin_role),
@@ -263,7 +264,7 @@ async def get_agent(
 
 
 @router.patch("/agents/{agent_id}", response_model=AgentResponse)
-async def update_agent(
+def update_agent(
     agent_id: str,
     request: AgentUpdateRequest,
     db: Session = Depends(get_db),
@@ -373,9 +374,8 @@ async def update_agent(
 
 
 @router.post("/agents/reload", response_model=MessageResponse)
-async def reload_agents_cache(
+def reload_agents_cache(
     tenant_id: str = Query(None, description="Optional tenant ID to reload cache for specific tenant"),
-    redis = Depends(get_redis),
     admin_payload: dict = Depends(require_admin_role),
 ) -> MessageResponse:
     """
@@ -392,33 +392,23 @@ async def reload_agents_cache(
             # Clear all agent caches
             pattern = "agenthub:*:cache:*"
 
-        # Get Redis client
-        async for redis_client in redis:
-            # Find and delete matching keys
-            cursor = 0
-            deleted_count = 0
-
-            while True:
-                cursor, keys = await redis_client.scan(cursor, match=pattern, count=100)
-                if keys:
-                    deleted_count += await redis_client.delete(*keys)
-                if cursor == 0:
-                    break
-
-            logger.info(
-                "agents_cache_cleared",
-                admin_user=admin_payload.get("user_id"),
-                tenant_id=tenant_id,
-                keys_deleted=deleted_count,
-            )
+        # Find and unlink matching keys
+        deleted_count = cache_delete_pattern(pattern)
 
-            return MessageResponse(
-                message=f"Successfully cleared agent cache",
-                details={
-                    "tenant_id": tenant_id,
-                    "keys_deleted": deleted_count,
-                }
-            )
+        logger.info(
+            "agents_cache_cleared",
+            admin_user=admin_payload.get("user_id"),
+            tenant_id=tenant_id,
+            keys_deleted=deleted_count,
+        )
+
+        return MessageResponse(
+            message=f"Successfully cleared agent cache",
+            details={
+                "tenant_id": tenant_id,
+                "keys_deleted": deleted_count,
+            }
+        )
 
     except Exception as e:
         logger.error("reload_cache_error", error=str(e))
@@ -1,12 +1,15 @@
 """Admin API endpoints for knowledge base management."""
-from typing import List
+from typing import List, Optional
+import json
 import os
+import orjson
+import shutil
 import tempfile
-from pathlib import Path as FilePath
-from fastapi import APIRouter, Depends, HTTPException, Path, UploadFile, File, Form
+import uuid
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Path, Response, UploadFile, File, Form
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from src.config import get_db
-from src.models.tenant import Tenant
 from src.models.tool import ToolConfig
 from src.models.base_tool import BaseTool
 from src.schemas.admin import (
@@ -17,7 +20,9 @@ from src.schemas.admin import (
     PDFUploadResponse,
 )
 from src.services.rag_service import get_rag_service
+from src.services.tenant_cache import tenant_exists
 from src.middleware.auth import require_admin_role, require_staff_role
+from src.utils.cache import RAG_CHUNK_CONFIG_CACHE_KEY, cache_get, cache_set
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -25,8 +30,121 @@ logger = get_logger(__name__)
 router = APIRouter(prefix="/api/admin", tags=["admin-knowledge"])
 
 
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+RAG_CHUNK_CONFIG_CACHE_TTL_SECONDS = 600
+
+# Background ingestion job status, kept in Redis for polling
+INGEST_JOB_TTL_SECONDS = 86400
+
+
+def _rag_chunk_config(db: Session) -> Optional[dict]:
+    """Chunking parameters of the active RAG tool config (None to use defaults).
+
+    Not tenant-scoped (any active RAG tool config is used), so one Redis
+    entry serves every upload; tool create/update drops it.
+    """
+    cached = cache_get(RAG_CHUNK_CONFIG_CACHE_KEY)
+    if cached is not None:
+        return json.loads(cached)
+
+    # Get any active RAG tool configuration in one round-trip,
+    # fetching only its config JSON
+    config_data = db.execute(
+        select(ToolConfig.config)
+        .join(BaseTool, BaseTool.base_tool_id == ToolConfig.base_tool_id)
+        .where(BaseTool.type == "rag", ToolConfig.is_active == True)
+        .limit(1)
+    ).scalar_one_or_none()
+
+    chunk_config = None
+    if config_data:
+        # Extract chunking parameters from the tool configuration
+        chunk_config = {
+            "chunk_size": config_data.get("chunk_size", 900),
+            "chunk_overlap": config_data.get("chunk_overlap", 150),
+            "separators": config_data.get("separators", ["\n\n", "\n", ". ", " ", ""])
+        }
+
+    # "null" is cached too, so uploads without a RAG config skip the query
+    cache_set(RAG_CHUNK_CONFIG_CACHE_KEY, json.dumps(chunk_config), RAG_CHUNK_CONFIG_CACHE_TTL_SECONDS)
+    return chunk_config
+
+
+def _run_ingest_job(
+    job: dict,
+    file_path: str,
+    additional_metadata: dict,
+    chunk_config: Optional[dict],
+) -> None:
+    """Ingest an uploaded file after the response was sent and record the outcome.
+
+    Runs as a FastAPI background task (in the threadpool); owns and removes
+    the temporary file.
+    """
+    try:
+        ingest_result = get_rag_service().ingest_document(
+            tenant_id=job["tenant_id"],
+            file_path=file_path,
+            additional_metadata=additional_metadata,
+            chunk_config=chunk_config
+        )
+
+        if ingest_result.get("success"):
+            job.update(
+                status="completed",
+                chunk_count=ingest_result.get("document_count"),
+                collection_name=ingest_result.get("collection_name"),
+                document_ids=ingest_result.get("document_ids"),
+            )
+        else:
+            job.update(status="failed", error=ingest_result.get("error", "Failed to process document"))
+
+    except Exception as e:
+        job.update(status="failed", error=str(e))
+
+    finally:
+        if os.path.exists(file_path):
+            os.unlink(file_path)
+
+    log = logger.info if job["status"] == "completed" else logger.error
+    log(
+        "background_ingest_finished",
+        job_id=job["job_id"],
+        tenant_id=job["tenant_id"],
+        filename=job["filename"],
+        status=job["status"],
+        chunk_count=job.get("chunk_count"),
+        error=job.get("error"),
+    )
+    if not cache_set(f"ingest_job:{job['job_id']}", json.dumps(job), INGEST_JOB_TTL_SECONDS):
+        # The ingest itself happened (or failed) as logged above; only the
+        # polled status is lost and the job keeps reporting 'pending'
+        logger.error(
+            "background_ingest_status_not_stored",
+            job_id=job["job_id"],
+            tenant_id=job["tenant_id"],
+            status=job["status"],
+        )
+
+
+# Tenant filter + ingested_at sort match ix_embedding_tenant_ingested
+DOCUMENT_LISTING_SQL = """
+    SELECT 
+        cmetadata->>'doc_id' as doc_id,
+        cmetadata->>'document_name' as document_name,
+        cmetadata->>'source' as source,
+        cmetadata->>'ingested_at' as ingested_at,
+        LEFT(document, 200) as content_preview
+    FROM langchain_pg_embedding
+    WHERE cmetadata->>'tenant_id' = %(tenant_id)s
+    ORDER BY cmetadata->>'ingested_at' DESC
+    LIMIT 100
+"""
+
+
 @router.get("/tenants/{tenant_id}/knowledge/stats", response_model=KnowledgeBaseStatsResponse)
-async def get_knowledge_base_stats(
+def get_knowledge_base_stats(
     tenant_id: str = Path(..., description="Tenant UUID"),
     db: Session = Depends(get_db),
     admin_payload: dict = Depends(require_admin_role),
@@ -40,8 +158,7 @@ async def get_knowledge_base_stats(
     """
     try:
         # Validate tenant exists
-        tenant = db.query(Tenant).filter(Tenant.tenant_id == tenant_id).first()
-        if not tenant:
+        if not tenant_exists(db, tenant_id):
             raise HTTPException(status_code=404, detail="Tenant not found")
 
         # Get RAG service
@@ -85,7 +202,7 @@ async def get_knowledge_base_stats(
 
 
 @router.get("/tenants/{tenant_id}/knowledge/all")
-async def get_all_documents_for_tenant(
+def get_all_documents_for_tenant(
     tenant_id: str = Path(..., description="Tenant UUID"),
     db: Session = Depends(get_db),
     admin_payload: dict = Depends(require_admin_role),
@@ -100,41 +217,26 @@ async def get_all_documents_for_tenant(
     """
     try:
         # Validate tenant exists
-        tenant = db.query(Tenant).filter(Tenant.tenant_id == tenant_id).first()
-        if not tenant:
+        if not tenant_exists(db, tenant_id):
             raise HTTPException(status_code=404, detail="Tenant not found")
 
-        # Query database directly
-        from sqlalchemy import create_engine, text
-        from src.config import settings
-        
-        engine = create_engine(settings.DATABASE_URL)
-        with engine.connect() as conn:
-            result = conn.execute(
-                text("""
-                    SELECT 
-                        cmetadata->>'doc_id' as doc_id,
-                        cmetadata->>'document_name' as document_name,
-                        cmetadata->>'source' as source,
-                        cmetadata->>'ingested_at' as ingested_at,
-                        LEFT(document, 200) as content_preview
-                    FROM langchain_pg_embedding
-                    WHERE cmetadata->>'tenant_id' = :tenant_id
-                    ORDER BY cmetadata->>'ingested_at' DESC
-                    LIMIT 100
-                """),
-                {"tenant_id": str(tenant_id)}
-            )
-            
-            documents = []
-            for row in result:
-                documents.append({
-                    "doc_id": row.doc_id,
-                    "document_name": row.document_name,
-                    "source": row.source,
-                    "ingested_at": row.ingested_at,
-                    "content_preview": row.content_preview
-                })
+        # Query the embeddings table on the request's pooled session. The
+        # listing is capped at 100 rows, so one fetchall() is cheaper than a
+        # server-side cursor (DECLARE/FETCH/CLOSE round trips, and a pooled
+        # connection held open while a slow client reads the body).
+        # Plain DB-API tuples: no Result/Row wrapping for a read-only listing.
+        with db.connection().connection.cursor() as cursor:
+            cursor.execute(DOCUMENT_LISTING_SQL, {"tenant_id": str(tenant_id)})
+            documents = [
+                {
+                    "doc_id": doc_id,
+                    "document_name": name,
+                    "source": source,
+                    "ingested_at": ingested_at,
+                    "content_preview": preview
+                }
+                for doc_id, name, source, ingested_at, preview in cursor.fetchall()
+            ]
 
         logger.info(
             "all_documents_listed",
@@ -143,12 +245,15 @@ async def get_all_documents_for_tenant(
             document_count=len(documents),
         )
 
-        return {
-            "success": True,
-            "tenant_id": tenant_id,
-            "document_count": len(documents),
-            "documents": documents
-        }
+        return Response(
+            content=orjson.dumps({
+                "success": True,
+                "tenant_id": tenant_id,
+                "document_count": len(documents),
+                "documents": documents
+            }),
+            media_type="application/json"
+        )
 
     except HTTPException:
         raise
@@ -165,7 +270,7 @@ async def get_all_documents_for_tenant(
 
 
 @router.delete("/tenants/{tenant_id}/knowledge", response_model=MessageResponse)
-async def delete_documents(
+def delete_documents(
     tenant_id: str = Path(..., description="Tenant UUID"),
     document_ids: List[str] = ...,
     db: Session = Depends(get_db),
@@ -178,8 +283,7 @@ async def delete_documents(
     """
     try:
         # Validate tenant exists
-        tenant = db.query(Tenant).filter(Tenant.tenant_id == tenant_id).first()
-        if not tenant:
+        if not tenant_exists(db, tenant_id):
             raise HTTPException(status_code=404, detail="Tenant not found")
 
         # Get RAG service
@@ -227,7 +331,7 @@ async def delete_documents(
 
 
 @router.delete("/tenants/{tenant_id}/knowledge/by-name/{document_name}", response_model=MessageResponse)
-async def delete_documents_by_name(
+def delete_documents_by_name(
     tenant_id: str = Path(..., description="Tenant UUID"),
     document_name: str = Path(..., description="Document name to delete"),
     db: Session = Depends(get_db),
@@ -247,34 +351,25 @@ async def delete_documents_by_name(
     """
     try:
         # Validate tenant exists
-        tenant = db.query(Tenant).filter(Tenant.tenant_id == tenant_id).first()
-        if not tenant:
+        if not tenant_exists(db, tenant_id):
             raise HTTPException(status_code=404, detail="Tenant not found")
 
         # Get RAG service
         rag_service = get_rag_service()
 
-        # First, find all document IDs that match the document name for this tenant
-        # We need to query the database to get the doc_id values from metadata
-        from sqlalchemy import create_engine, text
-        from src.config import settings
-
-        engine = create_engine(settings.DATABASE_URL)
-        with engine.connect() as conn:
-            # Query to find all document IDs that match the document name
-            result = conn.execute(text("""
-                SELECT DISTINCT cmetadata->>'doc_id' as doc_id
-                FROM langchain_pg_embedding
-                WHERE cmetadata->>'tenant_id' = :tenant_id
-                AND cmetadata->>'document_name' = :document_name
-            """), {
-                "tenant_id": tenant_id,
-                "document_name": document_name
-            })
+        # Delete every chunk carrying this document name in one statement
+        delete_result = rag_service.delete_documents_by_name(
+            tenant_id=tenant_id,
+            document_name=document_name,
+        )
 
-            document_ids = [row.doc_id for row in result]
+        if not delete_result.get("success"):
+            raise HTTPException(
+                status_code=500,
+                detail=delete_result.get("error", "Failed to delete documents")
+            )
 
-        if not document_ids:
+        if not delete_result.get("deleted_count"):
             logger.info(
                 "no_documents_found_to_delete_by_name",
                 tenant_id=tenant_id,
@@ -289,18 +384,6 @@ async def delete_documents_by_name(
                 }
             )
 
-        # Delete documents by their IDs
-        delete_result = rag_service.delete_documents(
-            tenant_id=tenant_id,
-            document_ids=document_ids,
-        )
-
-        if not delete_result.get("success"):
-            raise HTTPException(
-                status_code=500,
-                detail=delete_result.get("error", "Failed to delete documents")
-            )
-
         logger.info(
             "documents_deleted_by_name",
             admin_user=admin_payload.get("user_id"),
@@ -334,7 +417,7 @@ async def delete_documents_by_name(
 
 
 @router.delete("/tenants/{tenant_id}/knowledge/all", response_model=MessageResponse)
-async def delete_all_documents_for_tenant(
+def delete_all_documents_for_tenant(
     tenant_id: str = Path(..., description="Tenant UUID"),
     db: Session = Depends(get_db),
     admin_payload: dict = Depends(require_admin_role),
@@ -351,8 +434,7 @@ async def delete_all_documents_for_tenant(
     """
     try:
         # Validate tenant exists
-        tenant = db.query(Tenant).filter(Tenant.tenant_id == tenant_id).first()
-        if not tenant:
+        if not tenant_exists(db, tenant_id):
             raise HTTPException(status_code=404, detail="Tenant not found")
 
         # Get RAG service
@@ -399,10 +481,13 @@ async def delete_all_documents_for_tenant(
 
 
 @router.post("/tenants/{tenant_id}/knowledge/upload-document", response_model=PDFUploadResponse)
-async def upload_document(
+def upload_document(
+    background_tasks: BackgroundTasks,
+    response: Response,
     tenant_id: str = Path(..., description="Tenant UUID"),
     file: UploadFile = File(..., description="Document file to upload (PDF, DOCX)"),
     document_name: str = Form(None, description="Optional document name"),
+    background: bool = Form(False, description="Ingest after responding (202 + job_id) instead of waiting"),
     db: Session = Depends(get_db),
     staff_payload: dict = Depends(require_staff_role),
 ) -> PDFUploadResponse:
@@ -428,34 +513,23 @@ async def upload_document(
 
     Use case: .txt files are useful for enriching knowledge base from chat history.
 
+    With background=true the file is stored and the endpoint returns 202 with
+    status "pending" and a job_id right away; embedding and storage run after
+    the response and the outcome is polled from /knowledge/jobs/{job_id}.
+    Job status lives in Redis: if it cannot be stored, no job_id is handed
+    out and the upload is ingested synchronously as if background=false.
+
     Requires admin or supporter role in JWT.
     """
     try:
         # Validate tenant exists
-        tenant = db.query(Tenant).filter(Tenant.tenant_id == tenant_id).first()
-        if not tenant:
+        if not tenant_exists(db, tenant_id):
             raise HTTPException(status_code=404, detail="Tenant not found")
 
         # Find the RAG tool configuration for this tenant to get chunking parameters
         chunk_config = None
         try:
-            # Look for RAG tools associated with this tenant
-            base_rag_tool = db.query(BaseTool).filter(BaseTool.type == "rag").first()
-            if base_rag_tool:
-                # Get any RAG tool configuration for this tenant
-                rag_tool_config = db.query(ToolConfig).filter(
-                    ToolConfig.base_tool_id == base_rag_tool.base_tool_id,
-                    ToolConfig.is_active == True
-                ).first()
-
-                if rag_tool_config and rag_tool_config.config:
-                    # Extract chunking parameters from the tool configuration
-                    config_data = rag_tool_config.config
-                    chunk_config = {
-                        "chunk_size": config_data.get("chunk_size", 900),
-                        "chunk_overlap": config_data.get("chunk_overlap", 150),
-                        "separators": config_data.get("separators", ["\n\n", "\n", ". ", " ", ""])
-                    }
+            chunk_config = _rag_chunk_config(db)
         except Exception as e:
             logger.warning(
                 "rag_tool_config_lookup_failed",
@@ -464,7 +538,9 @@ async def upload_document(
             )
 
         # Validate file format
-        file_ext = FilePath(file.filename).suffix.lower()
+        filename = file.filename
+        file_ext = os.path.splitext(filename)[1].lower()
+        is_enrichment = filename.endswith("-enrichment.txt")
         if file_ext not in ['.pdf', '.docx', '.doc', '.txt']:
             raise HTTPException(
                 status_code=400,
@@ -476,9 +552,9 @@ async def upload_document(
 
         # Save uploaded file to temporary location with correct extension
         with tempfile.NamedTemporaryFile(delete=False, suffix=file_ext) as tmp_file:
-            # Read file content
-            content = await file.read()
-            tmp_file.write(content)
+            # Stream the spooled upload in 1 MiB chunks so memory stays flat
+            # regardless of file size
+            shutil.copyfileobj(file.file, tmp_file, length=UPLOAD_CHUNK_SIZE)
             tmp_file_path = tmp_file.name
 
         try:
@@ -486,14 +562,56 @@ async def upload_document(
             additional_metadata = {
                 "uploaded_by": staff_payload.get("user_id") or staff_payload.get("sub"),
                 "uploaded_by_role": staff_payload.get("role") or ("admin" if "admin" in staff_payload.get("roles", []) else "supporter"),
-                "original_filename": file.filename,
+                "original_filename": filename,
                 # Mark provenance so sources can be distinguished in vector store
-                "source": "chat_history" if file.filename.endswith("-enrichment.txt") else "document",
-                "source_detail": "chat_enrichment" if file.filename.endswith("-enrichment.txt") else "upload_document",
+                "source": "chat_history" if is_enrichment else "document",
+                "source_detail": "chat_enrichment" if is_enrichment else "upload_document",
             }
             if document_name:
                 additional_metadata["document_name"] = document_name
 
+            if background:
+                job = {
+                    "job_id": str(uuid.uuid4()),
+                    "tenant_id": tenant_id,
+                    "filename": filename,
+                    "document_name": document_name or filename,
+                    "status": "pending",
+                }
+                # A job_id nobody can poll is worse than a slow response, so
+                # without a stored job fall through to the synchronous ingest
+                background = cache_set(f"ingest_job:{job['job_id']}", json.dumps(job), INGEST_JOB_TTL_SECONDS)
+                if not background:
+                    logger.warning(
+                        "ingest_job_not_stored_ingesting_inline",
+                        tenant_id=tenant_id,
+                        filename=filename,
+                        job_id=job["job_id"],
+                    )
+
+            if background:
+                background_tasks.add_task(_run_ingest_job, job, tmp_file_path, additional_metadata, chunk_config)
+                # The background task now owns the temporary file
+                tmp_file_path = None
+
+                logger.info(
+                    "document_upload_queued",
+                    staff_user=staff_payload.get("user_id") or staff_payload.get("sub"),
+                    tenant_id=tenant_id,
+                    filename=filename,
+                    job_id=job["job_id"],
+                )
+
+                response.status_code = 202
+                return PDFUploadResponse(
+                    success=True,
+                    tenant_id=tenant_id,
+                    filename=filename,
+                    document_name=job["document_name"],
+                    status="pending",
+                    job_id=job["job_id"],
+                )
+
             # Process document: Auto-detect format → Load → Chunk → Enrich → Embed → Store
             ingest_result = rag_service.ingest_document(
                 tenant_id=tenant_id,
@@ -513,7 +631,7 @@ async def upload_document(
                 staff_user=staff_payload.get("user_id") or staff_payload.get("sub"),
                 staff_role=staff_payload.get("role") or ("admin" if "admin" in staff_payload.get("roles", []) else "supporter"),
                 tenant_id=tenant_id,
-                filename=file.filename,
+                filename=filename,
                 file_type=file_ext,
                 chunk_count=ingest_result.get("document_count"),
                 chunk_size=chunk_config.get("chunk_size") if chunk_config else "default",
@@ -524,8 +642,8 @@ async def upload_document(
             return PDFUploadResponse(
                 success=True,
                 tenant_id=tenant_id,
-                filename=file.filename,
-                document_name=document_name or file.filename,
+                filename=filename,
+                document_name=document_name or filename,
                 chunk_count=ingest_result.get("document_count"),
                 collection_name=ingest_result.get("collection_name"),
                 document_ids=ingest_result.get("document_ids"),
@@ -533,7 +651,7 @@ async def upload_document(
 
         finally:
             # Clean up temporary file
-            if os.path.exists(tmp_file_path):
+            if tmp_file_path and os.path.exists(tmp_file_path):
                 os.unlink(tmp_file_path)
 
     except HTTPException:
@@ -550,3 +668,24 @@ async def upload_document(
             detail=f"Failed to upload document: {str(e)}"
         )
 
+
+@router.get("/tenants/{tenant_id}/knowledge/jobs/{job_id}")
+def get_ingest_job(
+    tenant_id: str = Path(..., description="Tenant UUID"),
+    job_id: str = Path(..., description="Job id returned by a background upload"),
+    staff_payload: dict = Depends(require_staff_role),
+):
+    """
+    Get the status of a background document upload.
+
+    status is 'pending', 'completed' (with chunk_count, document_ids) or
+    'failed' (with error). Jobs are kept for 24 hours.
+
+    Requires admin or supporter role in JWT.
+    """
+    cached = cache_get(f"ingest_job:{job_id}")
+    job = json.loads(cached) if cached is not None else None
+    if not job or job["tenant_id"] != tenant_id:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return job
@@ -1,12 +1,14 @@
 """Admin API endpoints for LLM model management."""
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from src.config import get_db
 from src.models.llm_model import LLMModel
 from src.middleware.auth import require_admin_role
+from src.utils.cache import cache_get, cache_set
 from src.utils.logging import get_logger
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 from uuid import UUID
 from datetime import datetime
 
@@ -25,8 +27,16 @@ class LLMModelResponse(BaseModel):
     class Config:
         from_attributes = True
 
+
+_llm_model_list = TypeAdapter(List[LLMModelResponse])
+
+# Active models only change through migrations/seeding, so a short TTL is
+# the only invalidation needed
+LLM_MODELS_CACHE_KEY = "llm_models:active"
+LLM_MODELS_CACHE_TTL_SECONDS = 300
+
 @router.get("/llm-models", response_model=List[LLMModelResponse])
-async def list_llm_models(
+def list_llm_models(
     db: Session = Depends(get_db),
     admin_payload: dict = Depends(require_admin_role),
 ) -> List[LLMModelResponse]:
@@ -36,19 +46,37 @@ async def list_llm_models(
     Requires admin role in JWT.
     """
     try:
-        models = db.query(LLMModel).filter(LLMModel.is_active == True).all()
-        
-        return [
+        cached = cache_get(LLM_MODELS_CACHE_KEY)
+        if cached is not None:
+            return Response(content=cached, media_type="application/json")
+
+        # Plain column rows: no ORM instances or identity-map entries just
+        # to re-serialize them
+        rows = db.execute(
+            select(
+                LLMModel.llm_model_id,
+                LLMModel.provider,
+                LLMModel.model_name,
+                LLMModel.context_window,
+                LLMModel.is_active,
+                LLMModel.created_at,
+            ).where(LLMModel.is_active == True)
+        ).all()
+
+        payload = _llm_model_list.dump_json([
             LLMModelResponse(
-                llm_model_id=str(model.llm_model_id),
-                provider=model.provider,
-                model_name=model.model_name,
-                context_window=model.context_window,
-                is_active=model.is_active,
-                created_at=model.created_at
+                llm_model_id=str(row.llm_model_id),
+                provider=row.provider,
+                model_name=row.model_name,
+                context_window=row.context_window,
+                is_active=row.is_active,
+                created_at=row.created_at
             )
-            for model in models
-        ]
+            for row in rows
+        ])
+        cache_set(LLM_MODELS_CACHE_KEY, payload, LLM_MODELS_CACHE_TTL_SECONDS)
+
+        return Response(content=payload, media_type="application/json")
 
     except Exception as e:
         logger.error("list_llm_models_error", error=str(e))
@@ -1,83 +1,207 @@
 """Admin API endpoints for session management."""
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Path, Query
+import uuid
+import orjson
+from datetime import datetime
+from typing import Iterator, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from src.config import get_db
+from sqlalchemy import desc, exists, func, null, select, tuple_
+from src.config import engine, get_db
 from src.models.session import ChatSession
 from src.models.message import Message
-from src.models.tenant import Tenant
-from src.schemas.chat import SessionSummary, SessionDetail
+from src.models.chat_user import ChatUser
+from src.schemas.chat import SessionDetail
+from src.services.tenant_cache import tenant_exists
 from src.middleware.auth import require_admin_role
 from src.utils.logging import get_logger
+from src.utils.pagination import decode_cursor, encode_cursor
 
 logger = get_logger(__name__)
 
 router = APIRouter(prefix="/api/admin", tags=["admin-sessions"])
 
+MESSAGE_STREAM_BATCH_SIZE = 1000
+
+
+def _stream_messages(conn, result, session_id: str, admin_id: Optional[str]) -> Iterator[bytes]:
+    """Yield a session's messages as JSON, one orjson-encoded batch of rows at a time.
+
+    Owns the result and connection and returns the connection to the pool
+    when the stream ends (or the client goes away).
+    """
+    message_count = 0
+    try:
+        yield b'{"session_id":' + orjson.dumps(session_id) + b',"messages":['
+        for rows in result.partitions():
+            # orjson writes UUIDs and datetimes itself
+            batch = b",".join(
+                orjson.dumps({
+                    "message_id": message_id,
+                    "session_id": msg_session_id,
+                    "sender_id": sender_id,
+                    "role": role,
+                    "content": content,
+                    "timestamp": created_at,
+                    "metadata": metadata,
+                })
+                for message_id, msg_session_id, sender_id, role, content, created_at, metadata in rows
+            )
+            yield b"," + batch if message_count else batch
+            message_count += len(rows)
+        yield b'],"message_count":' + str(message_count).encode() + b"}"
+
+        logger.info(
+            "session_messages_streamed",
+            session_id=session_id,
+            message_count=message_count,
+            admin_id=admin_id,
+        )
+
+    except Exception as e:
+        logger.error(
+            "stream_session_messages_error",
+            session_id=session_id,
+            error=str(e),
+        )
+        raise
+
+    finally:
+        result.close()
+        conn.close()
+
 
 @router.get("/tenants/{tenant_id}/sessions", response_model=dict)
-async def list_tenant_sessions(
+def list_tenant_sessions(
     tenant_id: str = Path(..., description="Tenant UUID"),
     limit: int = Query(100, ge=1, le=500, description="Maximum number of sessions to return"),
-    offset: int = Query(0, ge=0, description="Number of sessions to skip"),
+    offset: int = Query(0, ge=0, description="Number of sessions to skip (deprecated: use cursor)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     db: Session = Depends(get_db),
     admin_payload: dict = Depends(require_admin_role),
-) -> dict:
+) -> Response:
     """
     List all chat sessions for a tenant (admin only).
 
-    Returns sessions ordered by most recent first.
+    Returns sessions ordered by most recent first. Pass the returned
+    next_cursor back as cursor to fetch the following page; offset is kept
+    for existing clients but gets slower the deeper the page. total is only
+    computed without a cursor and is null on cursor pages.
     """
     try:
+        keyset = None
+        if cursor:
+            try:
+                key = decode_cursor(cursor)
+                keyset = (
+                    datetime.fromisoformat(key["last_message_at"]),
+                    uuid.UUID(key["session_id"]),
+                )
+            except (ValueError, KeyError, TypeError):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+
         # Verify tenant exists
-        tenant = db.query(Tenant).filter(Tenant.tenant_id == tenant_id).first()
-        if not tenant:
+        if not tenant_exists(db, tenant_id):
             raise HTTPException(status_code=404, detail="Tenant not found")
 
         # Admin can view all tenants (no tenant restriction)
 
-        # Get total count
-        total = db.query(ChatSession).filter(
-            ChatSession.tenant_id == tenant_id
-        ).count()
+        # Message count and last-message preview are computed in the database
+        # (ix_messages_session_timestamp) instead of loading every message of
+        # every listed session just to take len() and the last element
+        message_count = (
+            select(func.count())
+            .where(Message.session_id == ChatSession.session_id)
+            .scalar_subquery()
+        )
+        last_message_preview = (
+            select(func.left(Message.content, 100))
+            .where(Message.session_id == ChatSession.session_id)
+            .order_by(desc(Message.created_at))
+            .limit(1)
+            .scalar_subquery()
+        )
 
-        # Get sessions with pagination (eagerly load chat_user relationship)
-        sessions = db.query(ChatSession).filter(
+        # On offset pages a window count carries the total on every row,
+        # replacing a separate COUNT(*) round-trip. Cursor pages skip it: the
+        # window has to visit every matching row, undoing the index seek.
+        window_total = null() if keyset else func.count().over()
+
+        # Get sessions with pagination as plain column rows: the chat user's
+        # email/name come from an outer join, so no ORM entities, identity
+        # map or relationship loaders are involved
+        query = select(
+            ChatSession.session_id,
+            ChatSession.user_id,
+            ChatUser.email.label("user_email"),
+            ChatUser.username.label("user_name"),
+            ChatSession.created_at,
+            ChatSession.last_message_at,
+            message_count.label("message_count"),
+            last_message_preview.label("last_message_preview"),
+            ChatSession.escalation_status,
+            ChatSession.assigned_user_id,
+            ChatSession.session_metadata,
+            window_total.label("total"),
+        ).outerjoin(
+            ChatUser, ChatUser.user_id == ChatSession.user_id
+        ).where(
             ChatSession.tenant_id == tenant_id
-        ).order_by(
-            desc(ChatSession.last_message_at)
-        ).limit(limit).offset(offset).all()
+        )
+        if keyset:
+            # Seek past the cursor on ix_sessions_tenant_last_message instead
+            # of scanning and discarding OFFSET rows
+            query = query.where(
+                tuple_(ChatSession.last_message_at, ChatSession.session_id) < keyset
+            )
+        else:
+            query = query.offset(offset)
+
+        # One extra row tells whether there is a next page
+        sessions = db.execute(
+            query.order_by(
+                desc(ChatSession.last_message_at),
+                desc(ChatSession.session_id),
+            ).limit(limit + 1)
+        ).all()
+        has_more = len(sessions) > limit
+        sessions = sessions[:limit]
+
+        # Cursor pages report no total, so their cost does not grow with the
+        # tenant's session count; the first page (no cursor) carries it
+        total = None
+        if sessions and not keyset:
+            total = sessions[0].total
+        elif offset:
+            # A page past the end has no row to read the window total from
+            total = db.query(ChatSession).filter(ChatSession.tenant_id == tenant_id).count()
+        elif not keyset:
+            total = 0
+
+        next_cursor = None
+        if has_more:
+            last_session = sessions[-1]
+            next_cursor = encode_cursor({
+                "last_message_at": last_session.last_message_at.isoformat(),
+                "session_id": str(last_session.session_id),
+            })
 
-        # Convert to SessionSummary format
+        # SessionSummary-shaped dicts; orjson writes the UUIDs and datetimes itself
         session_summaries = []
         for session in sessions:
-            # Ensure metadata is a plain dict (not SQLAlchemy object)
-            metadata_dict = {}
-            if session.session_metadata:
-                if isinstance(session.session_metadata, dict):
-                    metadata_dict = session.session_metadata
-                else:
-                    try:
-                        metadata_dict = dict(session.session_metadata)
-                    except (TypeError, ValueError):
-                        metadata_dict = {}
-
-            session_summaries.append(
-                SessionSummary(
-                    session_id=str(session.session_id),
-                    user_id=str(session.user_id),
-                    user_email=session.chat_user.email if session.chat_user else None,
-                    user_name=session.chat_user.username if session.chat_user else None,
-                    created_at=session.created_at,
-                    last_message_at=session.last_message_at,
-                    message_count=len(session.messages) if session.messages else 0,
-                    last_message_preview=session.messages[-1].content[:100] if session.messages else None,
-                    escalation_status=session.escalation_status,
-                    assigned_supporter_id=str(session.assigned_user_id) if session.assigned_user_id else None,
-                    metadata=metadata_dict,
-                )
-            )
+            session_summaries.append({
+                "session_id": session.session_id,
+                "user_id": session.user_id,
+                "user_email": session.user_email,
+                "user_name": session.user_name,
+                "created_at": session.created_at,
+                "last_message_at": session.last_message_at,
+                "message_count": session.message_count,
+                "last_message_preview": session.last_message_preview,
+                "escalation_status": session.escalation_status,
+                "assigned_supporter_id": session.assigned_user_id,
+                "metadata": session.session_metadata,
+            })
 
         logger.info(
             "list_tenant_sessions",
@@ -87,12 +211,16 @@ async def list_tenant_sessions(
             admin_id=admin_payload.get("sub")
         )
 
-        return {
-            "total": total,
-            "limit": limit,
-            "offset": offset,
-            "sessions": session_summaries
-        }
+        return Response(
+            content=orjson.dumps({
+                "total": total,
+                "limit": limit,
+                "offset": offset,
+                "next_cursor": next_cursor,
+                "sessions": session_summaries
+            }),
+            media_type="application/json"
+        )
 
     except HTTPException:
         raise
@@ -106,12 +234,12 @@ async def list_tenant_sessions(
 
 
 @router.get("/tenants/{tenant_id}/sessions/{session_id}", response_model=SessionDetail)
-async def get_session_details(
+def get_session_details(
     tenant_id: str = Path(..., description="Tenant UUID"),
     session_id: str = Path(..., description="Session UUID"),
     db: Session = Depends(get_db),
     admin_payload: dict = Depends(require_admin_role),
-) -> SessionDetail:
+) -> Response:
     """
     Get full session details with all messages (admin only).
 
@@ -119,8 +247,7 @@ async def get_session_details(
     """
     try:
         # Verify tenant exists
-        tenant = db.query(Tenant).filter(Tenant.tenant_id == tenant_id).first()
-        if not tenant:
+        if not tenant_exists(db, tenant_id):
             raise HTTPException(status_code=404, detail="Tenant not found")
 
         # Admin can view all tenants (no tenant restriction)
@@ -139,29 +266,20 @@ async def get_session_details(
             Message.session_id == session_id
         ).order_by(Message.created_at).all()
 
-        # Convert messages to dict format
-        message_list = []
-        for msg in messages:
-            # Ensure message metadata is a plain dict (not SQLAlchemy object)
-            msg_metadata_dict = {}
-            if msg.message_metadata:
-                if isinstance(msg.message_metadata, dict):
-                    msg_metadata_dict = msg.message_metadata
-                else:
-                    try:
-                        msg_metadata_dict = dict(msg.message_metadata)
-                    except (TypeError, ValueError):
-                        msg_metadata_dict = {}
-
-            message_list.append({
-                "message_id": str(msg.message_id),
-                "session_id": str(msg.session_id),
+        # Convert messages to dict format in one comprehension; the UUIDs and
+        # datetimes are left for orjson to write
+        message_list = [
+            {
+                "message_id": msg.message_id,
+                "session_id": msg.session_id,
                 "sender_id": msg.sender_user_id,
                 "role": msg.role,
                 "content": msg.content,
-                "timestamp": msg.created_at.isoformat(),
-                "metadata": msg_metadata_dict,
-            })
+                "timestamp": msg.created_at,
+                "metadata": msg.message_metadata,
+            }
+            for msg in messages
+        ]
 
         logger.info(
             "get_session_details",
@@ -171,27 +289,21 @@ async def get_session_details(
             admin_id=admin_payload.get("sub")
         )
 
-        # Ensure metadata is a plain dict (not SQLAlchemy object)
-        metadata_dict = {}
-        if session.session_metadata:
-            if isinstance(session.session_metadata, dict):
-                metadata_dict = session.session_metadata
-            else:
-                try:
-                    metadata_dict = dict(session.session_metadata)
-                except (TypeError, ValueError):
-                    metadata_dict = {}
-
-        return SessionDetail(
-            session_id=str(session.session_id),
-            tenant_id=str(session.tenant_id),
-            user_id=str(session.user_id),
-            agent_id=str(session.agent_id) if session.agent_id else None,
-            thread_id=session.thread_id,
-            created_at=session.created_at,
-            last_message_at=session.last_message_at,
-            messages=message_list,
-            metadata=metadata_dict,
+        # Serialized straight to bytes: orjson writes the UUIDs and datetimes
+        # of every message itself instead of a pydantic/json.dumps pass
+        return Response(
+            content=orjson.dumps({
+                "session_id": session.session_id,
+                "tenant_id": session.tenant_id,
+                "user_id": session.user_id,
+                "agent_id": session.agent_id,
+                "thread_id": session.thread_id,
+                "created_at": session.created_at,
+                "last_message_at": session.last_message_at,
+                "messages": message_list,
+                "metadata": session.session_metadata,
+            }),
+            media_type="application/json"
         )
 
     except HTTPException:
@@ -204,3 +316,70 @@ async def get_session_details(
             error=str(e),
         )
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+@router.get("/tenants/{tenant_id}/sessions/{session_id}/messages/stream")
+def stream_session_messages(
+    tenant_id: str = Path(..., description="Tenant UUID"),
+    session_id: str = Path(..., description="Session UUID"),
+    db: Session = Depends(get_db),
+    admin_payload: dict = Depends(require_admin_role),
+) -> StreamingResponse:
+    """
+    Stream every message of a session as JSON (admin only).
+
+    Same message format as the session details endpoint, but rows are read
+    from a server-side cursor and written out in batches, so memory stays
+    flat for sessions of any length.
+    """
+    try:
+        # Verify tenant exists
+        if not tenant_exists(db, tenant_id):
+            raise HTTPException(status_code=404, detail="Tenant not found")
+
+        session_found = db.scalar(select(exists().where(
+            ChatSession.session_id == session_id,
+            ChatSession.tenant_id == tenant_id
+        )))
+        if not session_found:
+            raise HTTPException(status_code=404, detail="Session not found")
+
+        # The stream outlives the request-scoped session, so it runs on its
+        # own pooled connection; stream_results keeps the rows server-side
+        conn = engine.connect().execution_options(
+            stream_results=True,
+            yield_per=MESSAGE_STREAM_BATCH_SIZE,
+        )
+        try:
+            result = conn.execute(
+                select(
+                    Message.message_id,
+                    Message.session_id,
+                    Message.sender_user_id,
+                    Message.role,
+                    Message.content,
+                    Message.created_at,
+                    Message.message_metadata,
+                )
+                .where(Message.session_id == session_id)
+                .order_by(Message.created_at)
+            )
+        except Exception:
+            conn.close()
+            raise
+
+        return StreamingResponse(
+            _stream_messages(conn, result, session_id, admin_payload.get("sub")),
+            media_type="application/json"
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(
+            "stream_session_messages_error",
+            tenant_id=tenant_id,
+            session_id=session_id,
+            error=str(e),
+        )
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
@@ -2,10 +2,12 @@
 import uuid
 from typing import List, Optional
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, Path
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Path, Query
 from pydantic import BaseModel, Field
-from sqlalchemy.orm import Session
-from src.config import get_db, get_redis
+from sqlalchemy import func, null, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, joinedload
+from src.config import get_db
 from src.models.tenant import Tenant
 from src.models.agent import AgentConfig
 from src.models.tool import ToolConfig
@@ -15,11 +17,16 @@ from src.models.llm_model import LLMModel
 from src.utils.encryption import encrypt_api_key
 from src.schemas.admin import (
     TenantPermissionsResponse,
+    AgentPermissionUpdate,
+    ToolPermissionUpdate,
     PermissionUpdateRequest,
     MessageResponse,
 )
 from src.middleware.auth import require_admin_role
+from src.utils.cache import cache_delete_pattern
 from src.utils.logging import get_logger
+from src.utils.pagination import decode_cursor, encode_cursor
+from src.services.tenant_cache import invalidate_tenant, tenant_exists
 from src.services.widget_service import widget_service
 
 logger = get_logger(__name__)
@@ -68,7 +75,7 @@ class TenantUpdateRequest(BaseModel):
 
 class TenantResponse(BaseModel):
     """Tenant response."""
-    tenant_id: str
+    tenant_id: uuid.UUID
     name: str
     domain: str
     status: str
@@ -81,8 +88,10 @@ class TenantResponse(BaseModel):
 
 class TenantListResponse(BaseModel):
     """List tenants response."""
-    total: int
+    # None on cursor pages: counting every tenant per page would undo the seek
+    total: Optional[int] = None
     tenants: List[TenantResponse]
+    next_cursor: Optional[str] = None
 
 # FULL TENANT CREATION SCHEMAS
 class LLMConfigCreate(BaseModel):
@@ -100,8 +109,8 @@ class TenantFullCreateRequest(BaseModel):
     domain: str = Field(..., min_length=1, max_length=255)
     status: str = Field(default="active")
     llm_config: LLMConfigCreate
-    agent_ids: List[str] = Field(default=[], description="Agent IDs to enable")
-    tool_ids: List[str] = Field(default=[], description="Tool IDs to enable")
+    agent_ids: List[uuid.UUID] = Field(default=[], description="Agent IDs to enable")
+    tool_ids: List[uuid.UUID] = Field(default=[], description="Tool IDs to enable")
 
 
 class TenantFullResponse(BaseModel):
@@ -123,7 +132,7 @@ class TenantFullResponse(BaseModel):
 
 
 @router.post("/tenants", response_model=TenantResponse, status_code=201)
-async def create_tenant(
+def create_tenant(
     request: TenantCreateRequest,
     db: Session = Depends(get_db),
     admin_payload: dict = Depends(require_admin_role),
@@ -150,13 +159,14 @@ async def create_tenant(
 
         # Create new tenant
         tenant_id = str(uuid.uuid4())
+        now = datetime.utcnow()
         tenant = Tenant(
             tenant_id=tenant_id,
             name=request.name,
             domain=request.domain,
             status=request.status,
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow(),
+            created_at=now,
+            updated_at=now,
         )
         db.add(tenant)
         db.commit()
@@ -170,7 +180,7 @@ async def create_tenant(
         )
 
         return TenantResponse(
-            tenant_id=str(tenant.tenant_id),
+            tenant_id=tenant.tenant_id,
             name=tenant.name,
             domain=tenant.domain,
             status=tenant.status,
@@ -194,41 +204,94 @@ async def create_tenant(
 
 
 @router.get("/tenants", response_model=TenantListResponse)
-async def list_tenants(
-    limit: int = 100,
-    offset: int = 0,
+def list_tenants(
+    limit: int = Query(100, ge=1, le=500, description="Maximum number of tenants to return"),
+    offset: int = Query(0, ge=0, description="Number of tenants to skip (deprecated: use cursor)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     db: Session = Depends(get_db),
     admin_payload: dict = Depends(require_admin_role),
 ) -> TenantListResponse:
     """
-    List all tenants with pagination.
+    List all tenants with pagination, oldest first.
 
     Requires admin role in JWT.
 
     Args:
         limit: Maximum number of results (default: 100)
-        offset: Number of results to skip (default: 0)
+        offset: Number of results to skip (default: 0, deprecated: use cursor)
+        cursor: next_cursor from the previous page
 
     Returns:
-        TenantListResponse with tenant list and total count
+        TenantListResponse with tenant list, total count (offset pages
+        only, null on cursor pages) and next_cursor
     """
     try:
-        # Get total count
-        total = db.query(Tenant).count()
-
-        # Get paginated results
-        tenants_data = db.query(Tenant).offset(offset).limit(limit).all()
-
+        keyset = None
+        if cursor:
+            try:
+                key = decode_cursor(cursor)
+                keyset = (
+                    datetime.fromisoformat(key["created_at"]),
+                    uuid.UUID(key["tenant_id"]),
+                )
+            except (ValueError, KeyError, TypeError):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        # Plain column rows, no ORM entities: only the response fields are
+        # read. Offset pages read the total from a window count on every
+        # row; cursor pages skip it so the seek on ix_tenants_created does
+        # not turn into a full scan
+        query = select(
+            Tenant.tenant_id,
+            Tenant.name,
+            Tenant.domain,
+            Tenant.status,
+            Tenant.created_at,
+            Tenant.updated_at,
+            (null() if keyset else func.count().over()).label("total"),
+        )
+        if keyset:
+            query = query.where(tuple_(Tenant.created_at, Tenant.tenant_id) > keyset)
+        else:
+            query = query.offset(offset)
+
+        # One extra row tells whether there is a next page
+        rows = db.execute(
+            query.order_by(Tenant.created_at, Tenant.tenant_id).limit(limit + 1)
+        ).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        # Cursor pages report no total, so their cost does not grow with the
+        # table; the first page (no cursor) carries it for the client
+        total = None
+        if rows and not keyset:
+            total = rows[0].total
+        elif offset:
+            # A page past the end has no row to read the window total from
+            total = db.query(Tenant).count()
+        elif not keyset:
+            total = 0
+
+        next_cursor = None
+        if has_more:
+            last_tenant = rows[-1]
+            next_cursor = encode_cursor({
+                "created_at": last_tenant.created_at.isoformat(),
+                "tenant_id": str(last_tenant.tenant_id),
+            })
+
+        # Rows come from typed columns: build the models without re-validating
         tenants = [
-            TenantResponse(
-                tenant_id=str(t.tenant_id),
+            TenantResponse.model_construct(
+                tenant_id=t.tenant_id,
                 name=t.name,
                 domain=t.domain,
                 status=t.status,
                 created_at=t.created_at,
                 updated_at=t.updated_at,
             )
-            for t in tenants_data
+            for t in rows
         ]
 
         logger.info(
@@ -238,8 +301,10 @@ async def list_tenants(
             returned=len(tenants),
         )
 
-        return TenantListResponse(total=total, tenants=tenants)
+        return TenantListResponse(total=total, tenants=tenants, next_cursor=next_cursor)
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(
             "list_tenants_error",
@@ -253,7 +318,7 @@ async def list_tenants(
 
 
 @router.get("/tenants/{tenant_id}", response_model=TenantResponse)
-async def get_tenant(
+def get_tenant(
     tenant_id: str = Path(..., description="Tenant UUID"),
     db: Session = Depends(get_db),
     admin_payload: dict = Depends(require_admin_role),
@@ -281,7 +346,7 @@ async def get_tenant(
         )
 
         return TenantResponse(
-            tenant_id=str(tenant.tenant_id),
+            tenant_id=tenant.tenant_id,
             name=tenant.name,
             domain=tenant.domain,
             status=tenant.status,
@@ -304,7 +369,7 @@ async def get_tenant(
 
 
 @router.patch("/tenants/{tenant_id}", response_model=TenantResponse)
-async def update_tenant(
+def update_tenant(
     tenant_id: str = Path(..., description="Tenant UUID"),
     request: TenantUpdateRequest = ...,
     db: Session = Depends(get_db),
@@ -349,6 +414,7 @@ async def update_tenant(
 
         tenant.updated_at = datetime.utcnow()
         db.commit()
+        invalidate_tenant(tenant_id)
         db.refresh(tenant)
 
         logger.info(
@@ -358,7 +424,7 @@ async def update_tenant(
         )
 
         return TenantResponse(
-            tenant_id=str(tenant.tenant_id),
+            tenant_id=tenant.tenant_id,
             name=tenant.name,
             domain=tenant.domain,
             status=tenant.status,
@@ -382,7 +448,7 @@ async def update_tenant(
 
 
 @router.delete("/tenants/{tenant_id}", status_code=204)
-async def delete_tenant(
+def delete_tenant(
     tenant_id: str = Path(..., description="Tenant UUID"),
     db: Session = Depends(get_db),
     admin_payload: dict = Depends(require_admin_role),
@@ -404,6 +470,7 @@ async def delete_tenant(
         tenant.status = "inactive"
         tenant.updated_at = datetime.utcnow()
         db.commit()
+        invalidate_tenant(tenant_id)
 
         logger.info(
             "tenant_deleted",
@@ -432,7 +499,7 @@ async def delete_tenant(
 
 
 @router.get("/tenants/{tenant_id}/permissions", response_model=TenantPermissionsResponse)
-async def get_tenant_permissions(
+def get_tenant_permissions(
     tenant_id: str = Path(..., description="Tenant UUID"),
     db: Session = Depends(get_db),
     admin_payload: dict = Depends(require_admin_role),
@@ -444,8 +511,7 @@ async def get_tenant_permissions(
     """
     try:
         # Validate tenant exists
-        tenant = db.query(Tenant).filter(Tenant.tenant_id == tenant_id).first()
-        if not tenant:
+        if not tenant_exists(db, tenant_id):
             raise HTTPException(status_code=404, detail="Tenant not found")
 
         # Get enabled agent permissions
@@ -516,139 +582,113 @@ async def get_tenant_permissions(
         )
 
 
+def _permission_upsert(permission_model, id_field: str):
+    """INSERT ... ON CONFLICT (tenant_id, <id>) DO UPDATE for a permission table."""
+    stmt = pg_insert(permission_model)
+    set_ = {"enabled": stmt.excluded.enabled}
+    if "updated_at" in permission_model.__table__.c:
+        # ON CONFLICT DO UPDATE bypasses the column's Python-side onupdate
+        set_["updated_at"] = stmt.excluded.updated_at
+    return stmt.on_conflict_do_update(index_elements=["tenant_id", id_field], set_=set_)
+
+
+# Built once at import: the same statement objects are reused on every
+# request, so their compiled form stays in the engine's statement cache
+PERMISSION_UPSERTS = {
+    TenantAgentPermission: _permission_upsert(TenantAgentPermission, "agent_id"),
+    TenantToolPermission: _permission_upsert(TenantToolPermission, "tool_id"),
+}
+
+
+def _upsert_permissions(
+    db: Session,
+    tenant_id: uuid.UUID,
+    permission_model,
+    config_id_column,
+    id_field: str,
+    updates: List[BaseModel],
+) -> int:
+    """Create or update permission rows for one tenant in a single statement.
+
+    The ids arrive already parsed by the request schema. Ids with no matching
+    config row are skipped with a warning; for repeated ids the last entry wins.
+
+    Returns:
+        Number of permission rows written
+    """
+    requested = {getattr(perm_update, id_field): perm_update.enabled for perm_update in updates}
+    if not requested:
+        return 0
+
+    valid_ids = set(db.scalars(select(config_id_column).where(config_id_column.in_(list(requested)))))
+    for item_id in requested.keys() - valid_ids:
+        logger.warning(
+            f"{id_field[:-3]}_not_found_skipping",
+            tenant_id=str(tenant_id),
+            **{id_field: str(item_id)}
+        )
+
+    rows = [
+        {"tenant_id": tenant_id, id_field: item_id, "enabled": enabled}
+        for item_id, enabled in requested.items()
+        if item_id in valid_ids
+    ]
+    if not rows:
+        return 0
+
+    db.execute(PERMISSION_UPSERTS[permission_model], rows)
+    return len(rows)
+
+
 @router.patch("/tenants/{tenant_id}/permissions", response_model=MessageResponse)
-async def update_tenant_permissions(
-    tenant_id: str = Path(..., description="Tenant UUID"),
+def update_tenant_permissions(
+    background_tasks: BackgroundTasks,
+    tenant_id: uuid.UUID = Path(..., description="Tenant UUID"),
     request: PermissionUpdateRequest = ...,
     db: Session = Depends(get_db),
-    redis = Depends(get_redis),
     admin_payload: dict = Depends(require_admin_role),
 ) -> MessageResponse:
     """
     Update tenant permissions (enable/disable agents and tools for a tenant).
 
     This will create permission records if they don't exist, or update if they do.
+    The tenant's cached agent data is invalidated after the response is sent.
     Requires admin role in JWT.
     """
     try:
         # Validate tenant exists
-        tenant = db.query(Tenant).filter(Tenant.tenant_id == tenant_id).first()
-        if not tenant:
+        if not tenant_exists(db, str(tenant_id)):
             raise HTTPException(status_code=404, detail="Tenant not found")
 
-        updated_agents = 0
-        updated_tools = 0
-
-        # Update agent permissions
-        if request.agent_permissions:
-            for perm_update in request.agent_permissions:
-                agent_id = perm_update.get("agent_id")
-                enabled = perm_update.get("enabled", True)
-
-                if not agent_id:
-                    continue
-
-                # Validate agent exists
-                agent = db.query(AgentConfig).filter(
-                    AgentConfig.agent_id == agent_id
-                ).first()
-                if not agent:
-                    logger.warning(
-                        "agent_not_found_skipping",
-                        agent_id=agent_id,
-                        tenant_id=tenant_id
-                    )
-                    continue
-
-                # Check if permission exists
-                existing_perm = db.query(TenantAgentPermission).filter(
-                    TenantAgentPermission.tenant_id == tenant_id,
-                    TenantAgentPermission.agent_id == agent_id
-                ).first()
-
-                if existing_perm:
-                    # Update existing permission
-                    existing_perm.enabled = enabled
-                else:
-                    # Create new permission
-                    new_perm = TenantAgentPermission(
-                        tenant_id=uuid.UUID(tenant_id),
-                        agent_id=uuid.UUID(agent_id),
-                        enabled=enabled,
-                    )
-                    db.add(new_perm)
-
-                updated_agents += 1
-
-        # Update tool permissions
-        if request.tool_permissions:
-            for perm_update in request.tool_permissions:
-                tool_id = perm_update.get("tool_id")
-                enabled = perm_update.get("enabled", True)
-
-                if not tool_id:
-                    continue
-
-                # Validate tool exists
-                tool = db.query(ToolConfig).filter(
-                    ToolConfig.tool_id == tool_id
-                ).first()
-                if not tool:
-                    logger.warning(
-                        "tool_not_found_skipping",
-                        tool_id=tool_id,
-                        tenant_id=tenant_id
-                    )
-                    continue
-
-                # Check if permission exists
-                existing_perm = db.query(TenantToolPermission).filter(
-                    TenantToolPermission.tenant_id == tenant_id,
-                    TenantToolPermission.tool_id == tool_id
-                ).first()
-
-                if existing_perm:
-                    # Update existing permission
-                    existing_perm.enabled = enabled
-                else:
-                    # Create new permission
-                    new_perm = TenantToolPermission(
-                        tenant_id=uuid.UUID(tenant_id),
-                        tool_id=uuid.UUID(tool_id),
-                        enabled=enabled,
-                    )
-                    db.add(new_perm)
-
-                updated_tools += 1
+        # One validation SELECT and one upsert per permission kind, however
+        # many entries the request carries
+        updated_agents = _upsert_permissions(
+            db, tenant_id, TenantAgentPermission, AgentConfig.agent_id,
+            "agent_id", request.agent_permissions or [],
+        )
+        updated_tools = _upsert_permissions(
+            db, tenant_id, TenantToolPermission, ToolConfig.tool_id,
+            "tool_id", request.tool_permissions or [],
+        )
 
         db.commit()
 
-        # Invalidate cache for this tenant
-        async for redis_client in redis:
-            pattern = f"agenthub:{tenant_id}:cache:*"
-            cursor = 0
-            deleted_count = 0
-
-            while True:
-                cursor, keys = await redis_client.scan(cursor, match=pattern, count=100)
-                if keys:
-                    deleted_count += await redis_client.delete(*keys)
-                if cursor == 0:
-                    break
-
-            logger.info(
-                "tenant_permissions_updated",
-                admin_user=admin_payload.get("user_id"),
-                tenant_id=tenant_id,
-                updated_agents=updated_agents,
-                updated_tools=updated_tools,
-                cache_keys_deleted=deleted_count,
-            )
+        # Invalidate cache for this tenant once the response is out; the
+        # keyspace sweep is not on the request path
+        background_tasks.add_task(cache_delete_pattern, f"agenthub:{tenant_id}:cache:*")
+
+        logger.info(
+            "tenant_permissions_updated",
+            admin_user=admin_payload.get("user_id"),
+            tenant_id=str(tenant_id),
+            updated_agents=updated_agents,
+            updated_tools=updated_tools,
+        )
 
         return MessageResponse(
             message="Successfully updated tenant permissions",
             details={
-                "tenant_id": tenant_id,
+                "tenant_id": str(tenant_id),
                 "updated_agents": updated_agents,
                 "updated_tools": updated_tools,
                 "cache_invalidated": True,
@@ -661,7 +701,7 @@ async def update_tenant_permissions(
         db.rollback()
         logger.error(
             "update_tenant_permissions_error",
-            tenant_id=tenant_id,
+            tenant_id=str(tenant_id),
             error=str(e)
         )
         raise HTTPException(
@@ -674,7 +714,7 @@ async def update_tenant_permissions(
 # ============================================================================
 
 @router.post("/tenants/create-new", response_model=TenantFullResponse, status_code=201)
-async def create_tenant_full(
+def create_tenant_full(
     request: TenantFullCreateRequest,
     db: Session = Depends(get_db),
     admin_payload: dict = Depends(require_admin_role),
@@ -704,13 +744,14 @@ async def create_tenant_full(
         
         # 3. Create tenant
         tenant_id = uuid.uuid4()
+        now = datetime.utcnow()
         tenant = Tenant(
             tenant_id=tenant_id,
             name=request.name,
             domain=request.domain,
             status=request.status,
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow(),
+            created_at=now,
+            updated_at=now,
         )
         db.add(tenant)
         
@@ -724,28 +765,20 @@ async def create_tenant_full(
             rate_limit_tpm=request.llm_config.rate_limit_tpm,
         )
         db.add(llm_config)
-        
-        # 5. Create agent permissions
-        enabled_agents = 0
-        for agent_id in request.agent_ids:
-            if db.query(AgentConfig).filter(AgentConfig.agent_id == agent_id).first():
-                db.add(TenantAgentPermission(
-                    tenant_id=tenant_id,
-                    agent_id=uuid.UUID(agent_id),
-                    enabled=True
-                ))
-                enabled_agents += 1
-        
-        # 6. Create tool permissions
-        enabled_tools = 0
-        for tool_id in request.tool_ids:
-            if db.query(ToolConfig).filter(ToolConfig.tool_id == tool_id).first():
-                db.add(TenantToolPermission(
-                    tenant_id=tenant_id,
-                    tool_id=uuid.UUID(tool_id),
-                    enabled=True
-                ))
-                enabled_tools += 1
+
+        # The tenant row has to exist before the permission rows reference it
+        db.flush()
+
+        # 5-6. Create agent and tool permissions: one validation SELECT and
+        # one multi-row INSERT per kind instead of a lookup and an INSERT per id
+        enabled_agents = _upsert_permissions(
+            db, tenant_id, TenantAgentPermission, AgentConfig.agent_id, "agent_id",
+            [AgentPermissionUpdate(agent_id=agent_id) for agent_id in request.agent_ids],
+        )
+        enabled_tools = _upsert_permissions(
+            db, tenant_id, TenantToolPermission, ToolConfig.tool_id, "tool_id",
+            [ToolPermissionUpdate(tool_id=tool_id) for tool_id in request.tool_ids],
+        )
 
         # 7. Create widget config with auto-generated embed code
         widget_config = widget_service.create_widget_config(
@@ -793,7 +826,7 @@ async def create_tenant_full(
     "/tenants/{tenant_id}/llm-config",
     response_model=TenantLLMConfigResponse
 )
-async def get_tenant_llm_config(
+def get_tenant_llm_config(
     tenant_id: str = Path(..., description="Tenant UUID"),
     db: Session = Depends(get_db),
     admin_payload: dict = Depends(require_admin_role),
@@ -812,8 +845,10 @@ async def get_tenant_llm_config(
     try:
         tenant_uuid = uuid.UUID(tenant_id)
 
-        # Get LLM config with joined LLM model data
-        llm_config = db.query(TenantLLMConfig).filter(
+        # Get LLM config with joined LLM model data (one SELECT ... JOIN)
+        llm_config = db.query(TenantLLMConfig).options(
+            joinedload(TenantLLMConfig.llm_model)
+        ).filter(
             TenantLLMConfig.tenant_id == tenant_uuid
         ).first()
 
@@ -823,11 +858,7 @@ async def get_tenant_llm_config(
                 detail="LLM configuration not found for this tenant"
             )
 
-        # Get LLM model details
-        llm_model = db.query(LLMModel).filter(
-            LLMModel.llm_model_id == llm_config.llm_model_id
-        ).first()
-
+        llm_model = llm_config.llm_model
         if not llm_model:
             raise HTTPException(
                 status_code=500,
@@ -872,7 +903,7 @@ async def get_tenant_llm_config(
     "/tenants/{tenant_id}/llm-config",
     response_model=TenantLLMConfigResponse
 )
-async def update_tenant_llm_config(
+def update_tenant_llm_config(
     tenant_id: str = Path(..., description="Tenant UUID"),
     request: TenantLLMConfigUpdateRequest = ...,
     db: Session = Depends(get_db),
@@ -896,8 +927,10 @@ async def update_tenant_llm_config(
     try:
         tenant_uuid = uuid.UUID(tenant_id)
 
-        # Get existing config
-        llm_config = db.query(TenantLLMConfig).filter(
+        # Get existing config with its LLM model (one SELECT ... JOIN)
+        llm_config = db.query(TenantLLMConfig).options(
+            joinedload(TenantLLMConfig.llm_model)
+        ).filter(
             TenantLLMConfig.tenant_id == tenant_uuid
         ).first()
 
@@ -929,32 +962,30 @@ async def update_tenant_llm_config(
             )
 
         llm_config.updated_at = datetime.utcnow()
-        db.commit()
-        db.refresh(llm_config)
-
-        # Get LLM model details for response
-        llm_model = db.query(LLMModel).filter(
-            LLMModel.llm_model_id == llm_config.llm_model_id
-        ).first()
 
-        logger.info(
-            "llm_config_updated",
-            admin_user=admin_payload.get("sub"),
-            tenant_id=tenant_id,
-            updated_fields=updated_fields
-        )
-
-        return TenantLLMConfigResponse(
+        # Built before the commit: every value is already loaded or was just
+        # set, so neither object has to be reloaded after commit expires it
+        response = TenantLLMConfigResponse(
             config_id=str(llm_config.config_id),
             tenant_id=str(llm_config.tenant_id),
             llm_model_id=str(llm_config.llm_model_id),
-            provider=llm_model.provider,
-            model_name=llm_model.model_name,
+            provider=llm_config.llm_model.provider,
+            model_name=llm_config.llm_model.model_name,
             rate_limit_rpm=llm_config.rate_limit_rpm,
             rate_limit_tpm=llm_config.rate_limit_tpm,
             created_at=llm_config.created_at,
             updated_at=llm_config.updated_at,
         )
+        db.commit()
+
+        logger.info(
+            "llm_config_updated",
+            admin_user=admin_payload.get("sub"),
+            tenant_id=tenant_id,
+            updated_fields=updated_fields
+        )
+
+        return response
 
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid tenant UUID format")
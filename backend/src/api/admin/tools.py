@@ -16,6 +16,7 @@ from src.schemas.admin import (
 )
 from pydantic import BaseModel
 from src.middleware.auth import require_admin_role
+from src.utils.cache import RAG_CHUNK_CONFIG_CACHE_KEY, cache_delete
 from src.utils.logging import get_logger
 from datetime import datetime
 
@@ -35,7 +36,7 @@ class BaseToolResponse(BaseModel):
 
 
 @router.get("/base-tools", response_model=List[BaseToolResponse])
-async def list_base_tools(
+def list_base_tools(
     db: Session = Depends(get_db),
     admin_payload: dict = Depends(require_admin_role),
 ) -> List[BaseToolResponse]:
@@ -62,7 +63,7 @@ async def list_base_tools(
 
 
 @router.get("/tools", response_model=ToolListResponse)
-async def list_tools(
+def list_tools(
     is_active: bool = Query(None, description="Filter by active status"),
     limit: int = Query(100, ge=1, le=500),
     offset: int = Query(0, ge=0),
@@ -137,7 +138,7 @@ async def list_tools(
 
 
 @router.post("/tools", response_model=ToolResponse, status_code=201)
-async def create_tool(
+def create_tool(
     request: ToolCreateRequest,
     db: Session = Depends(get_db),
     admin_payload: dict = Depends(require_admin_role),
@@ -170,6 +171,7 @@ async def create_tool(
 
         db.add(tool)
         db.commit()
+        cache_delete(RAG_CHUNK_CONFIG_CACHE_KEY)
         db.refresh(tool)
 
         # Build response
@@ -208,7 +210,7 @@ async def create_tool(
 
 
 @router.get("/tools/{tool_id}", response_model=ToolResponse)
-async def get_tool(
+def get_tool(
     tool_id: str,
     db: Session = Depends(get_db),
     admin_payload: dict = Depends(require_admin_role),
@@ -259,7 +261,7 @@ async def get_tool(
 
 
 @router.patch("/tools/{tool_id}", response_model=ToolResponse)
-async def update_tool(
+def update_tool(
     tool_id: str,
     request: ToolUpdateRequest,
     db: Session = Depends(get_db),
@@ -291,6 +293,7 @@ async def update_tool(
             tool.is_active = request.is_active
 
         db.commit()
+        cache_delete(RAG_CHUNK_CONFIG_CACHE_KEY)
         db.refresh(tool)
 
         # Get base tool info
@@ -3,6 +3,7 @@ from fastapi import APIRouter, Depends, HTTPException, Path, Request
 from sqlalchemy.orm import Session
 from src.config import get_db
 from src.services.widget_service import widget_service
+from src.services.tenant_cache import tenant_exists
 from src.schemas.widget import (
     WidgetConfigResponse,
     WidgetEmbedCodeResponse,
@@ -21,7 +22,7 @@ router = APIRouter(prefix="/api/admin", tags=["admin-widgets"])
     "/tenants/{tenant_id}/widget",
     response_model=WidgetConfigResponse
 )
-async def get_widget_config(
+def get_widget_config(
     tenant_id: str = Path(..., description="Tenant UUID"),
     db: Session = Depends(get_db),
     admin_payload: dict = Depends(require_admin_role),
@@ -96,7 +97,7 @@ async def get_widget_config(
     response_model=WidgetConfigResponse,
     status_code=201
 )
-async def create_widget_config(
+def create_widget_config(
     request: Request,  # Inject request
     tenant_id: str = Path(..., description="Tenant UUID"),
     db: Session = Depends(get_db),
@@ -134,9 +135,7 @@ async def create_widget_config(
             )
 
         # Verify tenant exists
-        from src.models.tenant import Tenant
-        tenant = db.query(Tenant).filter(Tenant.tenant_id == tenant_uuid).first()
-        if not tenant:
+        if not tenant_exists(db, str(tenant_uuid)):
             raise HTTPException(
                 status_code=404,
                 detail=f"Tenant not found: {tenant_id}"
@@ -206,7 +205,7 @@ async def create_widget_config(
     "/tenants/{tenant_id}/widget/embed-code",
     response_model=WidgetEmbedCodeResponse
 )
-async def get_widget_embed_code(
+def get_widget_embed_code(
     request: Request,  # Inject request to get dynamic base URL
     tenant_id: str = Path(..., description="Tenant UUID"),
     db: Session = Depends(get_db),
@@ -286,7 +285,7 @@ async def get_widget_embed_code(
     "/tenants/{tenant_id}/widget",
     response_model=WidgetConfigResponse
 )
-async def update_widget_config(
+def update_widget_config(
     tenant_id: str = Path(..., description="Tenant UUID"),
     request: WidgetConfigUpdateRequest = ...,
     db: Session = Depends(get_db),
@@ -380,7 +379,7 @@ async def update_widget_config(
     "/tenants/{tenant_id}/widget/regenerate-keys",
     response_model=WidgetConfigResponse
 )
-async def regenerate_widget_keys(
+def regenerate_widget_keys(
     request: Request,  # Inject request
     tenant_id: str = Path(..., description="Tenant UUID"),
     db: Session = Depends(get_db),
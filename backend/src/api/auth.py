@@ -1,6 +1,6 @@
 """Authentication API endpoints for user login and management."""
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, raiseload
 from sqlalchemy import and_, select
 from pydantic import BaseModel, EmailStr, Field, field_validator, ConfigDict
 from typing import Optional, List, Union
@@ -11,6 +11,7 @@ from datetime import datetime, timedelta
 from src.config import settings, get_db
 from src.models.user import User
 from src.models.tenant import Tenant
+from src.services.tenant_cache import tenant_exists
 from src.middleware.auth import require_admin_role, get_current_user
 from src.utils.logging import get_logger
 
@@ -297,8 +298,7 @@ def login(
 
         # Verify tenant exists (if we have a tenant_id now)
         if request.tenant_id:
-            tenant = db.query(Tenant).filter(Tenant.tenant_id == request.tenant_id).first()
-            if not tenant:
+            if not tenant_exists(db, request.tenant_id):
                 logger.warning(
                     "login_failed",
                     email=request.email,
@@ -543,8 +543,7 @@ def create_user(
             )
 
         # Verify tenant exists
-        tenant = db.query(Tenant).filter(Tenant.tenant_id == request.tenant_id).first()
-        if not tenant:
+        if not tenant_exists(db, request.tenant_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Tenant not found"
@@ -571,6 +570,7 @@ def create_user(
             )
 
         # Create new user
+        now = datetime.utcnow()
         new_user = User(
             user_id=uuid.uuid4(),
             tenant_id=uuid.UUID(request.tenant_id),  # Convert string to UUID
@@ -583,8 +583,8 @@ def create_user(
             supporter_status="online",  # Set supporter status to online
             max_concurrent_sessions=50,  # Set max concurrent sessions to 50
             created_by=uuid.UUID(admin_payload.get("sub")),
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow()
+            created_at=now,
+            updated_at=now
         )
 
         db.add(new_user)
@@ -871,7 +871,9 @@ def list_users(
         HTTPException: If admin not authorized
     """
     try:
-        query = db.query(User)
+        # Only scalar columns are serialized; fail loudly on any relationship
+        # access instead of one lazy query per listed user
+        query = db.query(User).options(raiseload("*"))
 
         # Apply filters
         if tenant_id:
@@ -959,14 +961,13 @@ def list_tenant_users(
     """
     try:
         # Verify tenant exists
-        tenant = db.query(Tenant).filter(Tenant.tenant_id == tenant_id).first()
-        if not tenant:
+        if not tenant_exists(db, tenant_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Tenant not found"
             )
 
-        query = db.query(User).filter(User.tenant_id == tenant_id)
+        query = db.query(User).options(raiseload("*")).filter(User.tenant_id == tenant_id)
 
         if role:
             query = query.filter(User.role == role)
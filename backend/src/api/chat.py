@@ -10,7 +10,7 @@ from src.config import get_db, settings
 from typing import Optional
 from src.models.session import ChatSession
 from src.models.message import Message
-from src.models.tenant import Tenant
+from src.services.tenant_cache import tenant_exists
 from src.models.chat_user import ChatUser
 from src.models.agent import AgentConfig
 from src.models.permissions import TenantAgentPermission
@@ -128,8 +128,7 @@ async def chat_endpoint(
 
     try:
         # Validate tenant exists and user has access
-        tenant = db.query(Tenant).filter(Tenant.tenant_id == tenant_id).first()
-        if not tenant:
+        if not tenant_exists(db, tenant_id):
             raise HTTPException(status_code=404, detail="Tenant not found")
 
         logger.info(f"DISABLE_AUTH: {settings.DISABLE_AUTH}")
@@ -548,8 +547,7 @@ async def test_chat_endpoint(
 
     try:
         # Validate tenant exists
-        tenant = db.query(Tenant).filter(Tenant.tenant_id == tenant_id).first()
-        if not tenant:
+        if not tenant_exists(db, tenant_id):
             raise HTTPException(status_code=404, detail="Tenant not found")
 
         # Create or retrieve session
@@ -729,7 +727,7 @@ async def test_chat_endpoint(
     response_model=PublicEscalationResponse,
     status_code=200
 )
-async def public_escalate_session(
+def public_escalate_session(
     tenant_id: str = Path(..., description="Tenant UUID"),
     session_id: str = Path(..., description="Session UUID"),
     request: PublicEscalationRequest = Body(...),
@@ -755,8 +753,7 @@ async def public_escalate_session(
     """
     try:
         # Validate tenant exists
-        tenant = db.query(Tenant).filter(Tenant.tenant_id == tenant_id).first()
-        if not tenant:
+        if not tenant_exists(db, tenant_id):
             raise HTTPException(status_code=404, detail="Tenant not found")
 
         # Validate session_id matches path and body
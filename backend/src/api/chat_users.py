@@ -29,7 +29,7 @@ router = APIRouter(prefix="/api", tags=["chat-users"])
 
 
 @router.post("/{tenant_id}/chat_users", response_model=ChatUserResponse)
-async def create_chat_user(
+def create_chat_user(
     tenant_id: str = Path(..., description="Tenant UUID"),
     request: ChatUserCreate = Body(...),
     db: Session = Depends(get_db),
@@ -79,14 +79,15 @@ async def create_chat_user(
             return response
 
         # Create new chat user
+        now = datetime.utcnow()
         new_user = ChatUser(
             user_id=uuid.uuid4(),
             tenant_id=tenant_id,
             email=request.email.lower(),
             username=request.username,
             department=request.department,
-            created_at=datetime.utcnow(),
-            last_active=datetime.utcnow(),
+            created_at=now,
+            last_active=now,
         )
 
         db.add(new_user)
@@ -124,7 +125,7 @@ async def create_chat_user(
 
 
 @router.get("/{tenant_id}/chat_users/{email}", response_model=ChatUserResponse)
-async def get_chat_user_by_email(
+def get_chat_user_by_email(
     tenant_id: str = Path(..., description="Tenant UUID"),
     email: str = Path(..., description="User email address"),
     db: Session = Depends(get_db),
@@ -185,7 +186,7 @@ async def get_chat_user_by_email(
 
 
 @router.get("/{tenant_id}/chat_users/{user_id}/sessions", response_model=ChatUserSessionsResponse)
-async def list_user_sessions(
+def list_user_sessions(
     tenant_id: str = Path(..., description="Tenant UUID"),
     user_id: str = Path(..., description="Chat user UUID"),
     limit: int = Query(50, ge=1, le=100, description="Maximum sessions to return"),
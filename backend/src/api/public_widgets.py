@@ -16,7 +16,7 @@ router = APIRouter(prefix="/api", tags=["public-widgets"])
 
 
 @router.get("/widget-config", response_model=WidgetConfigResponse)
-async def get_public_widget_config(
+def get_public_widget_config(
     request: Request,
     tenant_id: str = Query(..., description="Tenant UUID"),
     widget_key: str = Query(..., description="Public widget key"),
@@ -181,7 +181,7 @@ async def widget_chat(
 
 
 @router.get("/widget/session/{session_id}")
-async def get_widget_session(
+def get_widget_session(
     session_id: str,
     widget_auth: dict = Depends(verify_widget_auth),
     db: Session = Depends(get_db),
@@ -224,7 +224,7 @@ async def get_widget_session(
 
 
 @router.get("/widget/session/{session_id}/messages")
-async def get_widget_session_messages(
+def get_widget_session_messages(
     session_id: str,
     widget_auth: dict = Depends(verify_widget_auth),
     limit: int = Query(50, le=100),
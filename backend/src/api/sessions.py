@@ -1,15 +1,16 @@
 """Session management API endpoints."""
 from typing import List, Optional
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, Path, Query, Body
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Body, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_
+from sqlalchemy import desc, and_, func, select
+import orjson
 import uuid
 
 from src.config import get_db
 from src.models.session import ChatSession
 from src.models.message import Message
-from src.models.tenant import Tenant
+from src.services.tenant_cache import tenant_exists
 from src.models.chat_user import ChatUser
 from src.schemas.chat import (
     SessionSummary,
@@ -20,6 +21,7 @@ from src.schemas.chat import (
     SessionEndResponse,
 )
 from src.middleware.auth import get_current_tenant
+from src.services.escalation_service import get_escalation_service
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -28,7 +30,7 @@ router = APIRouter(prefix="/api", tags=["sessions"])
 
 
 @router.get("/{tenant_id}/session", response_model=List[SessionSummary])
-async def list_sessions(
+def list_sessions(
     tenant_id: str = Path(..., description="Tenant UUID"),
     user_id: str = Query(..., description="User ID to filter sessions"),
     start_date: Optional[datetime] = Query(None, description="Filter sessions created after this date"),
@@ -37,7 +39,7 @@ async def list_sessions(
     offset: int = Query(0, ge=0, description="Number of sessions to skip"),
     db: Session = Depends(get_db),
     current_tenant: str = Depends(get_current_tenant),
-) -> List[SessionSummary]:
+) -> Response:
     """
     List user's chat sessions with pagination and optional date filtering.
 
@@ -45,8 +47,7 @@ async def list_sessions(
     """
     try:
         # Validate tenant exists and user has access
-        tenant = db.query(Tenant).filter(Tenant.tenant_id == tenant_id).first()
-        if not tenant:
+        if not tenant_exists(db, tenant_id):
             raise HTTPException(status_code=404, detail="Tenant not found")
 
         if current_tenant != tenant_id:
@@ -64,9 +65,30 @@ async def list_sessions(
         if end_date:
             query_filters.append(ChatSession.created_at <= end_date)
 
+        # Message count and last-message preview come from correlated
+        # subqueries (ix_messages_session_timestamp), so the page costs one
+        # query instead of two more per listed session
+        message_count_subq = (
+            select(func.count())
+            .where(Message.session_id == ChatSession.session_id)
+            .scalar_subquery()
+        )
+        # One character past the preview length tells whether to add "..."
+        last_message_subq = (
+            select(func.left(Message.content, 101))
+            .where(Message.session_id == ChatSession.session_id)
+            .order_by(desc(Message.created_at))
+            .limit(1)
+            .scalar_subquery()
+        )
+
         # Query sessions for user
-        sessions = (
-            db.query(ChatSession)
+        rows = (
+            db.query(
+                ChatSession,
+                message_count_subq.label("message_count"),
+                last_message_subq.label("last_message_content"),
+            )
             .filter(and_(*query_filters))
             .order_by(desc(ChatSession.created_at))
             .limit(limit)
@@ -76,53 +98,30 @@ async def list_sessions(
 
         # Build session summaries with message count
         summaries = []
-        for session in sessions:
-            message_count = (
-                db.query(Message)
-                .filter(Message.session_id == session.session_id)
-                .count()
-            )
-
-            # Get last message preview
-            last_message = (
-                db.query(Message)
-                .filter(Message.session_id == session.session_id)
-                .order_by(desc(Message.created_at))
-                .first()
-            )
-
+        for session, message_count, last_message_content in rows:
             last_message_preview = ""
-            if last_message:
+            if last_message_content:
                 last_message_preview = (
-                    last_message.content[:100] + "..."
-                    if len(last_message.content) > 100
-                    else last_message.content
+                    last_message_content[:100] + "..."
+                    if len(last_message_content) > 100
+                    else last_message_content
                 )
 
-            # Ensure metadata is a plain dict (not SQLAlchemy object)
-            metadata_dict = {}
-            if session.session_metadata:
-                if isinstance(session.session_metadata, dict):
-                    metadata_dict = session.session_metadata
-                else:
-                    try:
-                        metadata_dict = dict(session.session_metadata)
-                    except (TypeError, ValueError):
-                        metadata_dict = {}
-
-            summaries.append(
-                SessionSummary(
-                    session_id=str(session.session_id),
-                    user_id=str(session.user_id),
-                    created_at=session.created_at,
-                    last_message_at=session.last_message_at,
-                    message_count=message_count,
-                    last_message_preview=last_message_preview,
-                    escalation_status=session.escalation_status,
-                    assigned_supporter_id=str(session.assigned_user_id) if session.assigned_user_id else None,
-                    metadata=metadata_dict,
-                )
-            )
+            # SessionSummary-shaped dict: the values come straight from typed
+            # columns, so there is nothing for per-field validation to catch
+            summaries.append({
+                "session_id": session.session_id,
+                "user_id": session.user_id,
+                "user_email": None,
+                "user_name": None,
+                "created_at": session.created_at,
+                "last_message_at": session.last_message_at,
+                "message_count": message_count,
+                "last_message_preview": last_message_preview,
+                "escalation_status": session.escalation_status,
+                "assigned_supporter_id": session.assigned_user_id,
+                "metadata": session.session_metadata,
+            })
 
         logger.info(
             "sessions_listed",
@@ -133,7 +132,9 @@ async def list_sessions(
             offset=offset,
         )
 
-        return summaries
+        # orjson writes the UUIDs and datetimes itself; the response_model
+        # above documents the shape
+        return Response(content=orjson.dumps(summaries), media_type="application/json")
 
     except HTTPException:
         raise
@@ -148,7 +149,7 @@ async def list_sessions(
 
 
 @router.get("/{tenant_id}/session/{session_id}", response_model=SessionDetail)
-async def get_session(
+def get_session(
     tenant_id: str = Path(..., description="Tenant UUID"),
     session_id: str = Path(..., description="Session UUID"),
     db: Session = Depends(get_db),
@@ -161,8 +162,7 @@ async def get_session(
     """
     try:
         # Validate tenant exists and user has access
-        tenant = db.query(Tenant).filter(Tenant.tenant_id == tenant_id).first()
-        if not tenant:
+        if not tenant_exists(db, tenant_id):
             raise HTTPException(status_code=404, detail="Tenant not found")
 
         if current_tenant != tenant_id:
@@ -192,23 +192,12 @@ async def get_session(
         # Build message list
         message_list = []
         for msg in messages:
-            # Ensure message metadata is a plain dict (not SQLAlchemy object)
-            msg_metadata_dict = {}
-            if msg.metadata:
-                if isinstance(msg.metadata, dict):
-                    msg_metadata_dict = msg.metadata
-                else:
-                    try:
-                        msg_metadata_dict = dict(msg.metadata)
-                    except (TypeError, ValueError):
-                        msg_metadata_dict = {}
-
             message_list.append({
-                "message_id": str(msg.message_id),
+                "message_id": msg.message_id,
                 "role": msg.role,
                 "content": msg.content,
                 "created_at": msg.created_at.isoformat(),
-                "metadata": msg_metadata_dict,
+                "metadata": msg.message_metadata,
             })
 
         logger.info(
@@ -218,27 +207,16 @@ async def get_session(
             message_count=len(message_list),
         )
 
-        # Ensure metadata is a plain dict (not SQLAlchemy object)
-        metadata_dict = {}
-        if session.session_metadata:
-            if isinstance(session.session_metadata, dict):
-                metadata_dict = session.session_metadata
-            else:
-                try:
-                    metadata_dict = dict(session.session_metadata)
-                except (TypeError, ValueError):
-                    metadata_dict = {}
-
         return SessionDetail(
-            session_id=str(session.session_id),
-            tenant_id=str(session.tenant_id),
-            user_id=str(session.user_id),
-            agent_id=str(session.agent_id) if session.agent_id else None,
+            session_id=session.session_id,
+            tenant_id=session.tenant_id,
+            user_id=session.user_id,
+            agent_id=session.agent_id,
             thread_id=session.thread_id,
             created_at=session.created_at,
             last_message_at=session.last_message_at,
             messages=message_list,
-            metadata=metadata_dict,
+            metadata=session.session_metadata,
         )
 
     except HTTPException:
@@ -254,7 +232,7 @@ async def get_session(
 
 
 @router.post("/{tenant_id}/sessions", response_model=SessionCreateResponse)
-async def create_session(
+def create_session(
     tenant_id: str = Path(..., description="Tenant UUID"),
     user_id: str = Query(..., description="Chat user UUID"),
     request: Optional[SessionCreateRequest] = Body(None),
@@ -271,8 +249,7 @@ async def create_session(
     """
     try:
         # Validate tenant exists
-        tenant = db.query(Tenant).filter(Tenant.tenant_id == tenant_id).first()
-        if not tenant:
+        if not tenant_exists(db, tenant_id):
             raise HTTPException(status_code=404, detail="Tenant not found")
 
         # Validate chat user exists
@@ -337,7 +314,7 @@ async def create_session(
 
 
 @router.patch("/{tenant_id}/sessions/{session_id}", response_model=SessionEndResponse)
-async def end_session(
+def end_session(
     tenant_id: str = Path(..., description="Tenant UUID"),
     session_id: str = Path(..., description="Session UUID"),
     request: Optional[SessionEndRequest] = Body(None),
@@ -352,8 +329,7 @@ async def end_session(
     """
     try:
         # Validate tenant exists
-        tenant = db.query(Tenant).filter(Tenant.tenant_id == tenant_id).first()
-        if not tenant:
+        if not tenant_exists(db, tenant_id):
             raise HTTPException(status_code=404, detail="Tenant not found")
 
         # Query session
@@ -372,13 +348,12 @@ async def end_session(
         # Mark session as resolved/closed
         session.escalation_status = "resolved"
         if request and request.feedback:
-            # Store feedback in metadata
-            if session.session_metadata is None:
-                session.session_metadata = {}
+            # Store feedback in metadata (MutableDict tracks in-place changes)
             session.session_metadata["feedback"] = request.feedback
             session.session_metadata["feedback_at"] = datetime.utcnow().isoformat()
 
         db.commit()
+        get_escalation_service().invalidate_queue_cache(tenant_id)
 
         logger.info(
             "session_ended",
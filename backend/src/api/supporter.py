@@ -7,13 +7,13 @@ from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Path, Query, Body
 from sqlalchemy import and_, func
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, raiseload
 
 from src.config import get_db, settings
 from src.middleware.auth import get_current_tenant, get_current_user
 from src.models.message import Message
 from src.models.session import ChatSession
-from src.models.tenant import Tenant
+from src.services.tenant_cache import tenant_exists
 from src.models.user import User
 from src.models.chat_user import ChatUser
 from src.schemas.supporter_chat import (
@@ -32,7 +32,7 @@ router = APIRouter(prefix="/api", tags=["supporter"])
     "/tenants/{tenant_id}/supporters/{supporter_id}/sessions",
     response_model=SupporterSessionsResponse,
 )
-async def get_supporter_sessions(
+def get_supporter_sessions(
     tenant_id: UUID = Path(..., description="Tenant UUID"),
     supporter_id: UUID = Path(..., description="Supporter user UUID"),
     status: Optional[str] = Query(
@@ -87,8 +87,7 @@ async def get_supporter_sessions(
             )
 
         # Validate tenant exists
-        tenant = db.query(Tenant).filter(Tenant.tenant_id == tenant_id).first()
-        if not tenant:
+        if not tenant_exists(db, str(tenant_id)):
             logger.error(
                 "tenant_not_found",
                 tenant_id=tenant_id,
@@ -107,6 +106,7 @@ async def get_supporter_sessions(
         # Validate supporter exists and has role='supporter'
         supporter = (
             db.query(User)
+            .options(raiseload("*"))
             .filter(
                 and_(
                     User.user_id == supporter_id,
@@ -375,6 +375,7 @@ async def supporter_send_message(
         # Validate current user is a supporter
         supporter = (
             db.query(User)
+            .options(raiseload("*"))
             .filter(
                 and_(
                     User.user_id == current_user_uuid,
@@ -488,7 +489,7 @@ async def supporter_send_message(
     response_model=SupporterChatResponse,
     tags=["admin"],
 )
-async def admin_send_message(
+def admin_send_message(
     tenant_id: UUID = Path(..., description="Tenant UUID"),
     session_id: str = Path(..., description="Session UUID"),
     request: SupporterChatRequest = Body(...),
@@ -553,6 +554,7 @@ async def admin_send_message(
             raise HTTPException(status_code=400, detail="Message content cannot be empty")
 
         # Create message
+        now = datetime.now(timezone.utc)
         message = Message(
             message_id=str(uuid.uuid4()),
             session_id=session_id,
@@ -560,13 +562,13 @@ async def admin_send_message(
             sender_user_id=current_user_uuid,
             role="supporter",
             content=request.message.strip(),
-            created_at=datetime.now(timezone.utc),
+            created_at=now,
         )
 
         db.add(message)
 
         # Update session's last_message_at
-        session.last_message_at = datetime.now(timezone.utc)
+        session.last_message_at = now
         db.commit()
         db.refresh(message)
 
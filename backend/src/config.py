@@ -15,6 +15,7 @@ class Settings(BaseSettings):
     DATABASE_URL: str = Field(default="")
     DB_POOL_SIZE: int = Field(default=20)
     DB_MAX_OVERFLOW: int = Field(default=10)
+    DB_QUERY_CACHE_SIZE: int = Field(default=1200)
 
     # Redis Configuration
     REDIS_URL: str = Field(default="redis://localhost:6379")
@@ -95,6 +96,12 @@ engine = create_engine(
     pool_size=settings.DB_POOL_SIZE,
     max_overflow=settings.DB_MAX_OVERFLOW,
     pool_pre_ping=True,  # Verify connections before using
+    # executemany of text()/UPDATE statements goes through psycopg2's
+    # execute_batch instead of one round-trip per parameter set
+    executemany_mode="values_plus_batch",
+    # Compiled-statement cache per engine (SQLAlchemy default 500); sized
+    # so the hot endpoint queries are not evicted by one-off shapes
+    query_cache_size=settings.DB_QUERY_CACHE_SIZE,
     echo=settings.ENVIRONMENT == "development"
 )
 
@@ -14,7 +14,7 @@ from src.utils.logging import configure_logging, get_logger
 from src.utils.exceptions import SecurityError
 import redis
 from sqlalchemy import text
-from src.config import engine
+from src.config import engine, SessionLocal
 
 # Import ALL models to ensure SQLAlchemy relationships are properly registered
 # This must be done before any database operations
@@ -35,6 +35,8 @@ from src.models.chat_user import ChatUser  # noqa: F401
 
 # Import LLM manager to set up rate limiter
 from src.services.llm_manager import llm_manager
+from src.services.escalation_service import get_escalation_service
+from src.services.tenant_cache import warmup_tenant_cache
 
 # Configure logging
 configure_logging()
@@ -136,6 +138,16 @@ async def startup_event():
         )
         # Continue without rate limiting - it's not critical for startup
 
+    # Warm per-process caches so the first requests skip cold-path work
+    try:
+        get_escalation_service()  # compiles the default keyword automaton
+        with SessionLocal() as db:
+            tenants_cached = warmup_tenant_cache(db)
+        logger.info("escalation_caches_warmed", tenants_cached=tenants_cached)
+    except Exception as e:
+        logger.error("escalation_cache_warmup_failed", error=str(e))
+        # Caches fill lazily on first use - not critical for startup
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
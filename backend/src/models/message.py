@@ -1,7 +1,8 @@
 """Message model for individual chat messages within sessions."""
 from datetime import datetime
-from sqlalchemy import Column, String, Text, TIMESTAMP, ForeignKey, Index
+from sqlalchemy import Column, String, Text, TIMESTAMP, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.ext.mutable import MutableDict
 from sqlalchemy.orm import relationship
 import uuid
 
@@ -21,7 +22,14 @@ class Message(Base):
     role = Column(String(50), nullable=False)  # user/assistant/system/supporter
     content = Column(Text, nullable=False)  # Message content
     created_at = Column("timestamp", TIMESTAMP, nullable=False, default=datetime.utcnow)  # Mapped to "timestamp" column
-    message_metadata = Column("metadata", JSONB)  # Additional metadata (intent, tool_calls, tokens)
+    # Additional metadata (intent, tool_calls, tokens); always a dict
+    message_metadata = Column(
+        "metadata",
+        MutableDict.as_mutable(JSONB),
+        nullable=False,
+        default=dict,
+        server_default=text("'{}'::jsonb"),
+    )
 
     # Sender tracking for human-sent messages
     sender_user_id = Column(UUID(as_uuid=True), ForeignKey("users.user_id"), nullable=True)
@@ -1,7 +1,8 @@
 """Session model for tracking conversation sessions."""
 from datetime import datetime
-from sqlalchemy import Column, String, TIMESTAMP, ForeignKey, Index
+from sqlalchemy import Column, String, TIMESTAMP, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.ext.mutable import MutableDict
 from sqlalchemy.orm import relationship
 import uuid
 
@@ -15,6 +16,17 @@ class ChatSession(Base):
     __table_args__ = (
         Index('ix_sessions_tenant_user', 'tenant_id', 'user_id', 'created_at'),
         Index('ix_sessions_escalation', 'tenant_id', 'escalation_status'),
+        # Keyset pagination of the admin session listing (newest first)
+        Index(
+            'ix_sessions_tenant_last_message',
+            'tenant_id', text('last_message_at DESC'), text('session_id DESC'),
+        ),
+        # Escalation queue: escalated sessions of a tenant, newest request first
+        Index(
+            'ix_sessions_escalation_queue',
+            'tenant_id', text('escalation_requested_at DESC'),
+            postgresql_where=text("escalation_status <> 'none'"),
+        ),
     )
 
     session_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -23,8 +35,15 @@ class ChatSession(Base):
     agent_id = Column(UUID(as_uuid=True), ForeignKey("agent_configs.agent_id"))
     thread_id = Column(String(500))  # LangGraph thread ID
     created_at = Column(TIMESTAMP, nullable=False, default=datetime.utcnow)
-    last_message_at = Column(TIMESTAMP, nullable=False, default=datetime.utcnow, index=True)
-    session_metadata = Column("metadata", JSONB)  # Additional session metadata (mapped to "metadata" column)
+    last_message_at = Column(TIMESTAMP, nullable=False, default=datetime.utcnow)
+    # Additional session metadata (mapped to "metadata" column); always a dict
+    session_metadata = Column(
+        "metadata",
+        MutableDict.as_mutable(JSONB),
+        nullable=False,
+        default=dict,
+        server_default=text("'{}'::jsonb"),
+    )
 
     # Escalation fields
     assigned_user_id = Column(UUID(as_uuid=True), ForeignKey("users.user_id"), nullable=True)
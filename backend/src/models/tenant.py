@@ -1,6 +1,6 @@
 """Tenant model representing organizations using the system."""
 from datetime import datetime
-from sqlalchemy import Column, String, TIMESTAMP
+from sqlalchemy import Column, String, TIMESTAMP, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -12,6 +12,10 @@ class Tenant(Base):
     """Tenant model - represents a company/organization using AgentHub."""
 
     __tablename__ = "tenants"
+    __table_args__ = (
+        # Keyset pagination of the admin tenant listing (oldest first)
+        Index('ix_tenants_created', 'created_at', 'tenant_id'),
+    )
 
     tenant_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String(255), nullable=False)
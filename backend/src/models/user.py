@@ -1,6 +1,6 @@
 """User model for authentication and tenant users."""
 from datetime import datetime
-from sqlalchemy import Column, String, TIMESTAMP, ForeignKey, UniqueConstraint, Index, Boolean, Integer
+from sqlalchemy import Column, String, TIMESTAMP, ForeignKey, UniqueConstraint, Index, Boolean, Integer, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -16,6 +16,17 @@ class User(Base):
         UniqueConstraint('tenant_id', 'email', name='uq_tenant_email'),
         Index('ix_users_tenant_email', 'tenant_id', 'email'),
         Index('ix_users_role', 'role'),
+        # Partial covering index for the staff listings (filter on tenant,
+        # sort by load): index-only scans, no heap access for those columns
+        Index(
+            'ix_users_tenant_supporter_sessions',
+            'tenant_id', 'current_sessions_count',
+            postgresql_include=[
+                'user_id', 'email', 'username', 'display_name',
+                'supporter_status', 'max_concurrent_sessions', 'created_at',
+            ],
+            postgresql_where=text("role = 'supporter'"),
+        ),
     )
 
     user_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -4,6 +4,11 @@
 from typing import Dict, List, Optional, Any
 from pydantic import BaseModel, Field
 from datetime import datetime
+from uuid import UUID
+
+
+# Canonical 8-4-4-4-12 hex UUID text; checked by FastAPI before any DB work
+UUID_PATTERN = r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$"
 
 
 # Agent Management Schemas
@@ -99,13 +104,25 @@ class TenantPermissionsResponse(BaseModel):
     enabled_tools: List[Dict[str, Any]] = Field(default_factory=list)
 
 
+class AgentPermissionUpdate(BaseModel):
+    """One agent permission change."""
+    agent_id: UUID = Field(..., description="UUID of the agent")
+    enabled: bool = True
+
+
+class ToolPermissionUpdate(BaseModel):
+    """One tool permission change."""
+    tool_id: UUID = Field(..., description="UUID of the tool")
+    enabled: bool = True
+
+
 class PermissionUpdateRequest(BaseModel):
     """Request to update tenant permissions."""
-    agent_permissions: Optional[List[Dict[str, bool]]] = Field(
+    agent_permissions: Optional[List[AgentPermissionUpdate]] = Field(
         None,
         description="List of {agent_id: str, enabled: bool}"
     )
-    tool_permissions: Optional[List[Dict[str, bool]]] = Field(
+    tool_permissions: Optional[List[ToolPermissionUpdate]] = Field(
         None,
         description="List of {tool_id: str, enabled: bool}"
     )
@@ -142,9 +159,11 @@ class PDFUploadResponse(BaseModel):
     tenant_id: str
     filename: str
     document_name: str
-    chunk_count: int
-    collection_name: str
-    document_ids: List[str]
+    chunk_count: Optional[int] = None
+    collection_name: Optional[str] = None
+    document_ids: List[str] = []
+    status: str = "completed"  # 'completed', or 'pending' for background ingestion
+    job_id: Optional[str] = None
 
 
 # Common Response Schemas
@@ -166,7 +185,7 @@ class ErrorResponse(BaseModel):
 
 class EscalationRequest(BaseModel):
     """Request to escalate a chat session."""
-    session_id: str = Field(..., description="UUID of the session to escalate")
+    session_id: str = Field(..., pattern=UUID_PATTERN, description="UUID of the session to escalate")
     reason: str = Field(..., max_length=500, description="Reason for escalation")
     auto_detected: bool = Field(default=False, description="Whether escalation was auto-detected")
     keywords: Optional[List[str]] = Field(None, description="Keywords that triggered auto-escalation")
@@ -174,13 +193,13 @@ class EscalationRequest(BaseModel):
 
 class EscalationAssignRequest(BaseModel):
     """Request to assign a supporter to escalated session."""
-    session_id: str = Field(..., description="UUID of the session")
-    user_id: str = Field(..., description="UUID of the staff user to assign")
+    session_id: str = Field(..., pattern=UUID_PATTERN, description="UUID of the session")
+    user_id: str = Field(..., pattern=UUID_PATTERN, description="UUID of the staff user to assign")
 
 
 class EscalationResolveRequest(BaseModel):
     """Request to resolve an escalation."""
-    session_id: str = Field(..., description="UUID of the session")
+    session_id: str = Field(..., pattern=UUID_PATTERN, description="UUID of the session")
     resolution_notes: Optional[str] = Field(None, max_length=500, description="Resolution details")
 
 
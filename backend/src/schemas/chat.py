@@ -67,8 +67,8 @@ class ErrorResponse(BaseModel):
 class SessionSummary(BaseModel):
     """Session summary schema."""
 
-    session_id: str
-    user_id: str = Field(..., description="User identifier (UUID)")
+    session_id: UUID
+    user_id: UUID = Field(..., description="User identifier")
     user_email: Optional[str] = Field(None, description="User email address")
     user_name: Optional[str] = Field(None, description="User name")
     created_at: datetime
@@ -76,7 +76,7 @@ class SessionSummary(BaseModel):
     message_count: int
     last_message_preview: Optional[str] = Field(None, description="Preview of the last message")
     escalation_status: Optional[str] = Field(None, description="Escalation status (none, pending, assigned, resolved)")
-    assigned_supporter_id: Optional[str] = Field(None, description="UUID of assigned supporter/staff member")
+    assigned_supporter_id: Optional[UUID] = Field(None, description="UUID of assigned supporter/staff member")
     metadata: Optional[Dict[str, Any]] = Field(None, description="Session metadata")
 
 
@@ -93,10 +93,10 @@ class Message(BaseModel):
 class SessionDetail(BaseModel):
     """Detailed session information schema."""
 
-    session_id: str
-    tenant_id: str
-    user_id: str
-    agent_id: Optional[str] = None
+    session_id: UUID
+    tenant_id: UUID
+    user_id: UUID
+    agent_id: Optional[UUID] = None
     thread_id: Optional[str] = Field(None, description="LangGraph thread ID")
     created_at: datetime
     last_message_at: datetime
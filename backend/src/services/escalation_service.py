@@ -6,17 +6,105 @@ This service handles:
 - Supporter assignment and queue management
 - Escalation resolution tracking
 """
-from typing import List, Dict, Any, Optional
+import functools
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, desc
+import ahocorasick
+import redis
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session, raiseload
+from sqlalchemy import String, and_, cast, desc, func, literal, select, update
+from sqlalchemy.dialects.postgresql import JSONB
 from src.models.session import ChatSession
 from src.models.user import User
 from src.models.tenant import Tenant
+from src.utils.cache import get_cache_client
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Serialized escalation queue responses are cached in Redis (the shared
+# src.utils.cache client) per tenant under a version number; every escalation
+# state change bumps the version
+QUEUE_CACHE_TTL_SECONDS = 30
+
+# Columns returned by the escalation UPDATE ... RETURNING statements; exactly
+# what the admin API needs to build an EscalationResponse
+ESCALATION_COLUMNS = (
+    ChatSession.session_id,
+    ChatSession.tenant_id,
+    ChatSession.user_id,
+    ChatSession.escalation_status,
+    ChatSession.escalation_reason,
+    ChatSession.assigned_user_id,
+    ChatSession.escalation_requested_at,
+    ChatSession.escalation_assigned_at,
+    ChatSession.created_at,
+)
+
+# Queue projection: UUIDs are cast to text in PostgreSQL so rows map straight
+# onto EscalationResponse without building and stringifying uuid.UUID objects
+ESCALATION_QUEUE_COLUMNS = (
+    cast(ChatSession.session_id, String).label("session_id"),
+    cast(ChatSession.tenant_id, String).label("tenant_id"),
+    cast(ChatSession.user_id, String).label("user_id"),
+    ChatSession.escalation_status,
+    ChatSession.escalation_reason,
+    cast(ChatSession.assigned_user_id, String).label("assigned_user_id"),
+    ChatSession.escalation_requested_at,
+    ChatSession.escalation_assigned_at,
+    ChatSession.created_at,
+)
+
+
+# Supporter projection for the staff listings; availability and load are
+# derived by PostgreSQL from the same row, so no User entities are loaded
+STAFF_COLUMNS = (
+    cast(User.user_id, String).label("user_id"),
+    User.email,
+    User.username,
+    User.display_name,
+    User.supporter_status,
+    User.max_concurrent_sessions,
+    User.current_sessions_count,
+    User.created_at,
+)
+
+STAFF_AVAILABLE = func.coalesce(
+    and_(
+        User.supporter_status.in_(['online', 'available']),
+        User.current_sessions_count < User.max_concurrent_sessions
+    ),
+    False
+).label("available")
+
+STAFF_CAPACITY_PERCENTAGE = (
+    User.current_sessions_count * 100 // User.max_concurrent_sessions
+).label("capacity_percentage")
+
+
+@functools.lru_cache(maxsize=256)
+def _keyword_automaton(keywords: Tuple[str, ...]) -> ahocorasick.Automaton:
+    """Build (once per keyword tuple) an Aho-Corasick automaton over lowercased keywords.
+
+    Each word maps to the positions of the keywords it came from, so a single
+    pass over the message reports every keyword, overlapping ones included.
+    """
+    automaton = ahocorasick.Automaton()
+    for index, keyword in enumerate(keywords):
+        word = keyword.lower()
+        if word:
+            automaton.add_word(word, automaton.get(word, ()) + (index,))
+    automaton.make_automaton()
+    return automaton
+
+
+def _merge_metadata(values: Dict[str, Any]):
+    """SQL expression merging values into sessions.metadata (JSONB ||)."""
+    return func.coalesce(ChatSession.session_metadata, literal({}, JSONB)).op("||")(
+        literal(values, JSONB)
+    )
+
 
 class EscalationService:
     """Service for managing session escalations with supporter assignment."""
@@ -39,6 +127,8 @@ class EscalationService:
 
     def __init__(self):
         """Initialize escalation service."""
+        # Compile the default keyword automaton up front
+        _keyword_automaton(tuple(self.DEFAULT_ESCALATION_KEYWORDS))
         logger.info(
             "escalation_service_initialized",
             default_keywords_count=len(self.DEFAULT_ESCALATION_KEYWORDS)
@@ -64,16 +154,21 @@ class EscalationService:
             - reason: Optional[str]
         """
         try:
-            message_lower = message.lower()
-            keywords_to_check = self.DEFAULT_ESCALATION_KEYWORDS.copy()
+            keywords_to_check = tuple(self.DEFAULT_ESCALATION_KEYWORDS)
 
             if custom_keywords:
-                keywords_to_check.extend(custom_keywords)
+                keywords_to_check += tuple(custom_keywords)
+
+            # One pass over the lowercased message; automata are cached per
+            # keyword set, so repeated custom keyword lists are built once
+            automaton = _keyword_automaton(keywords_to_check)
+            hits = set()
+            if len(automaton):
+                for _, indexes in automaton.iter(message.lower()):
+                    hits.update(indexes)
 
-            detected = []
-            for keyword in keywords_to_check:
-                if keyword.lower() in message_lower:
-                    detected.append(keyword)
+            # Report keywords in list order, as before
+            detected = [keywords_to_check[i] for i in sorted(hits)]
 
             # Calculate confidence based on number of keywords detected
             confidence = min(len(detected) / 3.0, 1.0)  # 3+ keywords = 100% confidence
@@ -135,54 +230,63 @@ class EscalationService:
             Dictionary with escalation result
         """
         try:
-            # Get the session
-            session = db.query(ChatSession).filter(
-                and_(
+            # Escalate in one conditional UPDATE ... RETURNING; only sessions
+            # that are not escalated yet match
+            values = {
+                "escalation_status": 'pending',
+                "escalation_reason": reason,
+                "escalation_requested_at": datetime.utcnow(),
+            }
+
+            # Add metadata about auto-detection
+            if auto_detected:
+                values["session_metadata"] = _merge_metadata({
+                    'auto_escalation': {
+                        'detected': True,
+                        'keywords': keywords or [],
+                        'detected_at': datetime.utcnow().isoformat(),
+                    }
+                })
+
+            escalation = db.execute(
+                update(ChatSession)
+                .where(
                     ChatSession.session_id == session_id,
-                    ChatSession.tenant_id == tenant_id
+                    ChatSession.tenant_id == tenant_id,
+                    ChatSession.escalation_status == 'none'
                 )
+                .values(**values)
+                .returning(*ESCALATION_COLUMNS)
+                .execution_options(synchronize_session=False)
             ).first()
 
-            if not session:
-                logger.warning(
-                    "escalate_session_not_found",
-                    session_id=session_id,
-                    tenant_id=tenant_id
-                )
-                return {
-                    "success": False,
-                    "error": "Session not found",
-                }
+            if not escalation:
+                current = self._get_escalation_status(db, session_id, tenant_id)
+                db.rollback()
+
+                if not current:
+                    logger.warning(
+                        "escalate_session_not_found",
+                        session_id=session_id,
+                        tenant_id=tenant_id
+                    )
+                    return {
+                        "success": False,
+                        "error": "Session not found",
+                    }
 
-            # Check if already escalated
-            if session.escalation_status != 'none':
                 logger.warning(
                     "escalate_session_already_escalated",
                     session_id=session_id,
-                    current_status=session.escalation_status
+                    current_status=current.escalation_status
                 )
                 return {
                     "success": False,
-                    "error": f"Session already escalated with status: {session.escalation_status}",
+                    "error": f"Session already escalated with status: {current.escalation_status}",
                 }
 
-            # Update session with escalation details
-            session.escalation_status = 'pending'
-            session.escalation_reason = reason
-            session.escalation_requested_at = datetime.utcnow()
-
-            # Add metadata about auto-detection
-            if auto_detected:
-                if not session.session_metadata:
-                    session.session_metadata = {}
-                session.session_metadata['auto_escalation'] = {
-                    'detected': True,
-                    'keywords': keywords or [],
-                    'detected_at': datetime.utcnow().isoformat(),
-                }
-
-            db.add(session)
             db.commit()
+            self.invalidate_queue_cache(tenant_id)
 
             # AUTO-ASSIGN: Try to find and assign available supporter
             assigned_user_id = None
@@ -206,6 +310,7 @@ class EscalationService:
 
                     if assign_result["success"]:
                         auto_assigned = True
+                        escalation = assign_result["escalation"]
                         assigned_user_id = str(best_supporter.user_id)
                         assigned_user_name = best_supporter.display_name or best_supporter.username
 
@@ -238,27 +343,25 @@ class EscalationService:
                 # Don't fail the escalation if auto-assign fails
                 # Just leave it as pending
 
-            # Refresh session to get updated status after potential auto-assign
-            db.refresh(session)
-
             logger.info(
                 "session_escalated",
                 session_id=session_id,
                 tenant_id=tenant_id,
                 auto_detected=auto_detected,
                 auto_assigned=auto_assigned,
-                final_status=session.escalation_status,
+                final_status=escalation.escalation_status,
                 reason=reason
             )
 
             return {
                 "success": True,
                 "session_id": session_id,
-                "escalation_status": session.escalation_status,
-                "escalation_requested_at": session.escalation_requested_at.isoformat(),
+                "escalation_status": escalation.escalation_status,
+                "escalation_requested_at": escalation.escalation_requested_at.isoformat(),
                 "auto_assigned": auto_assigned,
                 "assigned_user_id": assigned_user_id,
                 "assigned_user_name": assigned_user_name,
+                "escalation": escalation,
             }
 
         except Exception as e:
@@ -294,82 +397,109 @@ class EscalationService:
             Dictionary with assignment result
         """
         try:
-            # Verify session exists and is escalated
-            session = db.query(ChatSession).filter(
-                and_(
+            # Assign in one conditional UPDATE ... RETURNING; only escalated
+            # sessions match. Rolled back below if the staff checks fail.
+            escalation = db.execute(
+                update(ChatSession)
+                .where(
                     ChatSession.session_id == session_id,
-                    ChatSession.tenant_id == tenant_id
+                    ChatSession.tenant_id == tenant_id,
+                    ChatSession.escalation_status.in_(['pending', 'assigned'])
                 )
+                .values(
+                    assigned_user_id=user_id,
+                    escalation_status='assigned',
+                    escalation_assigned_at=datetime.utcnow()
+                )
+                .returning(*ESCALATION_COLUMNS)
+                .execution_options(synchronize_session=False)
             ).first()
 
-            if not session:
-                return {
-                    "success": False,
-                    "error": "Session not found",
-                }
+            if not escalation:
+                current = self._get_escalation_status(db, session_id, tenant_id)
+                db.rollback()
+
+                if not current:
+                    return {
+                        "success": False,
+                        "error": "Session not found",
+                    }
 
-            if session.escalation_status not in ['pending', 'assigned']:
                 return {
                     "success": False,
-                    "error": f"Session cannot be assigned (status: {session.escalation_status})",
+                    "error": f"Session cannot be assigned (status: {current.escalation_status})",
                 }
 
-            # Verify user exists, belongs to same tenant, and is a supporter
-            user = db.query(User).filter(
-                and_(
+            # Take a slot on the staff member in one guarded UPDATE ... RETURNING:
+            # the capacity check and the increment are a single statement, so
+            # concurrent assignments cannot both pass the check
+            staff = db.execute(
+                update(User)
+                .where(
                     User.user_id == user_id,
                     User.tenant_id == tenant_id,
-                    User.role == 'supporter'
+                    User.role == 'supporter',
+                    User.supporter_status.in_(['online', 'available']),
+                    User.current_sessions_count < User.max_concurrent_sessions
                 )
+                .values(current_sessions_count=User.current_sessions_count + 1)
+                .returning(User.current_sessions_count, User.max_concurrent_sessions)
+                .execution_options(synchronize_session=False)
             ).first()
 
-            if not user:
-                return {
-                    "success": False,
-                    "error": "User not found, not a supporter, or does not belong to this tenant",
-                }
+            if not staff:
+                # Verify user exists, belongs to same tenant, and is a supporter.
+                # Only scalar columns are used; raiseload makes any relationship
+                # access fail loudly instead of issuing a hidden lazy query.
+                user = db.query(User).options(raiseload("*")).filter(
+                    and_(
+                        User.user_id == user_id,
+                        User.tenant_id == tenant_id,
+                        User.role == 'supporter'
+                    )
+                ).first()
+                db.rollback()
 
-            # Check staff member availability and capacity
-            if user.supporter_status not in ['online', 'available']:
-                return {
-                    "success": False,
-                    "error": f"Staff member not available (status: {user.supporter_status}). Current status must be 'online'",
-                }
+                if not user:
+                    return {
+                        "success": False,
+                        "error": "User not found, not a supporter, or does not belong to this tenant",
+                    }
+
+                if user.supporter_status not in ['online', 'available']:
+                    return {
+                        "success": False,
+                        "error": f"Staff member not available (status: {user.supporter_status}). Current status must be 'online'",
+                    }
 
-            if user.current_sessions_count >= user.max_concurrent_sessions:
                 return {
                     "success": False,
                     "error": f"Staff member at capacity ({user.current_sessions_count}/{user.max_concurrent_sessions}). Cannot assign more sessions.",
                 }
 
-            # Assign user and increment session counter
-            session.assigned_user_id = user_id
-            session.escalation_status = 'assigned'
-            session.escalation_assigned_at = datetime.utcnow()
-
-            # Increment staff member's active session count
-            user.current_sessions_count += 1
+            staff_current_sessions = staff.current_sessions_count
+            staff_max_sessions = staff.max_concurrent_sessions
 
-            db.add(session)
-            db.add(user)
             db.commit()
+            self.invalidate_queue_cache(tenant_id)
 
             logger.info(
                 "user_assigned",
                 session_id=session_id,
                 user_id=user_id,
                 tenant_id=tenant_id,
-                staff_sessions_count=user.current_sessions_count
+                staff_sessions_count=staff_current_sessions
             )
 
             return {
                 "success": True,
                 "session_id": session_id,
                 "assigned_user_id": user_id,
-                "escalation_status": session.escalation_status,
-                "escalation_assigned_at": session.escalation_assigned_at.isoformat(),
-                "staff_current_sessions": user.current_sessions_count,
-                "staff_max_sessions": user.max_concurrent_sessions,
+                "escalation_status": escalation.escalation_status,
+                "escalation_assigned_at": escalation.escalation_assigned_at.isoformat(),
+                "staff_current_sessions": staff_current_sessions,
+                "staff_max_sessions": staff_max_sessions,
+                "escalation": escalation,
             }
 
         except Exception as e:
@@ -407,65 +537,86 @@ class EscalationService:
             Dictionary with resolution result
         """
         try:
-            session = db.query(ChatSession).filter(
-                and_(
+            # Mark as resolved and add resolution notes to metadata in one
+            # conditional UPDATE ... RETURNING
+            escalation = db.execute(
+                update(ChatSession)
+                .where(
                     ChatSession.session_id == session_id,
-                    ChatSession.tenant_id == tenant_id
+                    ChatSession.tenant_id == tenant_id,
+                    ChatSession.escalation_status.in_(['pending', 'assigned'])
                 )
+                .values(
+                    escalation_status='resolved',
+                    session_metadata=_merge_metadata({
+                        'escalation_resolved': {
+                            'resolved_at': datetime.utcnow().isoformat(),
+                            'notes': resolution_notes,
+                        }
+                    })
+                )
+                .returning(*ESCALATION_COLUMNS)
+                .execution_options(synchronize_session=False)
             ).first()
 
-            if not session:
-                return {
-                    "success": False,
-                    "error": "Session not found",
-                }
+            if not escalation:
+                current = self._get_escalation_status(db, session_id, tenant_id)
+                db.rollback()
+
+                if not current:
+                    return {
+                        "success": False,
+                        "error": "Session not found",
+                    }
+
+                # Already resolved sessions do not match, so the staff counter
+                # below is only decremented by the resolve that closed it
+                if current.escalation_status == 'resolved':
+                    return {
+                        "success": False,
+                        "error": "Session already resolved",
+                    }
 
-            if session.escalation_status == 'none':
                 return {
                     "success": False,
                     "error": "Session is not escalated",
                 }
 
             # If session was assigned to a staff member, decrement their counter
-            if session.assigned_user_id:
-                assigned_user = db.query(User).filter(
-                    User.user_id == session.assigned_user_id
-                ).first()
+            if escalation.assigned_user_id:
+                new_count = db.execute(
+                    update(User)
+                    .where(
+                        User.user_id == escalation.assigned_user_id,
+                        User.current_sessions_count > 0
+                    )
+                    .values(current_sessions_count=User.current_sessions_count - 1)
+                    .returning(User.current_sessions_count)
+                    .execution_options(synchronize_session=False)
+                ).scalar()
 
-                if assigned_user and assigned_user.current_sessions_count > 0:
-                    assigned_user.current_sessions_count -= 1
-                    db.add(assigned_user)
+                if new_count is not None:
                     logger.debug(
                         "staff_session_counter_decremented",
-                        user_id=session.assigned_user_id,
-                        new_count=assigned_user.current_sessions_count
+                        user_id=escalation.assigned_user_id,
+                        new_count=new_count
                     )
 
-            # Mark as resolved
-            session.escalation_status = 'resolved'
-
-            # Add resolution notes to metadata
-            if not session.session_metadata:
-                session.session_metadata = {}
-            session.session_metadata['escalation_resolved'] = {
-                'resolved_at': datetime.utcnow().isoformat(),
-                'notes': resolution_notes,
-            }
-
-            db.add(session)
             db.commit()
+            self.invalidate_queue_cache(tenant_id)
 
             logger.info(
                 "escalation_resolved",
                 session_id=session_id,
                 tenant_id=tenant_id,
-                assigned_user_id=str(session.assigned_user_id) if session.assigned_user_id else None
+                assigned_user_id=str(escalation.assigned_user_id) if escalation.assigned_user_id else None
             )
 
             return {
                 "success": True,
                 "session_id": session_id,
-                "escalation_status": session.escalation_status,
+                "escalation_status": escalation.escalation_status,
+                "escalation": escalation,
             }
 
         except Exception as e:
@@ -480,11 +631,63 @@ class EscalationService:
                 "error": f"Failed to resolve escalation: {str(e)}",
             }
 
+    def get_queue_cache_version(self, tenant_id: str) -> Optional[int]:
+        """Current queue cache version for a tenant, or None if the cache is unavailable."""
+        try:
+            client = get_cache_client()
+            if client is None:
+                return None
+            return int(client.get(f"esc_queue_version:{tenant_id}") or 0)
+        except redis.RedisError as e:
+            logger.warning("escalation_queue_cache_unavailable", tenant_id=tenant_id, error=str(e))
+            return None
+
+    def get_cached_queue(self, tenant_id: str, status: Optional[str], version: int) -> Optional[bytes]:
+        """Serialized queue response cached for this tenant, status filter and version."""
+        try:
+            return get_cache_client().get(f"esc_queue:{tenant_id}:{status or 'all'}:{version}")
+        except redis.RedisError as e:
+            logger.warning("escalation_queue_cache_unavailable", tenant_id=tenant_id, error=str(e))
+            return None
+
+    def cache_queue(self, tenant_id: str, status: Optional[str], version: int, payload: bytes) -> None:
+        """Cache a serialized queue response under the version read before building it."""
+        try:
+            get_cache_client().set(
+                f"esc_queue:{tenant_id}:{status or 'all'}:{version}",
+                payload,
+                ex=QUEUE_CACHE_TTL_SECONDS
+            )
+        except redis.RedisError as e:
+            logger.warning("escalation_queue_cache_unavailable", tenant_id=tenant_id, error=str(e))
+
+    def invalidate_queue_cache(self, tenant_id: str) -> None:
+        """Bump the tenant's queue version so cached queue responses are no longer read."""
+        try:
+            client = get_cache_client()
+            if client is not None:
+                client.incr(f"esc_queue_version:{tenant_id}")
+        except redis.RedisError as e:
+            logger.warning("escalation_queue_cache_invalidate_failed", tenant_id=tenant_id, error=str(e))
+
+    def _get_escalation_status(self, db: Session, session_id: str, tenant_id: str):
+        """Fetch only the escalation status of a tenant's session (None if missing).
+
+        Used on the failure path of the conditional updates to report why no
+        row matched.
+        """
+        return db.execute(
+            select(ChatSession.escalation_status).where(
+                ChatSession.session_id == session_id,
+                ChatSession.tenant_id == tenant_id
+            )
+        ).first()
+
     def find_available_staff(
         self,
         db: Session,
         tenant_id: str
-    ) -> List[User]:
+    ) -> List[Row]:
         """
         Find all available supporters for a tenant.
 
@@ -499,19 +702,20 @@ class EscalationService:
             tenant_id: UUID of the tenant
 
         Returns:
-            List of available User objects, sorted by current session count (ascending)
+            List of STAFF_COLUMNS rows plus capacity_percentage, sorted by
+            current session count (ascending)
         """
-        from src.models.user import User  # Local import to avoid circular dependency
-
         try:
-            available_supporters = db.query(User).filter(
-                and_(
+            available_supporters = db.execute(
+                select(*STAFF_COLUMNS, STAFF_CAPACITY_PERCENTAGE)
+                .where(
                     User.tenant_id == tenant_id,
                     User.role == 'supporter',
                     User.supporter_status.in_(['online', 'available']),
                     User.current_sessions_count < User.max_concurrent_sessions
                 )
-            ).order_by(User.current_sessions_count.asc()).all()
+                .order_by(User.current_sessions_count.asc())
+            ).all()
 
             logger.debug(
                 "available_supporters_found",
@@ -544,44 +748,34 @@ class EscalationService:
             status: Optional filter by status (pending, assigned, resolved)
 
         Returns:
-            Dictionary with escalation queue
+            Dictionary with escalation queue; escalations are row mappings
+            with text UUIDs, ready for EscalationResponse.model_validate()
         """
         try:
-            query = db.query(ChatSession).filter(
-                and_(
-                    ChatSession.tenant_id == tenant_id,
-                    ChatSession.escalation_status != 'none'
-                )
+            query = select(*ESCALATION_QUEUE_COLUMNS).where(
+                ChatSession.tenant_id == tenant_id,
+                ChatSession.escalation_status != 'none'
             )
 
             if status:
-                query = query.filter(ChatSession.escalation_status == status)
+                query = query.where(ChatSession.escalation_status == status)
 
-            escalations = query.order_by(
-                desc(ChatSession.escalation_requested_at)
-            ).all()
+            escalations = db.execute(
+                query.order_by(desc(ChatSession.escalation_requested_at))
+            ).mappings().all()
 
-            # Count by status
-            pending = db.query(ChatSession).filter(
-                and_(
+            # Count by status in one grouped scan of ix_sessions_escalation
+            counts = dict(db.execute(
+                select(ChatSession.escalation_status, func.count())
+                .where(
                     ChatSession.tenant_id == tenant_id,
-                    ChatSession.escalation_status == 'pending'
+                    ChatSession.escalation_status.in_(['pending', 'assigned', 'resolved'])
                 )
-            ).count()
-
-            assigned = db.query(ChatSession).filter(
-                and_(
-                    ChatSession.tenant_id == tenant_id,
-                    ChatSession.escalation_status == 'assigned'
-                )
-            ).count()
-
-            resolved = db.query(ChatSession).filter(
-                and_(
-                    ChatSession.tenant_id == tenant_id,
-                    ChatSession.escalation_status == 'resolved'
-                )
-            ).count()
+                .group_by(ChatSession.escalation_status)
+            ).all())
+            pending = counts.get('pending', 0)
+            assigned = counts.get('assigned', 0)
+            resolved = counts.get('resolved', 0)
 
             logger.debug(
                 "escalation_queue_retrieved",
@@ -611,6 +805,21 @@ class EscalationService:
             }
 
 
+# Singleton instance
+_escalation_service: Optional[EscalationService] = None
+
+
 def get_escalation_service() -> EscalationService:
-    """Get singleton escalation service instance."""
-    return EscalationService()
+    """
+    Get or create escalation service singleton.
+
+    Also usable as a FastAPI dependency, so tests can swap the service
+    through app.dependency_overrides.
+
+    Returns:
+        EscalationService instance
+    """
+    global _escalation_service
+    if _escalation_service is None:
+        _escalation_service = EscalationService()
+    return _escalation_service
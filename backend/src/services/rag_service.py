@@ -7,6 +7,7 @@ This service provides:
 - LangChain integration for RAG pipelines
 """
 from typing import List, Dict, Any, Optional
+import json
 import uuid
 from datetime import datetime
 from langchain_postgres import PGVector
@@ -22,6 +23,46 @@ from src.utils.metrics import rag_cross_tenant_leak_counter
 
 logger = get_logger(__name__)
 
+# Hot knowledge-base statements, prepared server-side once per pooled
+# connection so PostgreSQL skips parse/plan on repeat calls (psycopg2 has no
+# automatic prepare). name -> (parameter types, SQL with $n placeholders)
+PREPARED_STATEMENTS = {
+    "kb_count_for_tenant": ("(text)", """
+        SELECT COUNT(*) FROM langchain_pg_embedding
+        WHERE cmetadata->>'tenant_id' = $1
+    """),
+    "kb_delete_doc_ids": ("(text, text[])", """
+        DELETE FROM langchain_pg_embedding
+        WHERE cmetadata->>'tenant_id' = $1
+        AND cmetadata->>'doc_id' = ANY($2)
+    """),
+    "kb_delete_by_metadata": ("(jsonb)", """
+        DELETE FROM langchain_pg_embedding
+        WHERE cmetadata @> $1
+        RETURNING cmetadata->>'doc_id'
+    """),
+    "kb_delete_for_tenant": ("(text)", """
+        DELETE FROM langchain_pg_embedding
+        WHERE cmetadata->>'tenant_id' = $1
+    """),
+}
+
+
+def _execute_prepared(conn, name: str, *params):
+    """EXECUTE a PREPARED_STATEMENTS entry, preparing it on this connection first if needed.
+
+    Prepared names are tracked in the DBAPI connection's info dict, which
+    the pool discards together with the connection when it is invalidated.
+    """
+    prepared = conn.connection.info.setdefault("prepared_statements", set())
+    if name not in prepared:
+        param_types, sql = PREPARED_STATEMENTS[name]
+        conn.exec_driver_sql(f"PREPARE {name} {param_types} AS {sql}")
+        prepared.add(name)
+
+    placeholders = ", ".join(["%s"] * len(params))
+    return conn.exec_driver_sql(f"EXECUTE {name} ({placeholders})", params)
+
 
 class RAGService:
     """Service for managing PgVector-based knowledge bases with multi-tenant isolation."""
@@ -609,18 +650,12 @@ class RAGService:
 
         try:
             # Use raw SQL to delete by metadata filter
-            # PGVector stores metadata as JSONB, so we filter by tenant_id AND doc_id
+            # PGVector stores metadata as JSONB, so we filter by tenant_id AND doc_id.
+            # All ids go in one array parameter: one statement and one commit
+            # however many documents are deleted.
             with self.engine.connect() as conn:
-                for doc_id in document_ids:
-                    result = conn.execute(
-                        text("""
-                            DELETE FROM langchain_pg_embedding
-                            WHERE cmetadata->>'tenant_id' = :tenant_id
-                            AND cmetadata->>'doc_id' = :doc_id
-                        """),
-                        {"tenant_id": str(tenant_id), "doc_id": doc_id}
-                    )
-                    conn.commit()
+                _execute_prepared(conn, "kb_delete_doc_ids", str(tenant_id), list(document_ids))
+                conn.commit()
 
             logger.info(
                 "documents_deleted",
@@ -647,6 +682,66 @@ class RAGService:
                 "error": f"Failed to delete documents: {str(e)}",
             }
 
+    def delete_documents_by_name(
+        self,
+        tenant_id: str,
+        document_name: str,
+    ) -> Dict[str, Any]:
+        """
+        Delete every chunk of a named document from tenant's knowledge base.
+
+        Args:
+            tenant_id: Tenant UUID
+            document_name: Document name as stored in metadata ('document_name')
+
+        Returns:
+            Dictionary with deletion results; deleted_count is the number of
+            distinct documents (doc_id) removed
+        """
+        collection_name = self.get_collection_name(tenant_id)
+
+        try:
+            # Single DELETE ... RETURNING instead of looking the doc_ids up
+            # first; containment (@>) uses the jsonb_path_ops GIN index
+            with self.engine.connect() as conn:
+                result = _execute_prepared(
+                    conn,
+                    "kb_delete_by_metadata",
+                    json.dumps({
+                        "tenant_id": str(tenant_id),
+                        "document_name": document_name,
+                    })
+                )
+                document_ids = set(result.scalars())
+                conn.commit()
+
+            logger.info(
+                "named_document_deleted",
+                tenant_id=tenant_id,
+                collection_name=collection_name,
+                document_name=document_name,
+                deleted_count=len(document_ids),
+            )
+
+            return {
+                "success": True,
+                "tenant_id": tenant_id,
+                "deleted_count": len(document_ids),
+            }
+
+        except Exception as e:
+            logger.error(
+                "delete_documents_by_name_failed",
+                tenant_id=tenant_id,
+                collection_name=collection_name,
+                document_name=document_name,
+                error=str(e)
+            )
+            return {
+                "success": False,
+                "error": f"Failed to delete documents by name: {str(e)}",
+            }
+
     def delete_all_documents_for_tenant(
         self,
         tenant_id: str,
@@ -666,13 +761,7 @@ class RAGService:
             # Use raw SQL to delete by metadata filter
             # PGVector stores metadata as JSONB, so we filter by tenant_id only
             with self.engine.connect() as conn:
-                result = conn.execute(
-                    text("""
-                        DELETE FROM langchain_pg_embedding
-                        WHERE cmetadata->>'tenant_id' = :tenant_id
-                    """),
-                    {"tenant_id": str(tenant_id)}
-                )
+                result = _execute_prepared(conn, "kb_delete_for_tenant", str(tenant_id))
                 conn.commit()
 
                 # Get the number of rows affected
@@ -718,14 +807,7 @@ class RAGService:
         try:
             # Count documents for this tenant
             with self.engine.connect() as conn:
-                result = conn.execute(
-                    text("""
-                        SELECT COUNT(*) as count
-                        FROM langchain_pg_embedding
-                        WHERE cmetadata->>'tenant_id' = :tenant_id
-                    """),
-                    {"tenant_id": str(tenant_id)}
-                )
+                result = _execute_prepared(conn, "kb_count_for_tenant", str(tenant_id))
                 count = result.fetchone()[0]
 
             logger.info(
@@ -0,0 +1,70 @@
+"""
+Cached tenant-existence checks for endpoints that only need a 404.
+
+Two layers sit in front of a scalar EXISTS query: a per-process TTL dict
+(no network at all) and the shared Redis cache (one GET, shared by every
+worker). Only hits are cached, so newly created tenants are seen
+immediately. Tenants are soft-deleted (status change), so a cached hit
+never turns into a wrong answer; update_tenant and delete_tenant still
+call invalidate_tenant() so no layer outlives a mutation in this worker.
+"""
+import time
+from typing import Dict
+from sqlalchemy import exists, select
+from sqlalchemy.orm import Session
+from src.models.tenant import Tenant
+from src.utils.cache import cache_delete, cache_get, cache_set
+
+# Per-process layer (tenant_id -> expiry, time.monotonic())
+TENANT_CACHE_TTL_SECONDS = 60
+TENANT_CACHE_MAX_SIZE = 10000
+
+# Redis layer (a one-byte flag per tenant)
+TENANT_EXISTS_CACHE_TTL_SECONDS = 600
+
+_tenant_exists_cache: Dict[str, float] = {}
+
+
+def _cache_key(tenant_id: str) -> str:
+    return f"tenant_exists:{tenant_id}"
+
+
+def _remember(tenant_id: str) -> None:
+    if len(_tenant_exists_cache) >= TENANT_CACHE_MAX_SIZE:
+        _tenant_exists_cache.clear()
+    _tenant_exists_cache[tenant_id] = time.monotonic() + TENANT_CACHE_TTL_SECONDS
+
+
+def tenant_exists(db: Session, tenant_id: str) -> bool:
+    """Check that a tenant exists: process cache, then Redis, then EXISTS."""
+    expires_at = _tenant_exists_cache.get(tenant_id)
+    if expires_at and expires_at > time.monotonic():
+        return True
+
+    if cache_get(_cache_key(tenant_id)) is not None:
+        _remember(tenant_id)
+        return True
+
+    found = db.scalar(select(exists().where(Tenant.tenant_id == tenant_id)))
+    if found:
+        _remember(tenant_id)
+        cache_set(_cache_key(tenant_id), b"1", TENANT_EXISTS_CACHE_TTL_SECONDS)
+    return found
+
+
+def invalidate_tenant(tenant_id: str) -> None:
+    """Forget a tenant in this process and in Redis (call after it mutates)."""
+    _tenant_exists_cache.pop(tenant_id, None)
+    cache_delete(_cache_key(tenant_id))
+
+
+def warmup_tenant_cache(db: Session) -> int:
+    """Preload every tenant id into the per-process cache with one SELECT.
+
+    Called once at application startup so the first requests per tenant
+    skip the lookup. Returns the number of tenants cached.
+    """
+    expires_at = time.monotonic() + TENANT_CACHE_TTL_SECONDS
+    tenant_ids = db.query(Tenant.tenant_id).limit(TENANT_CACHE_MAX_SIZE).all()
+    _tenant_exists_cache.update((str(tenant_id), expires_at) for (tenant_id,) in tenant_ids)
+    return len(tenant_ids)
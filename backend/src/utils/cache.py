@@ -0,0 +1,97 @@
+"""
+Small Redis read-through cache for hot, rarely-changing lookups.
+
+Values are stored as bytes/str with a TTL. Redis being down or slow is never
+an error for callers: reads miss and writes are dropped, so every lookup
+falls back to the database.
+"""
+from typing import Optional, Union
+import redis
+from src.config import settings
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Short timeouts so an unreachable Redis costs less than the query it saves
+CACHE_TIMEOUT_SECONDS = 0.2
+
+# SCAN page size for pattern invalidation; larger pages mean fewer
+# round-trips per sweep
+CACHE_SCAN_COUNT = 1000
+
+# Keys read in one module and invalidated from another
+RAG_CHUNK_CONFIG_CACHE_KEY = "rag_cfg:all"
+
+_client: Optional[redis.Redis] = None
+
+
+def get_cache_client() -> Optional[redis.Redis]:
+    """Lazily connect the shared cache client (None when Redis is not configured)."""
+    global _client
+    if _client is None and settings.REDIS_URL:
+        _client = redis.Redis.from_url(
+            settings.REDIS_URL,
+            socket_connect_timeout=CACHE_TIMEOUT_SECONDS,
+            socket_timeout=CACHE_TIMEOUT_SECONDS,
+        )
+    return _client
+
+
+def cache_get(key: str) -> Optional[bytes]:
+    """Cached value for key, or None on a miss or when Redis is unavailable."""
+    try:
+        client = get_cache_client()
+        return client.get(key) if client is not None else None
+    except redis.RedisError as e:
+        logger.warning("cache_unavailable", key=key, error=str(e))
+        return None
+
+
+def cache_set(key: str, value: Union[bytes, str], ttl: int) -> bool:
+    """Store value under key for ttl seconds (best effort).
+
+    Returns whether the value was stored, for callers that cannot do
+    without it.
+    """
+    try:
+        client = get_cache_client()
+        if client is not None:
+            return bool(client.set(key, value, ex=ttl))
+    except redis.RedisError as e:
+        logger.warning("cache_unavailable", key=key, error=str(e))
+    return False
+
+
+def cache_delete(*keys: str) -> None:
+    """Drop cached keys (best effort)."""
+    try:
+        client = get_cache_client()
+        if client is not None and keys:
+            client.delete(*keys)
+    except redis.RedisError as e:
+        logger.warning("cache_invalidate_failed", keys=list(keys), error=str(e))
+
+
+def cache_delete_pattern(pattern: str) -> int:
+    """Drop every key matching a glob pattern (best effort).
+
+    Walks the keyspace with SCAN and removes keys with UNLINK, which frees
+    the values in a Redis background thread instead of blocking the server.
+    Returns the number of keys removed.
+    """
+    deleted = 0
+    try:
+        client = get_cache_client()
+        if client is None:
+            return 0
+        batch = []
+        for key in client.scan_iter(match=pattern, count=CACHE_SCAN_COUNT):
+            batch.append(key)
+            if len(batch) >= CACHE_SCAN_COUNT:
+                deleted += client.unlink(*batch)
+                batch = []
+        if batch:
+            deleted += client.unlink(*batch)
+    except redis.RedisError as e:
+        logger.warning("cache_invalidate_failed", pattern=pattern, error=str(e))
+    return deleted
@@ -0,0 +1,32 @@
+"""
+Opaque keyset-pagination cursors.
+
+A cursor is the sort key of the last row on a page, serialized as
+base64url-encoded JSON. Clients pass it back unchanged to fetch the next
+page; the query then seeks past that key instead of skipping OFFSET rows.
+"""
+import base64
+import json
+from typing import Any, Dict
+
+
+def encode_cursor(key: Dict[str, Any]) -> str:
+    """Serialize a sort key (values already JSON-safe) into a cursor string."""
+    raw = json.dumps(key, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Parse a cursor string back into its sort key.
+
+    Raises:
+        ValueError: If the cursor is not one produced by encode_cursor()
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        key = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid pagination cursor") from e
+    if not isinstance(key, dict):
+        raise ValueError("Invalid pagination cursor")
+    return key
@@ -0,0 +1,13 @@
+"""Gunicorn worker classes."""
+from uvicorn.workers import UvicornWorker
+
+
+class FastUvicornWorker(UvicornWorker):
+    """Uvicorn worker pinned to uvloop + httptools.
+
+    The stock worker uses loop/http "auto", which silently falls back to
+    asyncio + h11 when the fast implementations are missing. Pinning them
+    makes a missing dependency fail at boot instead of costing throughput.
+    """
+
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools", "lifespan": "on"}
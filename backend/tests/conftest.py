@@ -5,6 +5,7 @@ import pytest
 import os
 import sys
 from pathlib import Path
+from types import SimpleNamespace
 from dotenv import load_dotenv
 
 # Add backend directory to Python path
@@ -18,6 +19,57 @@ if os.path.exists(".env.test"):
 else:
     load_dotenv(".env")  # Fallback to regular .env
 
+class FakeSession:
+    """Stands in for the SQLAlchemy session in unit tests that have no database.
+
+    Each execute() returns the next canned result (read with .all(), .first()
+    or .scalar()); query(...).count() returns count and query(...).first()
+    returns first. Statements, commits and rollbacks are recorded.
+    """
+
+    def __init__(self, *results, count=0, first=None):
+        self.results = list(results)
+        self.count = count
+        self.first = first
+        self.statements = []
+        self.counted = False
+        self.commits = 0
+        self.rollbacks = 0
+
+    def execute(self, statement):
+        self.statements.append(statement)
+        result = self.results.pop(0)
+        return SimpleNamespace(
+            all=lambda: result,
+            first=lambda: result,
+            scalar=lambda: result[0] if result else None,
+        )
+
+    def query(self, *entities):
+        def count():
+            self.counted = True
+            return self.count
+        query = SimpleNamespace(count=count, first=lambda: self.first)
+        query.options = lambda *args: query
+        query.filter = lambda *args: query
+        return query
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def updates(self, table):
+        """UPDATE statements issued against table, in order."""
+        return [s for s in self.statements if s.is_dml and s.table.name == table]
+
+
+@pytest.fixture
+def fake_db():
+    """FakeSession factory: fake_db(*results, count=..., first=...)"""
+    return FakeSession
+
 @pytest.fixture(scope="session")
 def test_tenant_id():
     """Test tenant ID"""
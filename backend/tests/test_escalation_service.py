@@ -0,0 +1,137 @@
+"""
+Escalation Service Tests
+Tests the escalate / assign / resolve flows of EscalationService: the
+failure paths of the conditional UPDATEs and the staff session counter
+"""
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.services import escalation_service as escalation_module
+from src.services.escalation_service import EscalationService
+
+
+def _sql(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def _escalation_row(status, assigned_user_id=None):
+    now = datetime(2025, 11, 21, 9, 0)
+    return SimpleNamespace(
+        escalation_status=status,
+        assigned_user_id=assigned_user_id,
+        escalation_requested_at=now,
+        escalation_assigned_at=now,
+    )
+
+
+@pytest.fixture(autouse=True)
+def no_queue_cache(monkeypatch):
+    """Run without Redis: queue cache invalidation becomes a no-op."""
+    monkeypatch.setattr(escalation_module, "get_cache_client", lambda: None)
+
+
+@pytest.fixture
+def service():
+    return EscalationService()
+
+
+def test_escalate_session_not_found(service, fake_db):
+    """Test that escalating a missing session fails and rolls back"""
+    db = fake_db(None, None)
+
+    result = service.escalate_session(db, str(uuid.uuid4()), str(uuid.uuid4()), "help")
+
+    assert result == {"success": False, "error": "Session not found"}
+    assert db.rollbacks == 1
+    assert db.commits == 0
+
+
+def test_escalate_session_already_escalated(service, fake_db):
+    """Test that a session that is already escalated reports its current status"""
+    db = fake_db(None, SimpleNamespace(escalation_status="pending"))
+
+    result = service.escalate_session(db, str(uuid.uuid4()), str(uuid.uuid4()), "help")
+
+    assert not result["success"]
+    assert result["error"] == "Session already escalated with status: pending"
+    assert db.rollbacks == 1
+    assert db.commits == 0
+
+
+def test_assign_user_takes_a_slot_with_a_guarded_update(service, fake_db):
+    """Test that assignment increments the counter in one capacity-guarded UPDATE"""
+    db = fake_db(
+        _escalation_row("assigned"),
+        SimpleNamespace(current_sessions_count=2, max_concurrent_sessions=3),
+    )
+
+    result = service.assign_user(db, str(uuid.uuid4()), str(uuid.uuid4()), str(uuid.uuid4()))
+
+    assert result["success"]
+    assert result["staff_current_sessions"] == 2
+    assert result["staff_max_sessions"] == 3
+    assert db.commits == 1
+
+    [staff_update] = db.updates("users")
+    sql = _sql(staff_update)
+    assert "current_sessions_count=(users.current_sessions_count + " in sql
+    assert "users.current_sessions_count < users.max_concurrent_sessions" in sql
+    assert "RETURNING" in sql
+
+
+def test_assign_user_at_capacity_rolls_back(service, fake_db):
+    """Test that a staff member at capacity rolls the session assignment back"""
+    user = SimpleNamespace(
+        supporter_status="online",
+        current_sessions_count=3,
+        max_concurrent_sessions=3,
+    )
+    db = fake_db(_escalation_row("assigned"), None, first=user)
+
+    result = service.assign_user(db, str(uuid.uuid4()), str(uuid.uuid4()), str(uuid.uuid4()))
+
+    assert not result["success"]
+    assert result["error"] == "Staff member at capacity (3/3). Cannot assign more sessions."
+    assert db.rollbacks == 1
+    assert db.commits == 0
+
+
+def test_assign_user_unknown_user_rolls_back(service, fake_db):
+    """Test that assigning a user who is not a supporter of the tenant rolls back"""
+    db = fake_db(_escalation_row("assigned"), None, first=None)
+
+    result = service.assign_user(db, str(uuid.uuid4()), str(uuid.uuid4()), str(uuid.uuid4()))
+
+    assert not result["success"]
+    assert result["error"].startswith("User not found")
+    assert db.rollbacks == 1
+    assert db.commits == 0
+
+
+def test_resolve_escalation_decrements_once(service, fake_db):
+    """Test that resolving twice decrements the supporter's counter only once"""
+    supporter_id = uuid.uuid4()
+    db = fake_db(
+        _escalation_row("resolved", assigned_user_id=supporter_id),
+        (0,),
+        None,
+        SimpleNamespace(escalation_status="resolved"),
+    )
+    session_id, tenant_id = str(uuid.uuid4()), str(uuid.uuid4())
+
+    first = service.resolve_escalation(db, session_id, tenant_id)
+    second = service.resolve_escalation(db, session_id, tenant_id)
+
+    assert first["success"]
+    assert second == {"success": False, "error": "Session already resolved"}
+    assert len(db.updates("users")) == 1
+    assert db.commits == 1
+    assert db.rollbacks == 1
+
+    # Only open escalations match the resolve UPDATE
+    resolve_sql = _sql(db.updates("sessions")[-1])
+    assert "sessions.escalation_status IN" in resolve_sql
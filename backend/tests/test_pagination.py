@@ -0,0 +1,120 @@
+"""
+Pagination Tests
+Tests the keyset cursor codec and the cursor/offset/total branches of the
+admin listings
+"""
+import base64
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from src.api.admin.sessions import list_tenant_sessions
+from src.api.admin.tenants import list_tenants
+from src.utils.pagination import decode_cursor, encode_cursor
+
+
+def _tenant_row(created_at, total=None):
+    return SimpleNamespace(
+        tenant_id=uuid.uuid4(),
+        name="Tenant",
+        domain=f"{uuid.uuid4().hex}.example.com",
+        status="active",
+        created_at=created_at,
+        updated_at=created_at,
+        total=total,
+    )
+
+
+def test_cursor_round_trip():
+    """Test that a decoded cursor is the key that was encoded"""
+    key = {"created_at": "2025-11-21T09:00:00", "tenant_id": str(uuid.uuid4())}
+
+    cursor = encode_cursor(key)
+
+    assert decode_cursor(cursor) == key
+    # URL-safe and unpadded, so it can go straight into a query string
+    assert "=" not in cursor and "+" not in cursor and "/" not in cursor
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor!", "%%%", "bm90IGpzb24", ""])
+def test_decode_cursor_rejects_garbage(cursor):
+    """Test that strings not produced by encode_cursor raise ValueError"""
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+@pytest.mark.parametrize("payload", [b"[1, 2]", b'"text"', b"42", b"null"])
+def test_decode_cursor_rejects_non_dict(payload):
+    """Test that valid JSON which is not an object raises ValueError"""
+    cursor = base64.urlsafe_b64encode(payload).rstrip(b"=").decode()
+
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_list_tenants_invalid_cursor_is_400(fake_db):
+    """Test that a cursor that does not decode to a tenant key returns 400"""
+    for cursor in ["garbage", encode_cursor({"created_at": "yesterday", "tenant_id": "x"})]:
+        with pytest.raises(HTTPException) as exc_info:
+            list_tenants(limit=10, offset=0, cursor=cursor, db=fake_db(), admin_payload={})
+        assert exc_info.value.status_code == 400
+
+
+def test_list_tenants_offset_page_uses_window_total(fake_db):
+    """Test that an offset page reads the total from the rows and returns a cursor"""
+    rows = [_tenant_row(datetime(2025, 11, day), total=7) for day in (1, 2, 3)]
+    db = fake_db(rows)
+
+    page = list_tenants(limit=2, offset=0, cursor=None, db=db, admin_payload={})
+
+    assert page.total == 7
+    assert len(page.tenants) == 2
+    assert not db.counted
+    assert decode_cursor(page.next_cursor) == {
+        "created_at": rows[1].created_at.isoformat(),
+        "tenant_id": str(rows[1].tenant_id),
+    }
+
+
+def test_list_tenants_cursor_page_has_no_total(fake_db):
+    """Test that a cursor page reports no total instead of counting every tenant"""
+    cursor = encode_cursor({"created_at": "2025-11-02T00:00:00", "tenant_id": str(uuid.uuid4())})
+    db = fake_db([_tenant_row(datetime(2025, 11, 3))], count=3)
+
+    page = list_tenants(limit=2, offset=0, cursor=cursor, db=db, admin_payload={})
+
+    assert not db.counted
+    assert page.total is None
+    assert len(page.tenants) == 1
+    assert page.next_cursor is None
+
+
+def test_list_tenants_page_past_the_end(fake_db):
+    """Test that an empty offset page still reports the real total"""
+    db = fake_db([], count=5)
+
+    page = list_tenants(limit=10, offset=50, cursor=None, db=db, admin_payload={})
+
+    assert db.counted
+    assert page.total == 5
+    assert page.tenants == []
+    assert page.next_cursor is None
+
+
+def test_list_tenant_sessions_invalid_cursor_is_400(fake_db):
+    """Test that a cursor that does not decode to a session key returns 400"""
+    cursor = encode_cursor({"session_id": str(uuid.uuid4())})  # last_message_at missing
+
+    with pytest.raises(HTTPException) as exc_info:
+        list_tenant_sessions(
+            tenant_id=str(uuid.uuid4()),
+            limit=10,
+            offset=0,
+            cursor=cursor,
+            db=fake_db(),
+            admin_payload={},
+        )
+    assert exc_info.value.status_code == 400